@@ -8,6 +8,13 @@ from dotenv import load_dotenv
 from tavily import TavilyClient
 import wikipedia
 
+# Shared search cache from the repo's src/utils (needs src on PYTHONPATH); the lab still
+# runs standalone without it
+try:
+    from utils.search_cache import cached_search
+except ImportError:
+    cached_search = None
+
 # Init env
 load_dotenv()  # load variables 
 
@@ -178,7 +185,7 @@ def wikipedia_search_tool(query: str, sentences: int = 5) -> list[dict]:
     Returns:
         list[dict]: A list with a single dictionary containing title, summary, and URL.
     """
-    try:
+    def fetch():
         page_title = wikipedia.search(query)[0]
         page = wikipedia.page(page_title)
         summary = wikipedia.summary(page_title, sentences=sentences)
@@ -188,6 +195,11 @@ def wikipedia_search_tool(query: str, sentences: int = 5) -> list[dict]:
             "summary": summary,
             "url": page.url
         }]
+
+    try:
+        if cached_search is None:
+            return fetch()
+        return cached_search("wikipedia", query, fetch, params={"sentences": sentences})
     except Exception as e:
         return [{"error": str(e)}]
 
@@ -1,4 +1,4 @@
-from typing import List, Dict, Text
+from typing import Any, AsyncIterator, List, Dict, Text
 
 from langchain_core.messages import (
     SystemMessage,
@@ -10,12 +10,14 @@ from langchain_core.messages import (
 from langgraph.graph import StateGraph, START, END, MessagesState
 from langgraph.graph.state import CompiledStateGraph
 from langgraph.prebuilt import ToolNode, tools_condition
-from langgraph.checkpoint.memory import MemorySaver
+from langgraph.checkpoint.base import BaseCheckpointSaver
 
 
 from utils.env_utils import load_env
 from utils.qwen_api import init_langchain_chat_openai
 from utils.langchain_utils import save_graph_image
+from utils.checkpointer_utils import init_checkpointer
+from utils.graph_registry import agent_node, bind_agent, graph_registry
 from tools.calculator_tools import calculator, calculator_wstate
 
 # from langgraph_basics import multiply, add, divide
@@ -25,9 +27,15 @@ load_env()
 
 class SimpleChatAgent:
 
-    def __init__(self):
+    def __init__(
+        self,
+        llm=None,
+        save_image: bool = False,
+        checkpointer: BaseCheckpointSaver = None,
+    ):
         self.filename = "simple_chatbot.png"
-        self.llm = init_langchain_chat_openai()
+        self.save_image = save_image
+        self.llm = llm if llm is not None else init_langchain_chat_openai()
         # self.tools = [multiply, add, divide]
         self.tools = [calculator]
         self.llm_with_tools = self.llm.bind_tools(self.tools)
@@ -35,17 +43,35 @@ class SimpleChatAgent:
             content="You are a helpful assistant tasked with performing arithmetic on a set of inputs."
         )
 
-        self.memory = MemorySaver()
+        # Durable SQLite checkpointer by default, see CHECKPOINTER_BACKEND in utils.checkpointer_utils
+        self.memory = checkpointer if checkpointer is not None else init_checkpointer()
         self.graph = self.build_graph()
 
     def call_llm_with_tools(self, state: MessagesState):
         responese = self.llm_with_tools.invoke([self.sys_msg] + state["messages"])
         return {"messages": [responese]}
 
+    async def acall_llm_with_tools(self, state: MessagesState):
+        responese = await self.llm_with_tools.ainvoke([self.sys_msg] + state["messages"])
+        return {"messages": [responese]}
+
     def build_graph(self) -> CompiledStateGraph:
+        """This agent's copy of the graph compiled once per process for the class.
+
+        Rendering the diagram is opt-in (`save_image=True`, or `python -m utils.graph_registry`).
+        """
+        graph = graph_registry.get_or_compile(
+            (type(self).__qualname__, "chat"), self._compile_graph, filename=self.filename
+        )
+        if self.save_image:
+            save_graph_image(graph, filename=self.filename)
+        return bind_agent(graph, self, checkpointer=self.memory)
 
+    def _compile_graph(self) -> CompiledStateGraph:
         builder = StateGraph(MessagesState)
-        builder.add_node("agent", self.call_llm_with_tools)
+        # Register both sync and async implementations so the graph can be driven
+        # by `stream` (CLI) and by `ainvoke`/`astream` (FastAPI) without blocking the event loop
+        builder.add_node("agent", agent_node("call_llm_with_tools", "acall_llm_with_tools"))
         builder.add_node("tools", ToolNode(self.tools))
         builder.add_edge(START, "agent")
 
@@ -55,10 +81,8 @@ class SimpleChatAgent:
 
         builder.add_edge("tools", "agent")
         # The breakpoints are set during compile time.
-        # A checkpointer is required to enable breakpoints.
-        graph = builder.compile(checkpointer=self.memory, interrupt_before=["tools"])
-        save_graph_image(graph, filename=self.filename)
-        return graph
+        # A checkpointer is required to enable breakpoints (set per agent by `bind_agent`).
+        return builder.compile(interrupt_before=["tools"])
 
     def get_last_message(self, thread_id: str) -> Text:
         config = {"configurable": {"thread_id": thread_id}}
@@ -215,6 +239,105 @@ class SimpleChatAgent:
         response = self.get_last_message(thread_id)
         return response
 
+    async def aget_last_message(self, thread_id: str) -> Text:
+        config = {"configurable": {"thread_id": thread_id}}
+        state = await self.graph.aget_state(config)
+        content = state.values["messages"][-1].content
+        return content
+
+    async def arun_until_approval(
+        self, messages: List[Dict[Text, Text]], thread_id: Text = "t001"
+    ) -> bool:
+        """Async version of `run_until_approval` used by the FastAPI endpoints."""
+        config = {"configurable": {"thread_id": thread_id}}
+        message = messages[-1]["content"]
+        initial_input = {"messages": HumanMessage(content=message)}
+        await self.graph.ainvoke(initial_input, config=config)
+
+        snapshot = await self.graph.aget_state(config)
+        if snapshot.next and "tools" in snapshot.next:
+            return True
+        return False
+
+    async def astream_until_approval(
+        self, messages: List[Dict[Text, Text]], thread_id: Text = "t001"
+    ) -> AsyncIterator[Dict[Text, Any]]:
+        """Stream LLM tokens and node updates until the graph finishes or pauses.
+
+        Yields dict events:
+        - {"event": "token", "node": ..., "content": ...} for each LLM token
+        - {"event": "update", "node": ...} when a graph node finishes
+        - {"event": "end", "need_approval": ..., "response": ...} once at the end
+        """
+        config = {"configurable": {"thread_id": thread_id}}
+        message = messages[-1]["content"]
+        initial_input = {"messages": HumanMessage(content=message)}
+
+        async for mode, chunk in self.graph.astream(
+            initial_input, config=config, stream_mode=["messages", "updates"]
+        ):
+            if mode == "messages":
+                message_chunk, metadata = chunk
+                if message_chunk.content:
+                    yield {
+                        "event": "token",
+                        "node": metadata.get("langgraph_node", ""),
+                        "content": message_chunk.content,
+                    }
+            else:
+                for node_name in chunk.keys():
+                    yield {"event": "update", "node": node_name}
+
+        snapshot = await self.graph.aget_state(config)
+        need_approval = bool(snapshot.next and "tools" in snapshot.next)
+        yield {
+            "event": "end",
+            "need_approval": need_approval,
+            "response": snapshot.values["messages"][-1].content,
+        }
+
+    async def ahitp(
+        self, approved: bool, thread_id: Text = "t001", human_comment: Text = ""
+    ) -> Text:
+        """Async version of `hitp`, see `hitp` for the three resume branches."""
+        config = {"configurable": {"thread_id": thread_id}}
+        if approved and human_comment.strip() == "":
+            await self.graph.ainvoke(None, config=config)
+        elif approved and human_comment.strip() != "":
+            current_state = await self.graph.aget_state(config)
+            await self.graph.aupdate_state(
+                config=current_state.config,
+                values={
+                    "messages": [
+                        HumanMessage(
+                            content=human_comment,
+                            id=current_state.values["messages"][-2].id,
+                        )
+                    ]
+                },
+            )
+            await self.graph.ainvoke(None, config=config)
+        else:
+            state = await self.graph.aget_state(config)
+            last_message = state.values["messages"][-1]
+            tool_call_id = last_message.tool_calls[0]["id"]
+            await self.graph.aupdate_state(
+                config=config,
+                values={
+                    "messages": [
+                        ToolMessage(
+                            content="Tool usage denied by user. Do not answer this question.",
+                            tool_call_id=tool_call_id,
+                        )
+                    ]
+                },
+                as_node="tools",
+            )
+            await self.graph.ainvoke(None, config=config)
+
+        response = await self.aget_last_message(thread_id)
+        return response
+
 
 if __name__ == "__main__":
     load_env()
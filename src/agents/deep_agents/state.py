@@ -12,6 +12,8 @@ from typing_extensions import TypedDict
 #from langgraph.prebuilt.chat_agent_executor import AgentState
 from langchain.agents import AgentState  # updated in 1.0
 
+from utils.virtual_fs import merge_files
+
 class Todo(TypedDict):
     """A structured task item for tracking progress through complex workflows.
 
@@ -25,24 +27,20 @@ class Todo(TypedDict):
 
 
 def file_reducer(left, right):
-    """Merge two file dictionaries, with right side taking precedence.
+    """Merge a file delta into the file dictionary, with right side taking precedence.
 
-    Used as a reducer function for the files field in agent state,
-    allowing incremental updates to the virtual file system.
+    Used as a reducer function for the files field in agent state. Tools return
+    only the paths they changed (`None` deletes a path), so only those travel
+    through the reducer and the checkpointer; see `utils.virtual_fs`.
 
     Args:
         left: Left side dictionary (existing files)
-        right: Right side dictionary (new/updated files)
+        right: Right side dictionary (new/updated/deleted files)
 
     Returns:
-        Merged dictionary with right values overriding left values
+        New dictionary sharing unchanged file contents with left
     """
-    if left is None:
-        return right
-    elif right is None:
-        return left
-    else:
-        return {**left, **right}
+    return merge_files(left, right)
 
 
 class DeepAgentState(AgentState):
@@ -32,8 +32,12 @@ Output Format
 
 from concurrent.futures import thread
 from logging import config
-from typing import List, Dict, Text, Annotated, TypedDict, Literal
+from typing import Any, AsyncIterator, List, Dict, Optional, Text, Annotated, TypedDict, Literal
+import asyncio
+import threading
+import time
 import operator
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from pydantic import Field, BaseModel  # updated since filming
 
 from langchain_core.messages import (
@@ -47,14 +51,50 @@ from langgraph.graph import StateGraph, START, END, MessagesState
 from langgraph.graph.state import CompiledStateGraph
 from langgraph.prebuilt import ToolNode, tools_condition
 from langgraph.checkpoint.memory import MemorySaver
+from langgraph.checkpoint.base import BaseCheckpointSaver
 from langchain_tavily import TavilySearch
 from langchain_community.document_loaders import WikipediaLoader
 from langchain_core.messages import get_buffer_string
-from langgraph.types import Send  # updated in 1.0
+from langchain_core.runnables import RunnableConfig
 
-from utils.env_utils import load_env
-from utils.qwen_api import init_langchain_chat_openai
+from utils.env_utils import load_env, EnvLoader
+from utils.qwen_api import init_langchain_chat_openai, get_background_loop
 from utils.langchain_utils import save_graph_image
+from utils.graph_registry import agent_node, bind_agent, graph_registry
+from utils.search_cache import cached_search, normalize_query
+from utils.context_compaction import compact_documents, parse_documents
+from utils.research_store import analyst_key, get_research_store
+from utils.semantic_query_index import cosine_similarity, normalize_vector, qwen_embedder
+
+
+# Shared by every interview: web and wikipedia retrieval of one turn run side by side
+SEARCH_WORKERS = EnvLoader().get_int("RESEARCH_SEARCH_WORKERS", 16)
+search_executor = ThreadPoolExecutor(max_workers=SEARCH_WORKERS, thread_name_prefix="research-search")
+# One slot per worker thread. A hung fetch keeps its slot until it returns; when every
+# slot is taken new searches are skipped instead of queueing behind the hung ones.
+search_slots = threading.BoundedSemaphore(SEARCH_WORKERS)
+
+
+def submit_search(fn, *args) -> Optional[Future]:
+    """Run a search on `search_executor`, or return None when all its workers are busy"""
+    if not search_slots.acquire(blocking=False):
+        return None
+    future = search_executor.submit(fn, *args)
+    future.add_done_callback(lambda _: search_slots.release())
+    return future
+
+
+def search_context(source: str, future: Optional[Future]) -> str:
+    """Context entry of one search once `retrieve` stops waiting for it"""
+    if future is None:
+        return f"Search skipped: {source}: all search workers are busy"
+    if future.cancelled() or not future.done():
+        # The worker thread cannot be interrupted; its slot frees up when it returns
+        future.cancel()
+        return f"Search timed out: {source}"
+    if future.exception() is not None:
+        return f"Search failed: {source}: {future.exception()}"
+    return future.result()
 
 
 class SearchState(TypedDict):
@@ -63,64 +103,68 @@ class SearchState(TypedDict):
     context: Annotated[list, operator.add]
 
 
-def search_web(state: SearchState):
-    """Retrieve docs from web search"""
-    # Search
-    tavily_search = TavilySearch(max_results=3)
-    question = state["question"]
-    data = tavily_search.invoke({"query": question})
-    # search_docs = data.get("results", data)
-    
-    #  # Format
-    # formatted_search_docs = "\n\n---\n\n".join(
-    #     [
-    #         f'<Document href="{doc["url"]}"/>\n{doc["content"]}\n</Document>'
-    #         for doc in search_docs
-    #     ]
-    # )
-    
-    
-    # Handle different return types from TavilySearch
-    if isinstance(data, list):
-        search_docs = data
-    elif isinstance(data, dict) and "results" in data:
-        search_docs = data["results"]
-    else:
-        # Fallback if unexpected format
-        search_docs = []
-
-    # Format
-    formatted_search_docs = "\n\n---\n\n".join(
+def fetch_web_docs(query: str, tavily_search: TavilySearch = None, max_results: int = 3) -> List[Dict]:
+    """Tavily results for `query` as a list of {url, content, ...} dicts, served from the search cache"""
+
+    def fetch():
+        data = (tavily_search or TavilySearch(max_results=max_results)).invoke({"query": query})
+        # Handle different return types from TavilySearch
+        if isinstance(data, list):
+            search_docs = data
+        elif isinstance(data, dict) and "results" in data:
+            search_docs = data["results"]
+        else:
+            # Fallback if unexpected format
+            search_docs = []
+        return [doc for doc in search_docs if isinstance(doc, dict)]
+
+    return cached_search("tavily", query, fetch, params={"max_results": max_results})
+
+
+def fetch_wikipedia_docs(query: str, load_max_docs: int = 2) -> List[Dict]:
+    """Wikipedia pages for `query` as a list of {metadata, page_content} dicts, served from the search cache"""
+
+    def fetch():
+        search_docs = WikipediaLoader(query=query, load_max_docs=load_max_docs).load()
+        return [{"metadata": doc.metadata, "page_content": doc.page_content} for doc in search_docs]
+
+    return cached_search("wikipedia", query, fetch, params={"load_max_docs": load_max_docs})
+
+
+def format_web_docs(search_docs: List[Dict]) -> str:
+    return "\n\n---\n\n".join(
         [
             f'<Document href="{doc.get("url", "N/A")}">\n{doc.get("content", "N/A")}\n</Document>'
             for doc in search_docs
-            if isinstance(doc, dict)
         ]
     )
 
-    return {"context": [formatted_search_docs]}
-
-
-def search_wikipedia(state: SearchState):
-    """Retrieve docs from wikipedia"""
-
-    # Search
-    search_docs = WikipediaLoader(query=state["question"], load_max_docs=2).load()
 
-    # Format
-    formatted_search_docs = "\n\n---\n\n".join(
+def format_wikipedia_docs(search_docs: List[Dict]) -> str:
+    return "\n\n---\n\n".join(
         [
-            f'<Document source="{doc.metadata["source"]}" page="{doc.metadata.get("page", "")}">\n{doc.page_content}\n</Document>'
+            f'<Document source="{doc["metadata"]["source"]}" page="{doc["metadata"].get("page", "")}">\n{doc["page_content"]}\n</Document>'
             for doc in search_docs
         ]
     )
 
-    return {"context": [formatted_search_docs]}
+
+def search_web(state: SearchState):
+    """Retrieve docs from web search"""
+    search_docs = fetch_web_docs(state["question"])
+    return {"context": [format_web_docs(search_docs)]}
+
+
+def search_wikipedia(state: SearchState):
+    """Retrieve docs from wikipedia"""
+    search_docs = fetch_wikipedia_docs(state["question"])
+    return {"context": [format_wikipedia_docs(search_docs)]}
 
 
 class SimpleResearchAgent:
-    def __init__(self):
+    def __init__(self, save_image: bool = False):
 
+        self.save_image = save_image
         self.tools = []
         self.llm = init_langchain_chat_openai()
         self.memory = MemorySaver()
@@ -148,12 +192,20 @@ class SimpleResearchAgent:
         return {"answer": answer}
 
     def build_graph(self) -> CompiledStateGraph:
+        graph = graph_registry.get_or_compile(
+            (type(self).__qualname__, "v1"), self._compile_graph, filename="research_agent_v1.png"
+        )
+        if self.save_image:
+            save_graph_image(graph, "research_agent_v1.png")
+        return bind_agent(graph, self)
+
+    def _compile_graph(self) -> CompiledStateGraph:
         builder = StateGraph(SearchState)
 
         # Initialize each node with node_secret
         builder.add_node("search_web", search_web)
         builder.add_node("search_wikipedia", search_wikipedia)
-        builder.add_node("generate_answer", self.generate_answer)
+        builder.add_node("generate_answer", agent_node("generate_answer"))
 
         # Flow
         builder.add_edge(START, "search_wikipedia")
@@ -161,10 +213,7 @@ class SimpleResearchAgent:
         builder.add_edge("search_wikipedia", "generate_answer")
         builder.add_edge("search_web", "generate_answer")
         builder.add_edge("generate_answer", END)
-        graph = builder.compile()
-
-        save_graph_image(graph, "research_agent_v1.png")
-        return graph
+        return builder.compile()
 
     def run(self, question: str = "How were Nvidia's Q2 2025 earnings") -> str:
         """Run the agent"""
@@ -223,9 +272,16 @@ class InterviewState(MessagesState):
         description="The source docs of the interview"
     )
     
+    compacted_context: str = Field(
+        description="Deduplicated, relevance-ranked and trimmed form of `context`"
+    )
+    compacted_from: int = Field(
+        description="len(context) when `compacted_context` was computed"
+    )
+
     interview: str = Field(description="The interview transcript")
     sections: list[str] = Field(
-        description="Final key we duplicate in outer state for Send() API"
+        description="Sections written by the interview, collected by `conduct_interviews`"
     )
 
 
@@ -233,6 +289,20 @@ class SearchQuery(BaseModel):
     search_query: str = Field(description="Search query for retrieval.")
 
 
+class Report(BaseModel):
+    """All three parts of the final report, written in one call"""
+
+    introduction: str = Field(
+        description="Markdown introduction: a compelling # title, then ## Introduction, around 100 words"
+    )
+    content: str = Field(
+        description="Markdown report body starting with ## Insights, ending with a ## Sources section"
+    )
+    conclusion: str = Field(
+        description="Markdown conclusion starting with ## Conclusion, around 100 words"
+    )
+
+
 class ReasearchState(TypedDict):
     topic: str = Field(description="The topic we are searching for")
     max_analysts: int = Field(description="Max number of analysts to search for")
@@ -247,23 +317,66 @@ class ReasearchState(TypedDict):
     content: str = Field(description="Content for the final report")
     conclusion: str = Field(description="Conclusion for the final report")
     final_report: str = Field(description="Final report")
+    incomplete_interviews: List[str] = Field(
+        description="Analysts whose interview failed, timed out or missed the deadline"
+    )
+    report_mode: str = Field(
+        description="'fan_out' (three writer nodes) or 'single_pass' (one structured call)"
+    )
+    interview_records: list = Field(
+        description="Per-analyst interview, sections, sources and timestamp, see utils.research_store"
+    )
 
 
 class ReaserchAgent:
-    def __init__(self):
+    def __init__(
+        self,
+        llm=None,
+        max_parallel_interviews: int = None,
+        interview_timeout: float = None,
+        interviews_deadline: float = None,
+        save_image: bool = False,
+        checkpointer: BaseCheckpointSaver = None,
+    ):
         self.analyst_instructions = self.get_analyst_instruct()
+        self.single_analyst_instructions = self.get_single_analyst_instruct()
         self.question_instructions = self.get_question_instructions()
         self.search_instructions = self.get_search_instructions()
         self.answer_instructions = self.get_answer_instructions()
         self.section_writer_instructions = self.get_section_writer_instructions()
         self.report_writer_instructions = self.get_report_writer_instructions()
         self.intro_conclusion_instructions = self.get_intro_conclusion_instructions()
+        self.full_report_instructions = self.get_full_report_instructions()
 
-        self.llm = init_langchain_chat_openai()
+        self.llm = llm or init_langchain_chat_openai()
+        self.save_image = save_image
 
-        self.memory = MemorySaver()
+        self.memory = checkpointer if checkpointer is not None else MemorySaver()
 
         self.tavily_search = TavilySearch(max_results=3)
+        # Per-source retrieval timeouts (seconds) for the `retrieve` node
+        self.search_timeouts = {"web": 20, "wikipedia": 20}
+
+        # Map step limits for `conduct_interviews` (seconds for the timeouts)
+        env = EnvLoader()
+        self.max_parallel_interviews = max_parallel_interviews or env.get_int(
+            "RESEARCH_MAX_PARALLEL_INTERVIEWS", 3
+        )
+        self.interview_timeout = interview_timeout or env.get_int("RESEARCH_INTERVIEW_TIMEOUT", 300)
+        self.interviews_deadline = interviews_deadline or env.get_int(
+            "RESEARCH_INTERVIEWS_DEADLINE", 600
+        )
+        # Token budget of the compacted context in answer / section prompts
+        self.context_token_budget = env.get_int("RESEARCH_CONTEXT_TOKEN_BUDGET", 3000)
+        # Default report writing mode, can be overridden per run with `report_mode`
+        self.report_mode = env.get("RESEARCH_REPORT_MODE", "fan_out")
+        # `extend_research` re-interviews analysts whose sources are older than this (seconds)
+        self.freshness_seconds = env.get_int("RESEARCH_FRESHNESS_SECONDS", 7 * 24 * 3600)
+        # 'single' (one Perspectives call) or 'parallel' (one call per analyst, see `generate_analysts_parallel`)
+        self.analyst_generation_mode = env.get("RESEARCH_ANALYST_GENERATION", "single")
+        self.analyst_max_retries = env.get_int("RESEARCH_ANALYST_MAX_RETRIES", 2)
+        self.analyst_dedup_threshold = float(env.get("RESEARCH_ANALYST_DEDUP_THRESHOLD", "0.9"))
+        self.analyst_embedder = qwen_embedder()
 
     def get_analyst_instruct(
         self,
@@ -284,8 +397,145 @@ class ReaserchAgent:
         5. Assign one analyst to each theme."""
         return analyst_instructions
 
+    def get_single_analyst_instruct(self) -> str:
+        single_analyst_instructions = """You are tasked with creating one AI analyst persona. Follow these instructions carefully:
+
+        1. First, review the research topic:
+        {topic}
+
+        2. Examine any editorial feedback that has been optionally provided to guide creation of the analysts:
+
+        {human_analyst_feedback}
+
+        3. Determine the most interesting themes based upon documents and / or feedback above, and rank the top {max_analysts} themes.
+
+        4. Create the analyst for theme number {index} of that ranking.
+
+        5. The analyst must differ in role and affiliation from these existing analysts:
+        {existing_analysts}"""
+        return single_analyst_instructions
+
+    def _generate_one_analyst(
+        self,
+        structured_llm,
+        state,
+        index: int,
+        existing: List[Analyst],
+        attempt: int = 0,
+        rejection: str = None,
+    ):
+        """One persona call: (analyst, None), or (None, reason) when it is rejected.
+
+        A retry states the attempt number and why the previous persona was rejected, so
+        the prompt differs from the failed call and is not answered from the LLM cache.
+        """
+        system_message = self.single_analyst_instructions.format(
+            topic=state["topic"],
+            human_analyst_feedback=state.get("human_analyst_feedback", ""),
+            max_analysts=state["max_analysts"],
+            index=index,
+            existing_analysts="\n".join(f"- {a.role}, {a.affiliation}" for a in existing) or "None",
+        )
+        if rejection:
+            system_message += (
+                f"\n\n        6. This is attempt {attempt + 1}. "
+                f"The previous analyst was rejected: {rejection}"
+            )
+        try:
+            analyst = structured_llm.invoke(
+                [SystemMessage(content=system_message)]
+                + [HumanMessage(content="Generate the analyst")]
+            )
+            analyst = Analyst.model_validate(analyst)
+        except Exception as e:
+            print(f"Analyst {index} failed validation: {e}")
+            return None, f"invalid output: {e}"
+        if not all([analyst.name.strip(), analyst.role.strip(), analyst.affiliation.strip()]):
+            return None, "name, role and affiliation must not be empty"
+        return analyst, None
+
+    @staticmethod
+    def _analyst_dedup_key(analyst: Analyst):
+        """Exact dedup key, used when role/affiliation embeddings are unavailable"""
+        return normalize_query(analyst.role), normalize_query(analyst.affiliation)
+
+    def _analyst_vectors(self, analysts: List[Analyst]):
+        """Normalized role/affiliation embeddings, or None when the embedder is unavailable"""
+        try:
+            vectors = self.analyst_embedder([f"{a.role} | {a.affiliation}" for a in analysts])
+        except Exception as e:
+            print(f"Analyst embedding failed, falling back to exact dedup: {e}")
+            return None
+        return [normalize_vector(vector) for vector in vectors]
+
+    def generate_analysts_parallel(self, state: GenerateAnalystState) -> List[Analyst]:
+        """Generate analysts concurrently, one persona per structured-output call.
+
+        Every persona is validated on its own. Invalid personas and near-duplicates (cosine
+        similarity of the role/affiliation embedding >= `analyst_dedup_threshold`) are the
+        only ones generated again, up to `analyst_max_retries` extra rounds, with the
+        accepted analysts and the reason of the rejection in the prompt, so the retry picks
+        a different theme and is not the cached answer of the failed call.
+        """
+        structured_llm = self.llm.with_structured_output(Analyst)
+        accepted, accepted_vectors = [], []
+        # Slots still to fill, with why their last persona was rejected
+        pending = {index: None for index in range(1, state["max_analysts"] + 1)}
+
+        for attempt in range(self.analyst_max_retries + 1):
+            if not pending:
+                break
+            existing = list(accepted)
+            with ThreadPoolExecutor(max_workers=len(pending)) as executor:
+                candidates = list(
+                    executor.map(
+                        lambda item: self._generate_one_analyst(
+                            structured_llm, state, item[0], existing, attempt, item[1]
+                        ),
+                        pending.items(),
+                    )
+                )
+
+            rejected = {}
+            valid = []
+            for index, (analyst, rejection) in zip(pending, candidates):
+                if analyst is None:
+                    rejected[index] = rejection
+                else:
+                    valid.append((index, analyst))
+            vectors = self._analyst_vectors([a for _, a in valid]) if valid else []
+            for position, (index, analyst) in enumerate(valid):
+                if vectors is None:
+                    key = self._analyst_dedup_key(analyst)
+                    duplicate = next(
+                        (a for a in accepted if self._analyst_dedup_key(a) == key), None
+                    )
+                else:
+                    duplicate = next(
+                        (
+                            a
+                            for a, v in zip(accepted, accepted_vectors)
+                            if v is not None
+                            and cosine_similarity(vectors[position], v) >= self.analyst_dedup_threshold
+                        ),
+                        None,
+                    )
+                if duplicate is not None:
+                    rejected[index] = (
+                        f"{analyst.role}, {analyst.affiliation} is too similar to the existing "
+                        f"analyst {duplicate.role}, {duplicate.affiliation}"
+                    )
+                    continue
+                accepted.append(analyst)
+                accepted_vectors.append(vectors[position] if vectors is not None else None)
+            pending = dict(sorted(rejected.items()))
+
+        return accepted
+
     def create_analysts(self, state: GenerateAnalystState) -> List[Analyst]:
         """Node to generate analysts"""
+        if self.analyst_generation_mode == "parallel":
+            return {"analysts": self.generate_analysts_parallel(state)}
 
         # Get state
         topic = state["topic"]
@@ -318,23 +568,39 @@ class ReaserchAgent:
             return "create_analysts"
         return END
 
+    def _get_graph(
+        self, name: str, compile_graph, filename: str, checkpointer=None
+    ) -> CompiledStateGraph:
+        """This agent's copy of a graph compiled once per process for the class.
+
+        Nodes read the model and settings from the agent bound by `bind_agent`, so every
+        agent shares the compiled graph whatever its configuration and checkpointer.
+        Rendering the diagram is opt-in (`save_image=True`, or `python -m utils.graph_registry`).
+        """
+        graph = graph_registry.get_or_compile(
+            (type(self).__qualname__, name), compile_graph, filename=filename
+        )
+        if self.save_image:
+            save_graph_image(graph, filename=filename)
+        return bind_agent(graph, self, checkpointer=self.memory if checkpointer is None else checkpointer)
+
     def build_analysts_graph(self) -> CompiledStateGraph:
+        return self._get_graph(
+            "analysts", self._compile_analysts_graph, filename="research_agent_analysts.png"
+        )
+
+    def _compile_analysts_graph(self) -> CompiledStateGraph:
         builder = StateGraph(GenerateAnalystState)
-        builder.add_node("create_analysts", self.create_analysts)
-        builder.add_node("human_feedback", self.human_feedback)
+        builder.add_node("create_analysts", agent_node("create_analysts"))
+        builder.add_node("human_feedback", agent_node("human_feedback"))
 
         builder.add_edge(START, "create_analysts")
         builder.add_edge("create_analysts", "human_feedback")
         builder.add_conditional_edges(
-            "human_feedback", self.should_continue, ["create_analysts", END]
-        )
-
-        graph = builder.compile(
-            checkpointer=self.memory, interrupt_before=["human_feedback"]
+            "human_feedback", agent_node("should_continue"), ["create_analysts", END]
         )
-        save_graph_image(graph, filename="research_agent_analysts.png")
 
-        return graph
+        return builder.compile(interrupt_before=["human_feedback"])
 
     def _generate_analysts(
         self, graph, values, config: dict
@@ -436,13 +702,17 @@ class ReaserchAgent:
         Remember to stay in character throughout your response, reflecting the persona and goals provided to you."""
         return question_instructions
 
+    def _question_prompt(self, state: InterviewState) -> list:
+        system_message = self.question_instructions.format(goals=state["analyst"].persona)
+        return [SystemMessage(content=system_message)] + state["messages"]
+
     def generate_question(self, state: InterviewState):
         """Node to generate questions"""
-        analyst = state["analyst"]
-        messages = state["messages"]
+        question = self.llm.invoke(self._question_prompt(state))
+        return {"messages": [question]}
 
-        system_message = self.question_instructions.format(goals=analyst.persona)
-        question = self.llm.invoke([SystemMessage(content=system_message)] + messages)
+    async def agenerate_question(self, state: InterviewState):
+        question = await self.llm.ainvoke(self._question_prompt(state))
         return {"messages": [question]}
 
     def get_search_instructions(self) -> SystemMessage:
@@ -460,66 +730,106 @@ class ReaserchAgent:
         )
         return search_instructions
 
-    def search_web(self, state: InterviewState):
-        """Node to Retrieve docs from web search"""
-
-        # generate a search query
+    def generate_search_query(self, state: InterviewState) -> str:
+        """Turn the conversation into one search query"""
         structured_llm = self.llm.with_structured_output(SearchQuery)
         search_query = structured_llm.invoke(
             [self.search_instructions] + state["messages"]
         )
+        return self._valid_search_query(search_query)
 
+    async def agenerate_search_query(self, state: InterviewState) -> str:
+        structured_llm = self.llm.with_structured_output(SearchQuery)
+        search_query = await structured_llm.ainvoke(
+            [self.search_instructions] + state["messages"]
+        )
+        return self._valid_search_query(search_query)
+
+    @staticmethod
+    def _valid_search_query(search_query) -> str:
         # Ensure we have a valid search query
         query = getattr(search_query, 'search_query', str(search_query))
         if not query or not isinstance(query, str):
             query = "general information"  # fallback query
+        return query
+
+    def _search_web(self, query: str) -> str:
+        """Run Tavily (through the search cache) and format the results as <Document> blocks"""
+        return format_web_docs(fetch_web_docs(query, tavily_search=self.tavily_search))
+
+    def _search_wikipedia(self, query: str) -> str:
+        """Load wikipedia pages (through the search cache) and format them as <Document> blocks"""
+        return format_wikipedia_docs(fetch_wikipedia_docs(query))
+
+    def search_web(self, state: InterviewState):
+        """Node to Retrieve docs from web search"""
+        query = self.generate_search_query(state)
 
         # execute the search
         try:
-            data = self.tavily_search.invoke({"query": query})
+            formatted_search_docs = self._search_web(query)
         except Exception as e:
             # If search fails, return empty context
             return {"context": ["Search failed: " + str(e)]}
-        
-        # Handle different return types from TavilySearch
-        if isinstance(data, list):
-            search_docs = data
-        elif isinstance(data, dict) and "results" in data:
-            search_docs = data["results"]
-        else:
-            # Fallback if unexpected format
-            search_docs = []
-
-        # format the search docs
-        formatted_search_docs = "\n\n---\n\n".join(
-            [
-                f'<Document href="{doc.get("url", "N/A")}">\n{doc.get("content", "N/A")}\n</Document>'
-                for doc in search_docs
-                if isinstance(doc, dict)
-            ]
-        )
         return {"context": [formatted_search_docs]}
 
     def search_wikipedia(self, state: InterviewState):
         """Retrieve docs from wikipedia"""
-        structed_llm = self.llm.with_structured_output(SearchQuery)
-
-        search_query = structed_llm.invoke(
-            [self.search_instructions] + state["messages"]
+        query = self.generate_search_query(state)
+        return {"context": [self._search_wikipedia(query)]}
+
+    def retrieve(self, state: InterviewState):
+        """Node to retrieve docs from all sources for one interview turn.
+
+        The search query is generated once and shared by every source, and web and
+        wikipedia searches run concurrently, each bounded by `self.search_timeouts` measured
+        from one common start, so a turn waits at most the largest timeout.
+        A source that fails, times out or finds no free search worker only contributes a
+        short notice to the context.
+        """
+        query = self.generate_search_query(state)
+        return {"context": self._retrieve_sources(query)}
+
+    async def aretrieve(self, state: InterviewState):
+        """Async `retrieve`: cancelling the interview stops waiting on the searches and
+        cancels those still queued, and no further LLM call is made"""
+        query = await self.agenerate_search_query(state)
+        return {"context": await self._aretrieve_sources(query)}
+
+    def _submit_searches(self, query: str) -> Dict[str, Optional[Future]]:
+        return {
+            "web": submit_search(self._search_web, query),
+            "wikipedia": submit_search(self._search_wikipedia, query),
+        }
+
+    async def _aretrieve_sources(self, query: str) -> List[str]:
+        futures = self._submit_searches(query)
+        # Started together, so each timeout is measured from the same start
+        await asyncio.gather(
+            *(
+                asyncio.wait_for(asyncio.wrap_future(future), timeout=self.search_timeouts[source])
+                for source, future in futures.items()
+                if future is not None
+            ),
+            return_exceptions=True,
         )
-
-        search_docs = WikipediaLoader(
-            query=search_query.search_query, load_max_docs=2
-        ).load()
-
-        formatted_search_docs = "\n\n---\n\n".join(
-            [
-                f'<Document source="{doc.metadata["source"]}" page="{doc.metadata.get("page", "")}">\n{doc.page_content}\n</Document>'
-                for doc in search_docs
-            ]
-        )
-
-        return {"context": [formatted_search_docs]}
+        return [search_context(source, future) for source, future in futures.items()]
+
+    def _retrieve_sources(self, query: str) -> List[str]:
+        start = time.monotonic()
+        futures = self._submit_searches(query)
+        deadlines = {source: start + self.search_timeouts[source] for source in futures}
+
+        pending = {source: future for source, future in futures.items() if future is not None}
+        while pending:
+            remaining = min(deadlines[source] for source in pending) - time.monotonic()
+            if remaining > 0:
+                wait(list(pending.values()), timeout=remaining, return_when=FIRST_COMPLETED)
+            now = time.monotonic()
+            for source, future in list(pending.items()):
+                if future.done() or now >= deadlines[source]:
+                    del pending[source]
+        return [search_context(source, future) for source, future in futures.items()]
 
     def get_answer_instructions(self) -> str:
         answer_instructions = """You are an expert being interviewed by an analyst.
@@ -551,21 +861,40 @@ class ReaserchAgent:
         And skip the addition of the brackets as well as the Document source preamble in your citation."""
         return answer_instructions
 
-    def generate_answer(self, state: InterviewState) -> str:
-        """Node to answer the question"""
+    def compact_context(self, state: InterviewState) -> Dict[str, Any]:
+        """Compacted context of the interview, cached in the state until `context` grows.
 
-        analyst = state["analyst"]
-        messages = state["messages"]
+        Documents are deduplicated by URL / content hash and ranked against the analyst
+        persona, then trimmed to `self.context_token_budget`.
+        """
         context = state["context"]
-
-        system_message = self.answer_instructions.format(
-            goals=analyst.persona, context=context
+        if state.get("compacted_from") == len(context) and state.get("compacted_context") is not None:
+            return {"compacted_context": state["compacted_context"], "compacted_from": len(context)}
+        compacted_context, _ = compact_documents(
+            context, query=state["analyst"].persona, token_budget=self.context_token_budget
         )
-        answer = self.llm.invoke([system_message] + messages)
+        return {"compacted_context": compacted_context, "compacted_from": len(context)}
 
+    def generate_answer(self, state: InterviewState) -> str:
+        """Node to answer the question"""
+        compacted = self.compact_context(state)
+        answer = self.llm.invoke(self._answer_prompt(state, compacted))
         answer.name = "expert"
 
-        return {"messages": [answer]}
+        # The compacted context is stored so `write_section` does not compact again
+        return {"messages": [answer], **compacted}
+
+    async def agenerate_answer(self, state: InterviewState) -> str:
+        compacted = self.compact_context(state)
+        answer = await self.llm.ainvoke(self._answer_prompt(state, compacted))
+        answer.name = "expert"
+        return {"messages": [answer], **compacted}
+
+    def _answer_prompt(self, state: InterviewState, compacted: Dict[str, Any]) -> list:
+        system_message = self.answer_instructions.format(
+            goals=state["analyst"].persona, context=compacted["compacted_context"]
+        )
+        return [system_message] + state["messages"]
 
     def save_interview(self, state: InterviewState):
         messages = state["messages"]
@@ -648,47 +977,54 @@ class ReaserchAgent:
     def write_section(self, state: InterviewState):
         """Node to answer a question:
         TODO: not use interverview"""
-        interview = state["interview"]
-        context = state["context"]
-        analyst = state["analyst"]
+        section = self.llm.invoke(self._section_prompt(state))
+        return {"sections": [section.content]}
+
+    async def awrite_section(self, state: InterviewState):
+        section = await self.llm.ainvoke(self._section_prompt(state))
+        return {"sections": [section.content]}
+
+    def _section_prompt(self, state: InterviewState) -> list:
+        context = self.compact_context(state)["compacted_context"]
         system_message = self.section_writer_instructions.format(
-            focus=analyst.description
+            focus=state["analyst"].description
         )
-        section = self.llm.invoke(
-            [SystemMessage(content=system_message)]
-            + [
-                HumanMessage(
-                    content=f"Use this source to write your section: {context}"
-                )
-            ]
+        return [
+            SystemMessage(content=system_message),
+            HumanMessage(content=f"Use this source to write your section: {context}"),
+        ]
+
+    def build_interview_graph(self, checkpointer=None):
+        """`checkpointer=False` builds a stateless graph that can run many times concurrently
+        inside one parent node (see `conduct_interviews`)"""
+        return self._get_graph(
+            "interview",
+            self._compile_interview_graph,
+            filename="research_agent_interview.png",
+            checkpointer=checkpointer,
         )
-        return {"sections": [section.content]}
 
-    def build_interview_graph(self):
+    def _compile_interview_graph(self) -> CompiledStateGraph:
         builder = StateGraph(InterviewState)
-        builder.add_node("ask_question", self.generate_question)
-        builder.add_node("search_web", self.search_web)
-        builder.add_node("search_wikipedia", self.search_wikipedia)
-        builder.add_node("answer_question", self.generate_answer)
-        builder.add_node("save_interview", self.save_interview)
-        builder.add_node("write_section", self.write_section)
+        # Async implementations for `ainvoke` (see `aconduct_interviews`): a cancelled
+        # interview makes no further LLM or search call, unlike a node left on a thread
+        builder.add_node("ask_question", agent_node("generate_question", "agenerate_question"))
+        builder.add_node("retrieve", agent_node("retrieve", "aretrieve"))
+        builder.add_node("answer_question", agent_node("generate_answer", "agenerate_answer"))
+        builder.add_node("save_interview", agent_node("save_interview"))
+        builder.add_node("write_section", agent_node("write_section", "awrite_section"))
 
         builder.add_edge(START, "ask_question")
-        builder.add_edge("ask_question", "search_web")
-        builder.add_edge("ask_question", "search_wikipedia")
-        builder.add_edge("search_web", "answer_question")
-        builder.add_edge("search_wikipedia", "answer_question")
+        # One shared query per turn, web + wikipedia fetched concurrently inside `retrieve`
+        builder.add_edge("ask_question", "retrieve")
+        builder.add_edge("retrieve", "answer_question")
         builder.add_conditional_edges(
-            "answer_question", self.route_message, ["ask_question", "save_interview"]
+            "answer_question", agent_node("route_message"), ["ask_question", "save_interview"]
         )
         builder.add_edge("save_interview", "write_section")
         builder.add_edge("write_section", END)
 
-        interview_graph = builder.compile(checkpointer=self.memory).with_config(
-            run_name="Conduct Interview"
-        )
-        save_graph_image(interview_graph, filename="research_agent_interview.png")
-        return interview_graph
+        return builder.compile().with_config(run_name="Conduct Interview")
 
     def run_interview(self, topic) -> None:
         analyst = Analyst(
@@ -711,27 +1047,88 @@ class ReaserchAgent:
         return interview
 
     def initiate_all_interview(self, state: ReasearchState)->Literal["conduct_interview", "create_analysts"]:
-        """This is the "map" step where we run each interview sub-graph using Send API"""
+        """Route back to `create_analysts` on feedback, otherwise to the interview map step"""
         human_analyst_feedback = state["human_analyst_feedback"]
         if human_analyst_feedback:
             return "create_analysts"
         else:
-            topic = state["topic"]
-            tasks = [
-                Send(
-                    node="conduct_interview",
-                    arg={
-                        "analyst": analyst,
-                        "messages": [
-                            HumanMessage(
-                                f"So you said you were writing an article on {topic}"
-                            )
+            return "conduct_interview"
+
+    async def aconduct_interviews(self, state: ReasearchState, config: RunnableConfig):
+        """This is the "map" step where we run one interview sub-graph per analyst.
+
+        Unlike one `Send` per analyst, at most `max_parallel_interviews` interviews run at a
+        time; the rest wait on a semaphore. The interview nodes are async, so cancelling
+        an interview stops it at its pending LLM / search await. An interview is cancelled after
+        `interview_timeout` seconds, and whatever is still running or queued at
+        `interviews_deadline` is cancelled too, so the report is written from the sections
+        that did complete. Failed interviews are listed in `incomplete_interviews`.
+        """
+        topic = state["topic"]
+        analysts = state["analysts"]
+        semaphore = asyncio.Semaphore(self.max_parallel_interviews)
+        # Stateless interview sub-graph shared by all interviews of the map step
+        interview_graph = self.build_interview_graph(checkpointer=False)
+
+        async def interview(analyst: Analyst):
+            async with semaphore:
+                return await asyncio.wait_for(
+                    interview_graph.ainvoke(
+                        {
+                            "analyst": analyst,
+                            "messages": [
+                                HumanMessage(
+                                    f"So you said you were writing an article on {topic}"
+                                )
+                            ],
+                        },
+                        config=config,
+                    ),
+                    timeout=self.interview_timeout,
+                )
+
+        tasks = [asyncio.create_task(interview(analyst)) for analyst in analysts]
+        done, pending = await asyncio.wait(tasks, timeout=self.interviews_deadline)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+        sections, incomplete_interviews, interview_records = [], [], []
+        for analyst, task in zip(analysts, tasks):
+            if task in done and not task.cancelled() and task.exception() is None:
+                result = task.result()
+                sections.extend(result.get("sections", []))
+                interview_records.append(
+                    {
+                        "analyst": analyst.model_dump(),
+                        "interview": result.get("interview", ""),
+                        "sections": result.get("sections", []),
+                        "sources": [
+                            source
+                            for _, source, _ in parse_documents([result.get("compacted_context") or ""])
+                            if source
                         ],
-                    },
+                        "researched_at": time.time(),
+                    }
                 )
-                for analyst in state["analysts"]
-            ]
-            return tasks
+            else:
+                incomplete_interviews.append(analyst.name)
+        return {
+            "sections": sections,
+            "incomplete_interviews": incomplete_interviews,
+            "interview_records": interview_records,
+        }
+
+    def conduct_interviews(self, state: ReasearchState, config: RunnableConfig):
+        """Sync entry point of `aconduct_interviews`.
+
+        Runs on the shared background loop rather than `asyncio.run`, which would block
+        on search threads that are still running after their interview was cancelled.
+        """
+        future = asyncio.run_coroutine_threadsafe(
+            self.aconduct_interviews(state, config), get_background_loop()
+        )
+        return future.result()
 
     def get_report_writer_instructions(self):
         report_writer_instructions = """You are a technical writer creating a report on this overall topic: 
@@ -840,6 +1237,56 @@ class ReaserchAgent:
         )
         return {"conclusion": conclustion.content}
 
+    def get_full_report_instructions(self):
+        full_report_instructions = """You are a technical writer creating a report on this overall topic: {topic}
+
+        The memos of your analysts are given above. Write all three parts of the report:
+
+        1. introduction: create a compelling title with the # header, then use ## Introduction as the
+        section header. Target around 100 words, crisply previewing all of the memos.
+
+        2. content: consolidate the memos into a crisp overall summary that ties together their central
+        ideas as a cohesive single narrative. Start with a single title header: ## Insights. Use no
+        sub-heading and do not mention any analyst names. Preserve the citations in the memos, for
+        example [1] or [2], and end with a consolidated, ordered list of sources without repeats under a
+        ## Sources header.
+
+        3. conclusion: use ## Conclusion as the section header. Target around 100 words, crisply
+        recapping all of the memos.
+
+        Use markdown formatting and include no pre-amble for any part."""
+        return full_report_instructions
+
+    def write_full_report(self, state: ReasearchState) -> Dict[str, str]:
+        """Single-pass alternative to write_report / write_introduction / write_conclusion.
+
+        The sections are sent once, as the leading system message, so the long stable part
+        of the prompt is a prefix that provider-side context caching can reuse; the short
+        instructions follow it.
+        """
+        sections = state["sections"]
+        topic = state["topic"]
+
+        formated_str_sections = "\n\n".join([f"{section}" for section in sections])
+
+        structured_llm = self.llm.with_structured_output(Report)
+        report = structured_llm.invoke(
+            [SystemMessage(content=f"Here are the memos from your analysts:\n\n{formated_str_sections}")]
+            + [SystemMessage(content=self.full_report_instructions.format(topic=topic))]
+            + [HumanMessage(content="Write the report introduction, content and conclusion")]
+        )
+        return {
+            "introduction": report.introduction,
+            "content": report.content,
+            "conclusion": report.conclusion,
+        }
+
+    def route_report_writers(self, state: ReasearchState):
+        """Fan out to the three writer nodes, or write the report in a single pass"""
+        if (state.get("report_mode") or self.report_mode) == "single_pass":
+            return "write_full_report"
+        return ["write_report", "write_introduction", "write_conclusion"]
+
     def finalize_report(self, state: ReasearchState):
         """The is the "reduce" step where we gather all the sections, combine them, and reflect on them to write the intro/conclusion"""
         content = state["content"]
@@ -862,41 +1309,121 @@ class ReaserchAgent:
         )
         if sources is not None:
             final_report += "\n\n## Sources\n\n" + sources
+        if state.get("incomplete_interviews"):
+            final_report += "\n\n> Note: no section from " + ", ".join(
+                state["incomplete_interviews"]
+            ) + " (interview failed or timed out)"
         return {"final_report": final_report}
 
     def build_overall_graph(self) -> CompiledStateGraph:
+        return self._get_graph(
+            "overall", self._compile_overall_graph, filename="research_agent_overall.png"
+        )
+
+    def _compile_overall_graph(self) -> CompiledStateGraph:
         builder = StateGraph(ReasearchState)
-        builder.add_node("create_analysts", self.create_analysts)
-        builder.add_node("human_feedback", self.human_feedback)
-        builder.add_node("conduct_interview", self.build_interview_graph())
-        builder.add_node("write_report", self.write_report)
-        builder.add_node("write_introduction", self.write_introduction)
-        builder.add_node("write_conclusion", self.write_conclusion)
-        builder.add_node("finalize_report", self.finalize_report)
+        builder.add_node("create_analysts", agent_node("create_analysts"))
+        builder.add_node("human_feedback", agent_node("human_feedback"))
+        builder.add_node(
+            "conduct_interview",
+            agent_node("conduct_interviews", "aconduct_interviews", pass_config=True),
+        )
+        builder.add_node("write_report", agent_node("write_report"))
+        builder.add_node("write_introduction", agent_node("write_introduction"))
+        builder.add_node("write_conclusion", agent_node("write_conclusion"))
+        builder.add_node("write_full_report", agent_node("write_full_report"))
+        builder.add_node("finalize_report", agent_node("finalize_report"))
 
         builder.add_edge(START, "create_analysts")
         builder.add_edge("create_analysts", "human_feedback")
         builder.add_conditional_edges(
             "human_feedback",
-            self.initiate_all_interview,
+            agent_node("initiate_all_interview"),
             ["create_analysts", "conduct_interview"],
         )
-        builder.add_edge("conduct_interview", "write_report")
-        builder.add_edge("conduct_interview", "write_introduction")
-        builder.add_edge("conduct_interview", "write_conclusion")
+        builder.add_conditional_edges(
+            "conduct_interview",
+            agent_node("route_report_writers"),
+            ["write_report", "write_introduction", "write_conclusion", "write_full_report"],
+        )
         builder.add_edge(
             ["write_report", "write_introduction", "write_conclusion"],
             "finalize_report",
         )
+        builder.add_edge("write_full_report", "finalize_report")
         builder.add_edge("finalize_report", END)
 
-        graph = builder.compile(
-            checkpointer=self.memory, interrupt_before=["human_feedback"]
+        return builder.compile(interrupt_before=["human_feedback"])
+
+    async def astream_reaserch_agent(
+        self,
+        topic: str,
+        max_analysts: int = 3,
+        human_analyst_feedback: str = None,
+        thread_id: str = "1",
+        token_nodes: tuple = ("write_introduction", "write_conclusion"),
+        report_mode: str = None,
+    ) -> AsyncIterator[Dict[Text, Any]]:
+        """Run the research graph and stream the report while it is being written.
+
+        Yields dict events:
+        - {"event": "analysts", "analysts": [...]} after analysts are (re)generated
+        - {"event": "section", "index": ..., "content": ...} as soon as one interview's
+          `write_section` finishes, without waiting for the other interviews
+        - {"event": "token", "node": ..., "content": ...} for LLM tokens of `token_nodes`
+        - {"event": "update", "node": ...} when a top level node finishes
+        - {"event": "end", "final_report": ...} once at the end
+        """
+        graph = self.build_overall_graph()
+        config = {"configurable": {"thread_id": thread_id}}
+
+        async def generate_analysts(values):
+            # Runs until the interrupt before `human_feedback`
+            async for event in graph.astream(values, config=config, stream_mode="updates"):
+                if "create_analysts" in event:
+                    return {"event": "analysts", "analysts": event["create_analysts"]["analysts"]}
+            return None
+
+        event = await generate_analysts(
+            {"topic": topic, "max_analysts": max_analysts, "report_mode": report_mode or self.report_mode}
         )
-        save_graph_image(graph, filename="research_agent_overall.png")
-        return graph
+        if event is not None:
+            yield event
+        if human_analyst_feedback:
+            await graph.aupdate_state(
+                config, {"human_analyst_feedback": human_analyst_feedback}, as_node="human_feedback"
+            )
+            event = await generate_analysts(None)
+            if event is not None:
+                yield event
+        await graph.aupdate_state(config, {"human_analyst_feedback": None}, as_node="human_feedback")
+
+        section_count = 0
+        async for namespace, mode, chunk in graph.astream(
+            None, config=config, stream_mode=["messages", "updates"], subgraphs=True
+        ):
+            if mode == "messages":
+                message_chunk, metadata = chunk
+                node = metadata.get("langgraph_node", "")
+                # Interview LLM calls run in subgraphs (non-empty namespace); skip their tokens
+                if not namespace and node in token_nodes and message_chunk.content:
+                    yield {"event": "token", "node": node, "content": message_chunk.content}
+            elif namespace:
+                for section in (chunk.get("write_section") or {}).get("sections", []):
+                    yield {"event": "section", "index": section_count, "content": section}
+                    section_count += 1
+            else:
+                for node_name in chunk.keys():
+                    yield {"event": "update", "node": node_name}
+
+        snapshot = await graph.aget_state(config)
+        self._save_run(topic, snapshot.values)
+        yield {"event": "end", "final_report": snapshot.values.get("final_report")}
+
+    def run_reaserch_agent(self,topic, stream: bool = False, report_mode: str = None):
+        if stream:
+            return asyncio.run(self._print_streamed_report(topic, report_mode=report_mode))
 
-    def run_reaserch_agent(self,topic):
         graph = self.build_overall_graph()
         # Inputs
         max_analysts = 3
@@ -904,7 +1431,11 @@ class ReaserchAgent:
         thread = {"configurable": {"thread_id": "1"}}
 
         # Run the graph until the first interruption
-        values = {"topic": topic, "max_analysts": max_analysts}
+        values = {
+            "topic": topic,
+            "max_analysts": max_analysts,
+            "report_mode": report_mode or self.report_mode,
+        }
         analysts = self._generate_analysts(graph=graph, values=values, config=thread)
         
         # We now update the state as if we are the human_feedback node
@@ -924,8 +1455,130 @@ class ReaserchAgent:
             print(node_name)
         
         final_state = graph.get_state(thread)
+        self._save_run(topic, final_state.values)
         report = final_state.values.get('final_report')
         return report
+
+    def _save_run(self, topic: str, values: Dict[str, Any]):
+        """Persist a finished run so `extend_research` can build on it"""
+        store = get_research_store()
+        if store is None or not values.get("final_report"):
+            return None
+        return store.save_run(topic, values.get("interview_records", []), values["final_report"])
+
+    def _write_report_parts(self, state: Dict[str, Any], report_mode: str = None) -> Dict[str, str]:
+        """introduction / content / conclusion outside the graph, in the given report mode"""
+        if (report_mode or self.report_mode) == "single_pass":
+            return self.write_full_report(state)
+        parts = {}
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            futures = [
+                executor.submit(writer, state)
+                for writer in [self.write_report, self.write_introduction, self.write_conclusion]
+            ]
+            for future in futures:
+                parts.update(future.result())
+        return parts
+
+    def extend_research(
+        self,
+        topic: str,
+        human_analyst_feedback: str = None,
+        freshness_seconds: float = None,
+        report_mode: str = None,
+        max_analysts: int = 3,
+    ) -> str:
+        """Incremental re-run of a topic researched before, without redoing fresh interviews.
+
+        Loads the latest stored run of the topic and keeps its analysts. Only analysts whose
+        interview is older than `freshness_seconds`, plus analysts added for
+        `human_analyst_feedback`, are interviewed again; every other section is reused.
+        The report is then rebuilt from all sections and stored as a new run. Without a
+        prior run this is a full, non-interactive research run.
+        """
+        freshness_seconds = self.freshness_seconds if freshness_seconds is None else freshness_seconds
+        store = get_research_store()
+        prior = store.latest_run(topic) if store is not None else None
+        prior_records = {
+            analyst_key(record["analyst"]): record for record in (prior or {}).get("records", [])
+        }
+
+        if prior_records:
+            analysts = [Analyst(**record["analyst"]) for record in prior_records.values()]
+            if human_analyst_feedback:
+                added = self.create_analysts(
+                    {
+                        "topic": topic,
+                        "max_analysts": 1,
+                        "human_analyst_feedback": human_analyst_feedback,
+                    }
+                )["analysts"]
+                analysts += [
+                    analyst for analyst in added if analyst_key(analyst.model_dump()) not in prior_records
+                ]
+        else:
+            analysts = self.create_analysts(
+                {
+                    "topic": topic,
+                    "max_analysts": max_analysts,
+                    "human_analyst_feedback": human_analyst_feedback or "",
+                }
+            )["analysts"]
+
+        now = time.time()
+        fresh_records = {
+            key: record
+            for key, record in prior_records.items()
+            if now - record["researched_at"] < freshness_seconds
+        }
+        to_interview = [
+            analyst for analyst in analysts if analyst_key(analyst.model_dump()) not in fresh_records
+        ]
+        print(f"Reusing {len(analysts) - len(to_interview)} sections, interviewing {len(to_interview)} analysts")
+
+        new_records = {}
+        if to_interview:
+            result = self.conduct_interviews({"topic": topic, "analysts": to_interview}, config={})
+            new_records = {analyst_key(record["analyst"]): record for record in result["interview_records"]}
+
+        records, incomplete_interviews = [], []
+        for analyst in analysts:
+            key = analyst_key(analyst.model_dump())
+            # A failed re-interview falls back to the stale section rather than dropping it
+            record = new_records.get(key) or fresh_records.get(key) or prior_records.get(key)
+            if record is None:
+                incomplete_interviews.append(analyst.name)
+            else:
+                records.append(record)
+
+        state = {
+            "topic": topic,
+            "sections": [section for record in records for section in record["sections"]],
+            "incomplete_interviews": incomplete_interviews,
+        }
+        state.update(self._write_report_parts(state, report_mode))
+        final_report = self.finalize_report(state)["final_report"]
+        if store is not None:
+            store.save_run(topic, records, final_report)
+        return final_report
+
+    async def _print_streamed_report(self, topic: str, report_mode: str = None) -> str:
+        """Print sections and intro/conclusion tokens as they arrive, return the final report"""
+        final_report = None
+        async for event in self.astream_reaserch_agent(
+            topic,
+            human_analyst_feedback="Add in the CEO of gen ai native startup",
+            report_mode=report_mode,
+        ):
+            if event["event"] == "section":
+                print(f"\n--- Section {event['index'] + 1} ---\n{event['content']}", flush=True)
+            elif event["event"] == "token":
+                print(event["content"], end="", flush=True)
+            elif event["event"] == "update":
+                print(f"\n--Node-- {event['node']}", flush=True)
+            elif event["event"] == "end":
+                final_report = event["final_report"]
+        return final_report
                     
         
 
@@ -941,4 +1594,6 @@ if __name__ == "__main__":
     topic = "The benefits of adopting LangGraph as an agent framework"
     # agent.run_generating_analysts_with_hitp(topic=topic)
     # agent.run_interview(topic)
+    # agent.run_reaserch_agent(topic, stream=True)
+    # agent.extend_research(topic, human_analyst_feedback="Add in the CEO of gen ai native startup")
     agent.run_reaserch_agent(topic)
@@ -0,0 +1,133 @@
+"""
+A pool of pre-warmed agents for the FastAPI app.
+
+Instead of funnelling every request through one `SimpleChatAgent` (and its one
+`ChatOpenAI` client), the app keeps N agents and checks one out per request.
+All agents share one checkpointer, so any agent can serve any thread.
+
+When every agent is busy, requests wait in a bounded queue. Once the queue is full,
+or an agent is not available within `acquire_timeout`, `PoolSaturatedError` is raised
+and the API answers HTTP 429 with a Retry-After header.
+
+Configuration (read with EnvLoader.get_int):
+    AGENT_POOL_SIZE=4
+    AGENT_POOL_MAX_QUEUE=64
+    AGENT_POOL_ACQUIRE_TIMEOUT=10
+"""
+
+import asyncio
+import math
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, Callable, Dict
+
+from utils.env_utils import EnvLoader
+
+
+class PoolSaturatedError(Exception):
+    """Raised when no agent can be checked out; `retry_after` is in seconds"""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Agent pool saturated, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+class AgentPool:
+    def __init__(
+        self,
+        factory: Callable[[], Any],
+        size: int = 4,
+        max_queue: int = 64,
+        acquire_timeout: float = 10,
+    ):
+        self.size = size
+        self.max_queue = max_queue
+        self.acquire_timeout = acquire_timeout
+
+        self._agents: "asyncio.Queue[Any]" = asyncio.Queue()
+        for _ in range(size):
+            self._agents.put_nowait(factory())
+
+        self.waiting = 0
+        self.checkouts = 0
+        self.rejections = 0
+        self._wait_times = deque(maxlen=1000)
+        self._hold_times = deque(maxlen=1000)
+        self._checkout_at: Dict[int, float] = {}
+
+    @classmethod
+    def from_env(cls, factory: Callable[[], Any]) -> "AgentPool":
+        env = EnvLoader()
+        return cls(
+            factory,
+            size=env.get_int("AGENT_POOL_SIZE", 4),
+            max_queue=env.get_int("AGENT_POOL_MAX_QUEUE", 64),
+            acquire_timeout=env.get_int("AGENT_POOL_ACQUIRE_TIMEOUT", 10),
+        )
+
+    def retry_after(self) -> int:
+        """Rough estimate of when a slot frees up: queue length times mean hold time per agent"""
+        mean_hold = (
+            sum(self._hold_times) / len(self._hold_times) if self._hold_times else 1
+        )
+        return max(1, math.ceil(mean_hold * (self.waiting + 1) / self.size))
+
+    def ensure_capacity(self) -> None:
+        """Raise PoolSaturatedError now if `acquire` would be rejected for a full queue.
+
+        Lets a streaming endpoint answer 429 up front and check the agent out later,
+        inside the stream, where its release is guaranteed.
+        """
+        if self._agents.empty() and self.waiting >= self.max_queue:
+            self.rejections += 1
+            raise PoolSaturatedError(self.retry_after())
+
+    async def acquire(self) -> Any:
+        self.ensure_capacity()
+
+        self.waiting += 1
+        start = time.perf_counter()
+        try:
+            agent = await asyncio.wait_for(self._agents.get(), self.acquire_timeout)
+        except asyncio.TimeoutError:
+            self.rejections += 1
+            raise PoolSaturatedError(self.retry_after())
+        finally:
+            self.waiting -= 1
+
+        self._wait_times.append(time.perf_counter() - start)
+        self.checkouts += 1
+        self._checkout_at[id(agent)] = time.perf_counter()
+        return agent
+
+    def release(self, agent: Any) -> None:
+        self._hold_times.append(time.perf_counter() - self._checkout_at.pop(id(agent)))
+        self._agents.put_nowait(agent)
+
+    @asynccontextmanager
+    async def checkout(self):
+        agent = await self.acquire()
+        try:
+            yield agent
+        finally:
+            self.release(agent)
+
+    def stats(self) -> Dict[str, Any]:
+        wait_times = sorted(self._wait_times)
+
+        def percentile(q):
+            if not wait_times:
+                return 0.0
+            return wait_times[min(len(wait_times) - 1, int(q * len(wait_times)))]
+
+        return {
+            "size": self.size,
+            "available": self._agents.qsize(),
+            "queue_depth": self.waiting,
+            "checkouts": self.checkouts,
+            "rejections": self.rejections,
+            "wait_p50_ms": round(percentile(0.5) * 1000, 2),
+            "wait_p95_ms": round(percentile(0.95) * 1000, 2),
+            "wait_max_ms": round(wait_times[-1] * 1000, 2) if wait_times else 0.0,
+        }
@@ -1,7 +1,11 @@
+import json
 from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from typing import Dict, List
 from agents.chat_agents import SimpleChatAgent
+from apps.thread_locks import ThreadTaskManager, make_request_key
+from apps.agent_pool import AgentPool, PoolSaturatedError
 
 chat_api = APIRouter()
 
@@ -15,32 +19,103 @@ class ResumeRequest(BaseModel):
     human_comment:str =""
     
 
+def raise_too_many_requests(error: PoolSaturatedError):
+    raise HTTPException(
+        status_code=429,
+        detail=str(error),
+        headers={"Retry-After": str(error.retry_after)},
+    )
+
+
+def sse_event(event: Dict) -> str:
+    return f"event: {event['event']}\ndata: {json.dumps(event, ensure_ascii=False)}\n\n"
+
 
 @chat_api.post("/chat")
 async def chat_endpoint(chat_request: ChatRequest, req: Request) -> Dict[str, str|bool]:
-    # Simple echo response for now
-    agent:SimpleChatAgent = req.app.state.chat_agent
-    
-    need_approval = agent.run_until_approval(chat_request.messages, chat_request.thread_id)
-    return {"need_approval": need_approval,
-            "response": agent.get_last_message(chat_request.thread_id)
-            }
+    pool:AgentPool = req.app.state.agent_pool
+    manager:ThreadTaskManager = req.app.state.thread_manager
+
+    async def run_chat():
+        async with pool.checkout() as agent:
+            need_approval = await agent.arun_until_approval(chat_request.messages, chat_request.thread_id)
+            return {"need_approval": need_approval,
+                    "response": await agent.aget_last_message(chat_request.thread_id)
+                    }
+
+    # Serialized per thread_id; a duplicate in-flight submission joins the first run
+    request_key = make_request_key("chat", chat_request.model_dump())
+    try:
+        return await manager.submit(chat_request.thread_id, request_key, run_chat)
+    except PoolSaturatedError as e:
+        raise_too_many_requests(e)
+
+
+@chat_api.post("/chat/stream")
+async def chat_stream_endpoint(chat_request: ChatRequest, req: Request) -> StreamingResponse:
+    """Server-Sent Events version of /chat: tokens and node updates are pushed as they arrive"""
+    pool:AgentPool = req.app.state.agent_pool
+    manager:ThreadTaskManager = req.app.state.thread_manager
+
+    # Saturation is checked before the response starts, so it can still be a 429
+    try:
+        pool.ensure_capacity()
+    except PoolSaturatedError as e:
+        raise_too_many_requests(e)
+
+    async def run_stream():
+        # Runs under the thread lock in its own task (see ThreadTaskManager.stream), so the
+        # agent is checked out after the lock and always released, even if clients disconnect
+        async with pool.checkout() as agent:
+            async for event in agent.astream_until_approval(chat_request.messages, chat_request.thread_id):
+                yield event
+
+    # A duplicate in-flight submission (double-click) subscribes to the first run's events
+    request_key = make_request_key("chat", chat_request.model_dump())
+
+    async def event_stream():
+        try:
+            async for event in manager.stream(chat_request.thread_id, request_key, run_stream):
+                yield sse_event(event)
+        except PoolSaturatedError as e:
+            yield sse_event({"event": "error", "status_code": 429, "detail": str(e), "retry_after": e.retry_after})
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @chat_api.post("/hitp")
 async def hitp_endpoint(resume_request: ResumeRequest, req: Request) -> Dict[str, str|bool]:
-    # Simple echo response for now
-    agent:SimpleChatAgent = req.app.state.chat_agent
-    
-    response = agent.hitp(resume_request.approved, resume_request.thread_id,human_comment=resume_request.human_comment)
-    
-    return {
-        "need_approval": False,
-        "response": response,
-   
-    }
+    pool:AgentPool = req.app.state.agent_pool
+    manager:ThreadTaskManager = req.app.state.thread_manager
+
+    async def run_hitp():
+        async with pool.checkout() as agent:
+            response = await agent.ahitp(resume_request.approved, resume_request.thread_id,human_comment=resume_request.human_comment)
+            return {
+                "need_approval": False,
+                "response": response,
+            }
+
+    request_key = make_request_key("hitp", resume_request.model_dump())
+    try:
+        return await manager.submit(resume_request.thread_id, request_key, run_hitp)
+    except PoolSaturatedError as e:
+        raise_too_many_requests(e)
 
 
 @chat_api.get("/health")
 async def health_check():
-    return {"status": "healthy"}
\ No newline at end of file
+    return {"status": "healthy"}
+
+
+@chat_api.get("/stats")
+async def stats(req: Request):
+    """Agent pool queue depth / wait times and per-thread lock stats"""
+    return {
+        "agent_pool": req.app.state.agent_pool.stats(),
+        "threads": req.app.state.thread_manager.stats(),
+    }
\ No newline at end of file
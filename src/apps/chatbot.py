@@ -1,6 +1,9 @@
 import fastapi
 from apps.chat_apis import chat_api
 from agents.chat_agents import SimpleChatAgent
+from apps.thread_locks import ThreadTaskManager
+from apps.agent_pool import AgentPool
+from utils.checkpointer_utils import init_checkpointer
 import os
 
 
@@ -17,8 +20,13 @@ def init_app() -> fastapi.FastAPI:
 
     @app.on_event("startup")
     async def startup_event():
-        # Initialize the chat agent before the server starts handling requests
-        app.state.chat_agent = SimpleChatAgent()
+        # Pre-warm a pool of chat agents before the server starts handling requests.
+        # They share one checkpointer, so any agent can continue any thread.
+        checkpointer = init_checkpointer()
+        app.state.agent_pool = AgentPool.from_env(
+            lambda: SimpleChatAgent(save_image=False, checkpointer=checkpointer)
+        )
+        app.state.thread_manager = ThreadTaskManager()
 
     return app
 
@@ -0,0 +1,139 @@
+"""
+Per-thread concurrency control for the chat API.
+
+- Work on the same `thread_id` is serialized with one asyncio.Lock per thread,
+  so two requests never race on the same checkpoint.
+- Different threads never wait on each other.
+- Identical submissions that are still in flight (e.g. a double-click in the UI)
+  are coalesced: the duplicate awaits the result of the first run instead of
+  starting a second LLM run.
+- Streams are coalesced the same way: `stream` runs the producer once and fans its
+  events out to every subscriber of the same key, replaying what a late duplicate
+  missed. The producer runs in its own task, so it always finishes (and releases
+  what it holds) even when every client disconnects.
+"""
+
+import asyncio
+import hashlib
+import json
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+
+
+def make_request_key(endpoint: str, payload: Dict[str, Any]) -> str:
+    """Stable key for a request body, used to detect duplicate submissions"""
+    raw = json.dumps({"endpoint": endpoint, "payload": payload}, sort_keys=True)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class _Broadcast:
+    """Events of one stream run, shared by all its subscribers"""
+
+    def __init__(self):
+        self.events: List[Any] = []
+        self.done = False
+        self.error: Optional[BaseException] = None
+        self.changed = asyncio.Condition()
+
+
+class ThreadTaskManager:
+    """Serializes work per thread and coalesces duplicate in-flight requests"""
+
+    def __init__(self):
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._lock_users: Dict[str, int] = {}
+        self._inflight: Dict[Tuple[str, str], asyncio.Task] = {}
+        self._streams: Dict[Tuple[str, str], _Broadcast] = {}
+        self.coalesced_count = 0
+
+    @asynccontextmanager
+    async def lock(self, thread_id: str):
+        """Hold the lock of `thread_id`; the lock is dropped once nobody uses it"""
+        lock = self._locks.get(thread_id)
+        if lock is None:
+            lock = self._locks[thread_id] = asyncio.Lock()
+        self._lock_users[thread_id] = self._lock_users.get(thread_id, 0) + 1
+        try:
+            async with lock:
+                yield
+        finally:
+            self._lock_users[thread_id] -= 1
+            if self._lock_users[thread_id] == 0:
+                del self._lock_users[thread_id]
+                del self._locks[thread_id]
+
+    async def _run_locked(self, thread_id: str, func: Callable[[], Awaitable[Any]]):
+        async with self.lock(thread_id):
+            return await func()
+
+    async def submit(
+        self, thread_id: str, request_key: str, func: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """Run `func` under the thread lock, or join an identical run already in flight"""
+        key = (thread_id, request_key)
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced_count += 1
+        else:
+            task = asyncio.ensure_future(self._run_locked(thread_id, func))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # Shield the shared run: one disconnected client must not cancel it for the others
+        return await asyncio.shield(task)
+
+    async def _produce(
+        self, thread_id: str, produce: Callable[[], AsyncIterator[Any]], broadcast: _Broadcast
+    ) -> None:
+        try:
+            async with self.lock(thread_id):
+                async for event in produce():
+                    async with broadcast.changed:
+                        broadcast.events.append(event)
+                        broadcast.changed.notify_all()
+        except Exception as e:
+            broadcast.error = e
+        finally:
+            async with broadcast.changed:
+                broadcast.done = True
+                broadcast.changed.notify_all()
+
+    async def stream(
+        self, thread_id: str, request_key: str, produce: Callable[[], AsyncIterator[Any]]
+    ) -> AsyncIterator[Any]:
+        """Events of `produce()` run under the thread lock, or of an identical stream in flight.
+
+        An exception of the producer is re-raised in every subscriber after the events
+        produced before it.
+        """
+        key = (thread_id, request_key)
+        broadcast = self._streams.get(key)
+        if broadcast is not None:
+            self.coalesced_count += 1
+        else:
+            broadcast = self._streams[key] = _Broadcast()
+            task = asyncio.ensure_future(self._produce(thread_id, produce, broadcast))
+            task.add_done_callback(lambda _: self._streams.pop(key, None))
+
+        position = 0
+        while True:
+            async with broadcast.changed:
+                await broadcast.changed.wait_for(
+                    lambda: position < len(broadcast.events) or broadcast.done
+                )
+                events = broadcast.events[position:]
+                done = broadcast.done
+            for event in events:
+                yield event
+            position += len(events)
+            if done:
+                if broadcast.error is not None:
+                    raise broadcast.error
+                return
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "active_threads": len(self._locks),
+            "inflight_requests": len(self._inflight),
+            "inflight_streams": len(self._streams),
+            "coalesced_requests": self.coalesced_count,
+        }
@@ -0,0 +1,61 @@
+"""Load benchmark: concurrent /chat requests, blocking vs async agent path.
+
+Both variants run inside one event loop, exactly like a single uvicorn worker:
+- blocking: the old endpoint body, `agent.run_until_approval(...)` called from an `async def`
+- async:    the new endpoint body, `await agent.arun_until_approval(...)`
+
+A local fake LLM with fixed latency replaces Qwen, so the numbers only reflect
+how many requests the worker can overlap.
+
+Usage:
+    PYTHONPATH=src python src/benchmarks/bench_chat_concurrency.py --requests 200 --latency 0.2
+"""
+
+import argparse
+import asyncio
+import time
+
+from langgraph.checkpoint.memory import MemorySaver
+
+from agents.chat_agents import SimpleChatAgent
+from benchmarks.fake_llm import FakeLatencyChatModel
+
+
+async def blocking_endpoint(agent: SimpleChatAgent, thread_id: str) -> bool:
+    messages = [{"role": "user", "content": "hello"}]
+    return agent.run_until_approval(messages, thread_id)
+
+
+async def async_endpoint(agent: SimpleChatAgent, thread_id: str) -> bool:
+    messages = [{"role": "user", "content": "hello"}]
+    return await agent.arun_until_approval(messages, thread_id)
+
+
+async def run_load(endpoint, agent: SimpleChatAgent, num_requests: int) -> float:
+    start = time.perf_counter()
+    await asyncio.gather(
+        *[endpoint(agent, f"bench-{i}") for i in range(num_requests)]
+    )
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.2)
+    args = parser.parse_args()
+
+    llm = FakeLatencyChatModel(latency=args.latency)
+    agent = SimpleChatAgent(llm=llm, save_image=False, checkpointer=MemorySaver())
+
+    print(f"{args.requests} concurrent threads, fake LLM latency {args.latency}s")
+    for name, endpoint in [("blocking", blocking_endpoint), ("async", async_endpoint)]:
+        elapsed = asyncio.run(run_load(endpoint, agent, args.requests))
+        print(
+            f"{name:>9}: {elapsed:7.2f}s total, "
+            f"{args.requests / elapsed:8.1f} req/s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""Benchmark: time-to-first-token of the streaming path vs total latency.
+
+Usage:
+    PYTHONPATH=src python src/benchmarks/bench_chat_streaming.py --latency 0.3 --token-delay 0.02
+"""
+
+import argparse
+import asyncio
+import time
+
+from langgraph.checkpoint.memory import MemorySaver
+
+from agents.chat_agents import SimpleChatAgent
+from benchmarks.fake_llm import FakeLatencyChatModel
+
+
+async def measure(agent: SimpleChatAgent, thread_id: str):
+    messages = [{"role": "user", "content": "hello"}]
+    start = time.perf_counter()
+    first_token = None
+    async for event in agent.astream_until_approval(messages, thread_id):
+        if event["event"] == "token" and first_token is None:
+            first_token = time.perf_counter() - start
+    total = time.perf_counter() - start
+    return first_token, total
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--latency", type=float, default=0.3)
+    parser.add_argument("--token-delay", type=float, default=0.02)
+    args = parser.parse_args()
+
+    llm = FakeLatencyChatModel(
+        latency=args.latency,
+        token_delay=args.token_delay,
+        response=" ".join(["token"] * 50),
+    )
+    agent = SimpleChatAgent(llm=llm, save_image=False, checkpointer=MemorySaver())
+
+    first_token, total = asyncio.run(measure(agent, "bench-stream"))
+    print(f"time to first token: {first_token:.3f}s")
+    print(f"total latency:       {total:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
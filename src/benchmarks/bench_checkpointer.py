@@ -0,0 +1,70 @@
+"""Benchmark: checkpoint write/read latency per chat turn for each backend.
+
+Each turn runs the SimpleChatAgent graph once (fake LLM with zero latency, so the
+time is dominated by checkpoint writes) and then reads the state back.
+
+Usage:
+    PYTHONPATH=src python src/benchmarks/bench_checkpointer.py --turns 200
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+from langgraph.checkpoint.memory import MemorySaver
+
+from agents.chat_agents import SimpleChatAgent
+from benchmarks.fake_llm import FakeLatencyChatModel
+from utils.checkpointer_utils import PooledSqliteSaver
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+async def run_turns(agent: SimpleChatAgent, turns: int):
+    write_times, read_times = [], []
+    messages = [{"role": "user", "content": "hello"}]
+    for _ in range(turns):
+        start = time.perf_counter()
+        await agent.arun_until_approval(messages, "bench-checkpoint")
+        write_times.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        await agent.aget_last_message("bench-checkpoint")
+        read_times.append(time.perf_counter() - start)
+    return write_times, read_times
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--turns", type=int, default=200)
+    args = parser.parse_args()
+
+    tmp_dir = tempfile.mkdtemp()
+    backends = {
+        "memory": MemorySaver(),
+        "sqlite": PooledSqliteSaver(db_path=os.path.join(tmp_dir, "bench.db")),
+    }
+
+    for name, checkpointer in backends.items():
+        agent = SimpleChatAgent(
+            llm=FakeLatencyChatModel(latency=0),
+            save_image=False,
+            checkpointer=checkpointer,
+        )
+        write_times, read_times = asyncio.run(run_turns(agent, args.turns))
+        print(
+            f"{name:>7}: turn p50={statistics.median(write_times) * 1000:.2f}ms "
+            f"p95={percentile(write_times, 0.95) * 1000:.2f}ms | "
+            f"read p50={statistics.median(read_times) * 1000:.2f}ms "
+            f"p95={percentile(read_times, 0.95) * 1000:.2f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
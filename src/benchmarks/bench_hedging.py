@@ -0,0 +1,86 @@
+"""Benchmark: p50/p99 latency with and without hedged requests.
+
+The local stub answers in `--delay` seconds, but `--tail-probability` of the requests
+take `--tail-delay` seconds instead, mimicking a slow long tail from the provider.
+
+Usage:
+    PYTHONPATH=src python src/benchmarks/bench_hedging.py --requests 300 --hedge-delay 0.2
+"""
+
+import argparse
+import asyncio
+import time
+
+from openai import AsyncOpenAI
+
+from benchmarks.stub_llm_server import start_stub_server, stub_base_url
+from utils.qwen_api import ahedged_chat_completion, hedging_stats
+
+MESSAGES = [{"role": "user", "content": "hello"}]
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+async def plain_call(client: AsyncOpenAI, hedge_delay: float) -> str:
+    completion = await client.chat.completions.create(model="stub-model", messages=MESSAGES)
+    return completion.choices[0].message.content
+
+
+async def hedged_call(client: AsyncOpenAI, hedge_delay: float) -> str:
+    return await ahedged_chat_completion(
+        MESSAGES, model_name="stub-model", hedge_delay=hedge_delay, client=client
+    )
+
+
+async def run(call, base_url: str, requests: int, concurrency: int, hedge_delay: float):
+    client = AsyncOpenAI(api_key="stub", base_url=base_url, max_retries=0)
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one():
+        async with semaphore:
+            start = time.perf_counter()
+            await call(client, hedge_delay)
+            latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(*[one() for _ in range(requests)])
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--delay", type=float, default=0.05)
+    parser.add_argument("--tail-delay", type=float, default=2.0)
+    parser.add_argument("--tail-probability", type=float, default=0.05)
+    parser.add_argument("--hedge-delay", type=float, default=0.2)
+    args = parser.parse_args()
+
+    server = start_stub_server(
+        delay=args.delay, tail_delay=args.tail_delay, tail_probability=args.tail_probability
+    )
+    base_url = stub_base_url(server)
+
+    for name, call in [("plain", plain_call), ("hedged", hedged_call)]:
+        latencies = asyncio.run(
+            run(call, base_url, args.requests, args.concurrency, args.hedge_delay)
+        )
+        print(
+            f"{name:>7}: p50={percentile(latencies, 0.5) * 1000:.0f}ms "
+            f"p99={percentile(latencies, 0.99) * 1000:.0f}ms"
+        )
+
+    overhead = hedging_stats["hedges_fired"] / max(1, hedging_stats["calls"])
+    print(
+        f"hedges fired: {hedging_stats['hedges_fired']} / {hedging_stats['calls']} calls "
+        f"(+{overhead:.1%} requests), hedge wins: {hedging_stats['hedge_wins']}"
+    )
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
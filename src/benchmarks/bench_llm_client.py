@@ -0,0 +1,53 @@
+"""Micro-benchmark: per-call overhead of a fresh OpenAI client vs the shared registry client.
+
+Runs against the local stub server, so the measured time is client construction,
+connection setup and request overhead only.
+
+Usage:
+    PYTHONPATH=src python src/benchmarks/bench_llm_client.py --calls 500
+"""
+
+import argparse
+import time
+
+from openai import OpenAI
+
+from benchmarks.stub_llm_server import start_stub_server, stub_base_url
+from utils.openai_apis import call_openai_client_create
+from utils.qwen_api import llm_client_registry
+
+
+def fresh_client_call(base_url: str):
+    client = OpenAI(api_key="stub", base_url=base_url)
+    return call_openai_client_create(client, "hello", model="stub-model")
+
+
+def shared_client_call(base_url: str):
+    client = llm_client_registry.get_client(base_url=base_url, api_key="stub")
+    return call_openai_client_create(client, "hello", model="stub-model")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=500)
+    args = parser.parse_args()
+
+    server = start_stub_server()
+    base_url = stub_base_url(server)
+
+    results = {}
+    for name, call in [("fresh client", fresh_client_call), ("shared client", shared_client_call)]:
+        call(base_url)  # warm-up
+        start = time.perf_counter()
+        for _ in range(args.calls):
+            call(base_url)
+        results[name] = (time.perf_counter() - start) / args.calls
+        print(f"{name:>14}: {results[name] * 1000:.3f} ms/call")
+
+    saved = results["fresh client"] - results["shared client"]
+    print(f"overhead saved per call: {saved * 1000:.3f} ms")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""Benchmark: report writing, three-node fan-out vs single-pass structured output.
+
+The fan-out mode runs `write_report`, `write_introduction` and `write_conclusion` in
+parallel (as the graph does), each sending the full sections text; the single-pass mode
+sends it once through `write_full_report`. Prompt tokens are estimated from the messages
+actually sent (~3 characters per token).
+
+By default a fake LLM is used whose latency grows with prompt size
+(`--latency` + `--prefill-ms-per-1k` per 1k prompt tokens); `--real` uses Qwen instead.
+
+Usage:
+    PYTHONPATH=src python src/benchmarks/bench_report_writing.py --sections 10
+    PYTHONPATH=src python src/benchmarks/bench_report_writing.py --sections 5 --real
+"""
+
+import argparse
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.runnables import RunnableLambda
+
+from benchmarks.fake_llm import FakeLatencyChatModel
+from utils.context_compaction import estimate_tokens
+
+# TavilySearch validates the key at construction; the benchmark never calls it
+os.environ.setdefault("TAVILY_API_KEY", "bench")
+
+from agents.research_agents import ReaserchAgent  # noqa: E402
+
+_lock = threading.Lock()
+prompt_tokens = {"total": 0}
+
+
+def count_prompt(messages) -> int:
+    tokens = sum(estimate_tokens(str(getattr(m, "content", m))) for m in messages)
+    with _lock:
+        prompt_tokens["total"] += tokens
+    return tokens
+
+
+class PrefillChatModel(FakeLatencyChatModel):
+    """Fake chat model whose latency grows with the prompt size"""
+
+    prefill_ms_per_1k: float = 100.0
+
+    def _sleep_for(self, messages) -> float:
+        return self.latency + count_prompt(messages) / 1000 * self.prefill_ms_per_1k / 1000
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        time.sleep(self._sleep_for(messages) - self.latency)
+        return super()._generate(messages, stop=stop, run_manager=run_manager, **kwargs)
+
+    def with_structured_output(self, schema, **kwargs):
+        structured = super().with_structured_output(schema, **kwargs)
+
+        def invoke(messages):
+            time.sleep(self._sleep_for(messages) - self.latency)
+            return structured.invoke(messages)
+
+        return RunnableLambda(invoke)
+
+
+class PromptCounter(BaseCallbackHandler):
+    """Counts prompt tokens of every call of a real chat model"""
+
+    def on_chat_model_start(self, serialized, messages, **kwargs):
+        for batch in messages:
+            count_prompt(batch)
+
+
+def make_state(num_sections: int, section_words: int) -> dict:
+    section = "## Section\n### Summary\n" + "LangGraph insight [1]. " * (section_words // 3)
+    section += "\n### Sources\n[1] https://example.com\n"
+    return {"topic": "The benefits of adopting LangGraph", "sections": [section] * num_sections}
+
+
+def fan_out(agent: ReaserchAgent, state: dict) -> None:
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        futures = [
+            executor.submit(node, state)
+            for node in [agent.write_report, agent.write_introduction, agent.write_conclusion]
+        ]
+        for future in futures:
+            future.result()
+
+
+def single_pass(agent: ReaserchAgent, state: dict) -> None:
+    agent.write_full_report(state)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sections", type=int, default=10)
+    parser.add_argument("--section-words", type=int, default=400)
+    parser.add_argument("--latency", type=float, default=1.0)
+    parser.add_argument("--prefill-ms-per-1k", type=float, default=100.0)
+    parser.add_argument("--real", action="store_true", help="use Qwen instead of the fake LLM")
+    args = parser.parse_args()
+
+    if args.real:
+        from utils.env_utils import load_env
+
+        load_env()
+        agent = ReaserchAgent(save_image=False)
+        agent.llm.callbacks = [PromptCounter()]
+    else:
+        llm = PrefillChatModel(latency=args.latency, prefill_ms_per_1k=args.prefill_ms_per_1k)
+        agent = ReaserchAgent(llm=llm, save_image=False)
+
+    state = make_state(args.sections, args.section_words)
+    print(f"{args.sections} sections, ~{estimate_tokens(''.join(state['sections']))} tokens of sections")
+    print(f"{'mode':>12} {'seconds':>8} {'prompt tokens':>14}")
+    for name, run in [("fan-out", fan_out), ("single-pass", single_pass)]:
+        prompt_tokens["total"] = 0
+        start = time.perf_counter()
+        run(agent, state)
+        print(f"{name:>12} {time.perf_counter() - start:>8.2f} {prompt_tokens['total']:>14}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+"""Benchmark: ReaserchAgent interview map step, unbounded vs bounded concurrency.
+
+A fake LLM (fixed latency) and fake web / wikipedia search replace Qwen and Tavily.
+For 3, 10 and 30 analysts the map step runs
+- unbounded: max_parallel_interviews = number of analysts (same as one `Send` per analyst)
+- bounded:   max_parallel_interviews = --max-parallel
+and reports wall time, peak concurrent LLM calls (what the provider rate limit sees) and
+how many sections completed. Every `--straggler-every`-th analyst gets a slow search, so
+with a tight `--deadline` the report is written from the completed sections only.
+
+Usage:
+    PYTHONPATH=src python src/benchmarks/bench_research_interviews.py --max-parallel 4 --deadline 5
+"""
+
+import argparse
+import asyncio
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from langchain_core.runnables import RunnableLambda
+
+from benchmarks.fake_llm import FakeLatencyChatModel
+
+# TavilySearch validates the key at construction; the benchmark never calls it
+os.environ.setdefault("TAVILY_API_KEY", "bench")
+
+from agents.research_agents import Analyst, ReaserchAgent  # noqa: E402
+
+_lock = threading.Lock()
+llm_calls = {"in_flight": 0, "peak": 0}
+
+
+@contextmanager
+def counted_llm_call():
+    with _lock:
+        llm_calls["in_flight"] += 1
+        llm_calls["peak"] = max(llm_calls["peak"], llm_calls["in_flight"])
+    try:
+        yield
+    finally:
+        with _lock:
+            llm_calls["in_flight"] -= 1
+
+
+class CountingChatModel(FakeLatencyChatModel):
+    """Fake chat model that records the peak number of concurrent calls.
+
+    The interview nodes run their async implementations, so `_agenerate` is the path
+    that matters; `_generate` is counted too for sync callers.
+    """
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        with counted_llm_call():
+            return super()._generate(messages, stop=stop, run_manager=run_manager, **kwargs)
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        with counted_llm_call():
+            return await super()._agenerate(messages, stop=stop, run_manager=run_manager, **kwargs)
+
+    def with_structured_output(self, schema, **kwargs):
+        structured = super().with_structured_output(schema, **kwargs)
+
+        def invoke(messages):
+            with counted_llm_call():
+                return structured.invoke(messages)
+
+        async def ainvoke(messages):
+            with counted_llm_call():
+                return await structured.ainvoke(messages)
+
+        return RunnableLambda(invoke, afunc=ainvoke)
+
+
+class FakeSearchResearchAgent(ReaserchAgent):
+    def __init__(self, search_latency: float, straggler_delay: float, straggler_every: int, **kwargs):
+        super().__init__(**kwargs)
+        self.search_latency = search_latency
+        self.straggler_delay = straggler_delay
+        self.straggler_every = straggler_every
+
+    def _search_web(self, query: str) -> str:
+        return '<Document href="https://example.com">fake web result</Document>'
+
+    def _search_wikipedia(self, query: str) -> str:
+        return '<Document source="https://en.wikipedia.org/wiki/Fake" page="">fake page</Document>'
+
+    def is_straggler(self, state) -> bool:
+        # The slow analysts are picked by name so every run has the same stragglers
+        index = int(state["analyst"].name.split()[-1])
+        return bool(self.straggler_every) and index % self.straggler_every == self.straggler_every - 1
+
+    def search_delay(self, state) -> float:
+        """Both sources are searched side by side, so one search latency per turn"""
+        return self.search_latency + (self.straggler_delay if self.is_straggler(state) else 0.0)
+
+    def retrieve(self, state):
+        time.sleep(self.search_delay(state))
+        return super().retrieve(state)
+
+    async def aretrieve(self, state):
+        # The interview graph runs this under `ainvoke`; sleeping on the loop keeps the
+        # search latency and the straggler delay cancellable like a real async search
+        query = await self.agenerate_search_query(state)
+        await asyncio.sleep(self.search_delay(state))
+        return {"context": [self._search_web(query), self._search_wikipedia(query)]}
+
+
+def make_analysts(n: int):
+    return [
+        Analyst(
+            affiliation="Bench Inc.",
+            name=f"Analyst {i}",
+            role="Benchmark analyst",
+            description=f"Focus area number {i}",
+        )
+        for i in range(n)
+    ]
+
+
+def run(num_analysts: int, max_parallel: int, args) -> dict:
+    agent = FakeSearchResearchAgent(
+        search_latency=args.search_latency,
+        straggler_delay=args.straggler_delay,
+        straggler_every=args.straggler_every,
+        llm=CountingChatModel(latency=args.latency),
+        max_parallel_interviews=max_parallel,
+        interview_timeout=args.interview_timeout,
+        interviews_deadline=args.deadline,
+        save_image=False,
+    )
+    llm_calls["peak"] = 0
+    start = time.perf_counter()
+    result = agent.conduct_interviews(
+        {"topic": "benchmarking", "analysts": make_analysts(num_analysts)}, config={}
+    )
+    return {
+        "seconds": time.perf_counter() - start,
+        "peak_llm_calls": llm_calls["peak"],
+        "sections": len(result["sections"]),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--analysts", type=int, nargs="+", default=[3, 10, 30])
+    parser.add_argument("--max-parallel", type=int, default=4)
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--search-latency", type=float, default=0.3)
+    parser.add_argument("--straggler-delay", type=float, default=10.0)
+    parser.add_argument("--straggler-every", type=int, default=10)
+    parser.add_argument("--interview-timeout", type=float, default=60)
+    parser.add_argument("--deadline", type=float, default=120)
+    args = parser.parse_args()
+
+    print(f"{'analysts':>8} {'mode':>10} {'seconds':>8} {'peak llm':>8} {'sections':>9}")
+    for num_analysts in args.analysts:
+        for mode, max_parallel in [("unbounded", num_analysts), ("bounded", args.max_parallel)]:
+            r = run(num_analysts, max_parallel, args)
+            print(
+                f"{num_analysts:>8} {mode:>10} {r['seconds']:>8.2f} {r['peak_llm_calls']:>8} "
+                f"{r['sections']:>5}/{num_analysts:<3}"
+            )
+
+
+if __name__ == "__main__":
+    main()
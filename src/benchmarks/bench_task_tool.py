@@ -0,0 +1,90 @@
+"""Benchmark: supervisor fan-out through the `task` tool, sequential vs concurrent.
+
+One AI message with N `task` calls is run through a one-node graph whose ToolNode holds
+the task tool;
+each sub-agent is a `create_agent` graph over a fake LLM (fixed latency, no tool calls).
+
+- sequential: every task call awaited one after another (the old behaviour)
+- concurrent: the ToolNode gathers the calls through `ainvoke`, capped at --max-parallel
+
+Usage:
+    PYTHONPATH=src python src/benchmarks/bench_task_tool.py --tasks 8 --max-parallel 4
+"""
+
+import argparse
+import asyncio
+import time
+
+from langchain_core.messages import AIMessage
+from langgraph.graph import END, START, StateGraph
+from langgraph.graph.state import CompiledStateGraph
+from langgraph.prebuilt import ToolNode
+
+from agents.deep_agents.deep_agent_states import DeepAgentState
+from benchmarks.fake_llm import FakeLatencyChatModel
+from tools.task_tool import _create_task_tool
+
+SUBAGENTS = [
+    {
+        "name": "research-agent",
+        "description": "Delegate research to the sub-agent researcher.",
+        "prompt": "You are a researcher.",
+        "tools": [],
+    }
+]
+
+
+def task_calls(num_tasks: int):
+    return [
+        {
+            "name": "task",
+            "args": {"description": f"Research topic {i}", "subagent_type": "research-agent"},
+            "id": f"call_{i}",
+            "type": "tool_call",
+        }
+        for i in range(num_tasks)
+    ]
+
+
+def build_graph(task_tool) -> CompiledStateGraph:
+    # A ToolNode needs the runtime config a graph provides, it cannot run on its own
+    builder = StateGraph(DeepAgentState)
+    builder.add_node("tools", ToolNode([task_tool]))
+    builder.add_edge(START, "tools")
+    builder.add_edge("tools", END)
+    return builder.compile()
+
+
+async def run(graph: CompiledStateGraph, calls, sequential: bool) -> float:
+    start = time.perf_counter()
+    batches = [[call] for call in calls] if sequential else [calls]
+    for batch in batches:
+        state = {"messages": [AIMessage(content="", tool_calls=batch)], "files": {}}
+        await graph.ainvoke(state)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tasks", type=int, default=8)
+    parser.add_argument("--max-parallel", type=int, default=4)
+    parser.add_argument("--latency", type=float, default=1.0)
+    args = parser.parse_args()
+
+    task_tool = _create_task_tool(
+        [],
+        SUBAGENTS,
+        FakeLatencyChatModel(latency=args.latency),
+        DeepAgentState,
+        max_concurrency=args.max_parallel,
+    )
+    graph = build_graph(task_tool)
+    calls = task_calls(args.tasks)
+
+    print(f"{args.tasks} tasks, {args.latency}s per sub-agent, cap {args.max_parallel}")
+    for name, sequential in [("sequential", True), ("concurrent", False)]:
+        print(f"{name:>10} {asyncio.run(run(graph, calls, sequential)):>8.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Benchmark: virtual filesystem growth over a 500-file research session.
+
+Every turn runs a one-node `DeepAgentState` graph on the same thread with a MemorySaver;
+the node saves one scraped page, either the old way (the whole `files` dict in the
+update), as a delta (only the new path), or as a delta offloaded to a blob store
+(state keeps a reference + preview). Pages differ per turn, as scraped pages do.
+Reported per mode:
+
+- checkpoint bytes: serialized channel blobs + pending writes held by the saver
+- write bytes: the part of that coming from the `files` updates themselves
+- peak memory of the session (tracemalloc) and wall time
+
+Usage:
+    PYTHONPATH=src python src/benchmarks/bench_virtual_fs.py --files 500 --page-kb 20
+"""
+
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.graph import END, START, StateGraph
+
+from agents.deep_agents.deep_agent_states import DeepAgentState
+from utils.blob_store import BlobStore
+from utils.virtual_fs import offload_content
+
+
+def build_graph(mode: str, page: str, store: BlobStore):
+    def save_page(state: DeepAgentState):
+        number = len(state.get("files", {}))
+        filename = f"search_result_{number:04d}.md"
+        page_content = f"{page}\nresult {number}"
+        if mode == "offload":
+            return {"files": {filename: offload_content(page_content, store)}}
+        if mode == "full":
+            files = dict(state.get("files", {}))
+            files[filename] = page_content
+            return {"files": files}
+        return {"files": {filename: page_content}}
+
+    builder = StateGraph(DeepAgentState)
+    builder.add_node("save_page", save_page)
+    builder.add_edge(START, "save_page")
+    builder.add_edge("save_page", END)
+    checkpointer = MemorySaver()
+    return builder.compile(checkpointer=checkpointer), checkpointer
+
+
+def checkpoint_bytes(checkpointer: MemorySaver):
+    blobs = sum(len(data) for _, data in checkpointer.blobs.values())
+    writes = 0
+    for thread_writes in checkpointer.writes.values():
+        for _, channel, (_, data), _ in thread_writes.values():
+            if channel == "files":
+                writes += len(data)
+    return blobs + writes, writes
+
+
+def run(mode: str, num_files: int, page: str, store: BlobStore):
+    graph, checkpointer = build_graph(mode, page, store)
+    config = {"configurable": {"thread_id": f"bench-{mode}"}}
+    tracemalloc.start()
+    start = time.perf_counter()
+    for _ in range(num_files):
+        graph.invoke({"messages": []}, config)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    total, writes = checkpoint_bytes(checkpointer)
+    return elapsed, peak, total, writes
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--files", type=int, default=500)
+    parser.add_argument("--page-kb", type=int, default=20)
+    args = parser.parse_args()
+
+    page = "# Search Result\n" + "scraped page content " * (args.page_kb * 1024 // 21)
+    store = BlobStore(
+        db_path=os.path.join(tempfile.mkdtemp(), "blobs.db"), threshold_chars=8192
+    )
+    print(f"{args.files} files of ~{args.page_kb} KB")
+    print(f"{'mode':>7} {'seconds':>8} {'peak MB':>8} {'checkpoint MB':>14} {'write MB':>9}")
+    for mode in ["full", "delta", "offload"]:
+        elapsed, peak, total, writes = run(mode, args.files, page, store)
+        print(
+            f"{mode:>7} {elapsed:>8.2f} {peak / 2**20:>8.1f} "
+            f"{total / 2**20:>14.1f} {writes / 2**20:>9.1f}"
+        )
+    print(f"blob store: {store.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""Offline evaluation: semantic query index hit rate vs answer-quality drift per threshold.
+
+Every query is searched for real once, bypassing the search cache (whose entries may
+predate the current results). Then, for each threshold, the queries are replayed in order against a fresh
+`SemanticQueryIndex`; a hit serves the results of the nearest prior query, and its drift
+is 1 - Jaccard overlap between the served and the true result URLs.
+
+`group` labels (optional) mark queries that are paraphrases of each other, so hits that
+cross groups are reported as false hits.
+
+Usage:
+    PYTHONPATH=src python src/benchmarks/eval_semantic_query_index.py
+    PYTHONPATH=src python src/benchmarks/eval_semantic_query_index.py --queries queries.jsonl \
+        --source wikipedia --thresholds 0.85 0.9 0.95
+
+queries.jsonl lines: {"query": "...", "group": "..."}
+"""
+
+import argparse
+import json
+import os
+
+from utils.env_utils import load_env
+from utils.semantic_query_index import SemanticQueryIndex, normalize_vector, qwen_embedder
+from utils.search_cache import normalize_query
+
+DEFAULT_QUERIES = [
+    {"query": "LangGraph benefits for startups", "group": "langgraph-startups"},
+    {"query": "advantages of LangGraph for startups", "group": "langgraph-startups"},
+    {"query": "why should a startup use LangGraph", "group": "langgraph-startups"},
+    {"query": "LangGraph vs CrewAI comparison", "group": "langgraph-crewai"},
+    {"query": "how does LangGraph compare to CrewAI", "group": "langgraph-crewai"},
+    {"query": "Model Context Protocol developed by Anthropic", "group": "mcp"},
+    {"query": "what is Anthropic's Model Context Protocol (MCP)", "group": "mcp"},
+    {"query": "MCP security risks", "group": "mcp-security"},
+    {"query": "LangGraph checkpointer persistence", "group": "langgraph-persistence"},
+    {"query": "how to persist LangGraph state with a checkpointer", "group": "langgraph-persistence"},
+]
+
+
+def result_ids(source: str, docs) -> set:
+    if source == "wikipedia":
+        return {doc["metadata"].get("source") for doc in docs}
+    return {doc.get("url") for doc in docs}
+
+
+def jaccard(a: set, b: set) -> float:
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+def evaluate(queries, truths, vectors, source: str, threshold: float):
+    index = SemanticQueryIndex(embed=lambda texts: [vectors[t] for t in texts], threshold=threshold)
+    hits, false_hits, drifts = 0, 0, []
+    groups = {}
+    for item in queries:
+        query = normalize_query(item["query"])
+        best = index.nearest("eval", vectors[query], exclude_query=query)
+        if best is not None and best[0] >= threshold:
+            hits += 1
+            drifts.append(1 - jaccard(result_ids(source, best[2]), result_ids(source, truths[query])))
+            if item.get("group") and groups.get(best[1]) != item["group"]:
+                false_hits += 1
+        else:
+            index.add("eval", query, vectors[query], truths[query])
+        groups[query] = item.get("group")
+    return {
+        "threshold": threshold,
+        "hit_rate": hits / len(queries),
+        "false_hits": false_hits,
+        "mean_drift_on_hits": sum(drifts) / len(drifts) if drifts else 0.0,
+        "mean_drift_overall": sum(drifts) / len(queries),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--queries", help="JSONL file with {query, group} lines")
+    parser.add_argument("--source", choices=["tavily", "wikipedia"], default="tavily")
+    parser.add_argument("--thresholds", type=float, nargs="+", default=[0.8, 0.85, 0.9, 0.92, 0.95])
+    args = parser.parse_args()
+
+    load_env()
+    # Ground truth must come from real searches, never from the index under test or the cache
+    os.environ["SEMANTIC_QUERY_INDEX_ENABLED"] = "false"
+    os.environ["SEARCH_CACHE_ENABLED"] = "false"
+    from agents.research_agents import fetch_web_docs, fetch_wikipedia_docs
+
+    if args.queries:
+        with open(args.queries, "r", encoding="utf-8") as f:
+            queries = [json.loads(line) for line in f if line.strip()]
+    else:
+        queries = DEFAULT_QUERIES
+
+    fetch_docs = fetch_wikipedia_docs if args.source == "wikipedia" else fetch_web_docs
+    normalized = [normalize_query(item["query"]) for item in queries]
+    truths = {query: fetch_docs(query) for query in normalized}
+    embeddings = qwen_embedder()(normalized)
+    vectors = {query: normalize_vector(vector) for query, vector in zip(normalized, embeddings)}
+
+    print(f"{len(queries)} queries, source={args.source}")
+    print(f"{'threshold':>9} {'hit rate':>9} {'false hits':>10} {'drift(hits)':>11} {'drift(all)':>10}")
+    for threshold in args.thresholds:
+        r = evaluate(queries, truths, vectors, args.source, threshold)
+        print(
+            f"{r['threshold']:>9.2f} {r['hit_rate']:>9.1%} {r['false_hits']:>10d} "
+            f"{r['mean_drift_on_hits']:>11.2f} {r['mean_drift_overall']:>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Local fake chat model used by the benchmarks.
+
+It behaves like a remote chat model (fixed latency per call, optional
+per-token delay when streaming) without touching the network, so the
+benchmarks measure our own orchestration overhead rather than DashScope.
+"""
+
+import asyncio
+import time
+from typing import Any, List, Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.runnables import RunnableLambda
+from pydantic import BaseModel
+
+
+class FakeLatencyChatModel(BaseChatModel):
+    """Chat model that sleeps `latency` seconds and returns a canned answer."""
+
+    latency: float = 0.2
+    token_delay: float = 0.0
+    response: str = "This is a fake response from a local model."
+    # Returned by `with_structured_output` when it is an instance of the requested schema
+    structured_response: Optional[Any] = None
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-latency-chat-model"
+
+    def bind_tools(self, tools, **kwargs):
+        # The fake model never emits tool calls, so binding is a no-op
+        return self
+
+    def with_structured_output(self, schema, **kwargs):
+        """Sleep `latency` and return `structured_response`, or a schema instance whose
+        string fields are all set to `response`"""
+
+        def build() -> BaseModel:
+            if isinstance(self.structured_response, schema):
+                return self.structured_response
+            return schema.model_construct(
+                **{
+                    name: self.response
+                    for name, field in schema.model_fields.items()
+                    if field.annotation is str
+                }
+            )
+
+        def invoke(messages):
+            time.sleep(self.latency)
+            return build()
+
+        async def ainvoke(messages):
+            await asyncio.sleep(self.latency)
+            return build()
+
+        return RunnableLambda(invoke, afunc=ainvoke)
+
+    def _tokens(self) -> List[str]:
+        return [token + " " for token in self.response.split(" ")]
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager=None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        time.sleep(self.latency)
+        message = AIMessage(content=self.response)
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager=None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        await asyncio.sleep(self.latency)
+        message = AIMessage(content=self.response)
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs):
+        time.sleep(self.latency)
+        for token in self._tokens():
+            time.sleep(self.token_delay)
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=token))
+            if run_manager:
+                run_manager.on_llm_new_token(token, chunk=chunk)
+            yield chunk
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs):
+        await asyncio.sleep(self.latency)
+        for token in self._tokens():
+            await asyncio.sleep(self.token_delay)
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=token))
+            if run_manager:
+                await run_manager.on_llm_new_token(token, chunk=chunk)
+            yield chunk
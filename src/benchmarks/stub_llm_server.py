@@ -0,0 +1,76 @@
+"""Local OpenAI-compatible stub server for the client benchmarks.
+
+Answers POST */chat/completions with a fixed completion after an optional delay.
+HTTP/1.1 keep-alive is enabled so pooled clients can reuse connections.
+"""
+
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def make_completion(content: str, model: str = "stub-model") -> dict:
+    return {
+        "id": "chatcmpl-stub",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [
+            {
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }
+        ],
+        "usage": {"prompt_tokens": 10, "completion_tokens": 10, "total_tokens": 20},
+    }
+
+
+class StubLLMHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Set by start_stub_server
+    delay = 0.0
+    tail_delay = 0.0
+    tail_probability = 0.0
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        request = json.loads(self.rfile.read(length) or b"{}")
+
+        delay = self.delay
+        if self.tail_probability and random.random() < self.tail_probability:
+            delay = self.tail_delay
+        time.sleep(delay)
+
+        body = json.dumps(
+            make_completion("stub answer", model=request.get("model", "stub-model"))
+        ).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_stub_server(
+    delay: float = 0.0, tail_delay: float = 0.0, tail_probability: float = 0.0
+) -> ThreadingHTTPServer:
+    """Start the stub on a free localhost port; base_url is http://127.0.0.1:<port>/v1"""
+    handler = type(
+        "ConfiguredStubLLMHandler",
+        (StubLLMHandler,),
+        {"delay": delay, "tail_delay": tail_delay, "tail_probability": tail_probability},
+    )
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def stub_base_url(server: ThreadingHTTPServer) -> str:
+    return f"http://127.0.0.1:{server.server_address[1]}/v1"
@@ -1 +1,5 @@
-DB_PATH = "data/state_db/chat_history.db"
\ No newline at end of file
+DB_PATH = "data/state_db/chat_history.db"
+LLM_CACHE_DB_PATH = "data/cache_db/llm_cache.db"
+SEARCH_CACHE_DB_PATH = "data/cache_db/search_cache.db"
+RESEARCH_STORE_DB_PATH = "data/research_db/research_runs.db"
+BLOB_STORE_DB_PATH = "data/blob_db/virtual_fs_blobs.db"
@@ -1,4 +1,4 @@
-from typing import Dict, List, Text
+from typing import Dict, Iterator, List, Text
 
 import streamlit as st
 import requests
@@ -6,7 +6,7 @@ import json
 from uuid import uuid4
 import os
 
-CHAT_API_URL = "http://localhost:8000/chat"
+CHAT_STREAM_API_URL = "http://localhost:8000/chat/stream"
 HITP_API_URL = "http://localhost:8000/hitp"
 THREAD_ID = "t001"
 
@@ -14,32 +14,55 @@ THREAD_ID = "t001"
 DEBUG_TIMEOUT = 300 if os.getenv("STREAMLIT_DEBUG") else 30
 
 
-def send_message(messages: List[Dict[Text, Text]], thread_id: Text) -> Dict:
-    headers = {"Content-Type": "application/json"}
+def stream_message(
+    messages: List[Dict[Text, Text]], thread_id: Text, result: Dict
+) -> Iterator[Text]:
+    """Yield LLM tokens from the SSE endpoint as they arrive.
+
+    The final `end` event (need_approval / response) is stored into `result`
+    so the caller can decide whether to show the approval buttons; a stream
+    that ends without it is reported as an error.
+    """
+    headers = {"Content-Type": "application/json", "Accept": "text/event-stream"}
     data = {"messages": messages, "thread_id": thread_id}
     try:
-        response = requests.post(
-            CHAT_API_URL, headers=headers, data=json.dumps(data), timeout=DEBUG_TIMEOUT
-        )
-        response.raise_for_status()
-        return response.json()
+        with requests.post(
+            CHAT_STREAM_API_URL,
+            headers=headers,
+            data=json.dumps(data),
+            stream=True,
+            timeout=DEBUG_TIMEOUT,
+        ) as response:
+            response.raise_for_status()
+            for line in response.iter_lines(decode_unicode=True):
+                if not line or not line.startswith("data:"):
+                    continue
+                event = json.loads(line[len("data:"):].strip())
+                if event["event"] == "token" and event["node"] == "agent":
+                    yield event["content"]
+                elif event["event"] == "end":
+                    result.update(event)
+                elif event["event"] == "error":
+                    st.error(f"❌ API Error: {event['status_code']} - {event['detail']}")
+                    result.update({"error": event["detail"], "response": f"HTTP Error {event['status_code']}"})
+            if "event" not in result and "error" not in result:
+                # The server closed the stream without its final event (crash / proxy cut)
+                st.error("❌ Chat stream ended before the response was complete")
+                result.update({"error": "Incomplete stream", "response": "The response was interrupted"})
     except requests.exceptions.ConnectionError:
         st.error(
             "❌ Cannot connect to chat API. Make sure the FastAPI server is running on http://localhost:8000"
         )
-        return {"error": "Connection failed", "response": "API server not available"}
+        result.update({"error": "Connection failed", "response": "API server not available"})
     except requests.exceptions.Timeout:
         st.error(f"❌ API request timed out after {DEBUG_TIMEOUT} seconds")
-        return {
-            "error": "Timeout",
-            "response": f"Request took longer than {DEBUG_TIMEOUT} seconds",
-        }
+        result.update({"error": "Timeout", "response": f"Request took longer than {DEBUG_TIMEOUT} seconds"})
     except requests.exceptions.HTTPError as e:
         st.error(f"❌ API Error: {e.response.status_code} - {e.response.text}")
-        return {"error": str(e), "response": f"HTTP Error {e.response.status_code}"}
+        result.update({"error": str(e), "response": f"HTTP Error {e.response.status_code}"})
     except Exception as e:
         st.error(f"❌ Unexpected error: {str(e)}")
-        return {"error": str(e), "response": "An error occurred"}
+        result.update({"error": str(e), "response": "An error occurred"})
 
 
 def resume(approved: bool, thread_id: Text, human_comment: Text = "") -> Dict:
@@ -147,9 +170,16 @@ elif prompt := st.chat_input("What is up?"):
     # Add user message to chat history
     st.session_state.messages.append({"role": "user", "content": prompt})
 
-    result = send_message(
-        st.session_state.messages, thread_id=st.session_state.thread_id
-    )
+    # Render tokens incrementally; the final event lands in `result`
+    result = {}
+    with st.chat_message("assistant"):
+        st.write_stream(
+            stream_message(
+                st.session_state.messages,
+                thread_id=st.session_state.thread_id,
+                result=result,
+            )
+        )
 
     if "error" in result:
         st.error(f"API Error: {result['error']}")
@@ -159,13 +189,9 @@ elif prompt := st.chat_input("What is up?"):
         # Show what the agent said before pausing
         st.session_state.awaiting_approval = True
     else:
-
-        with st.chat_message("assistant"):
-            # Show what the agent said before pausing
-            st.markdown(result["response"])
-            # Add assistant response to chat history
-            st.session_state.messages.append(
-                {"role": "assistant", "content": result["response"]}
-            )
+        # Add assistant response to chat history
+        st.session_state.messages.append(
+            {"role": "assistant", "content": result.get("response", "")}
+        )
 
     st.rerun()
@@ -85,13 +85,25 @@ Parameters:
 
 Important: This replaces the entire file content."""
 
+GREP_FILES_DESCRIPTION = """Search the contents of all files in the virtual filesystem with a regular expression.
+
+Returns every matching line as `path:line_number: line`, so you can jump to it with read_file(offset=line_number - 1).
+
+Parameters:
+- pattern (required): Regular expression to search for
+- glob (optional): Only search files whose path matches this glob, e.g. "search_result_*.md"
+- ignore_case (optional, default=False): Case-insensitive matching
+- max_matches (optional, default=100): Maximum number of matching lines to return
+
+Use this instead of reading whole files when you are looking for specific facts in collected sources."""
+
 FILE_USAGE_INSTRUCTIONS = """You have access to a virtual file system to help you retain and save context.
 
 ## Workflow Process
 1. **Orient**: Use ls() to see existing files before starting work
 2. **Save**: Use write_file() to store the user's request so that we can keep it for later 
 3. **Research**: Proceed with research. The search tool will write files.  
-4. **Read**: Once you are satisfied with the collected sources, read the files and use them to answer the user's question directly.
+4. **Read**: Once you are satisfied with the collected sources, read the files (use grep_files() to find specific facts across them) and use them to answer the user's question directly.
 """
 
 SUMMARIZE_WEB_SEARCH = """You are creating a minimal summary for research steering - your goal is to help an agent know what information it has collected, NOT to preserve all details.
@@ -169,6 +181,8 @@ After each search tool call, use think_tool to analyze the results:
 
 TASK_DESCRIPTION_PREFIX = """Delegate a task to a specialized sub-agent with isolated context. Available agents for delegation are:
 {other_agents}
+
+The sub-agent only sees the task description and the files listed in `files` (paths in the virtual filesystem); files it creates or changes are merged back into yours.
 """
 
 SUBAGENT_USAGE_INSTRUCTIONS = """You can delegate tasks to sub-agents.
@@ -178,9 +192,10 @@ Your role is to coordinate research by delegating specific research tasks to sub
 </Task>
 
 <Available Tools>
-1. **task(description, subagent_type)**: Delegate research tasks to specialized sub-agents
+1. **task(description, subagent_type, files)**: Delegate research tasks to specialized sub-agents
    - description: Clear, specific research question or task
    - subagent_type: Type of agent to use (e.g., "research-agent")
+   - files (optional): Paths of existing files the sub-agent needs; it sees no other files
 2. **think_tool(reflection)**: Reflect on the results of each delegated task and plan next steps.
    - reflection: Your detailed reflection on the results of the task and next steps.
 
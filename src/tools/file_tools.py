@@ -4,7 +4,8 @@ This module provides tools for managing a virtual filesystem stored in agent sta
 enabling context offloading and information persistence across agent interactions.
 """
 
-from typing import Annotated
+import re
+from typing import Annotated, Optional
 
 from langchain_core.messages import ToolMessage
 from langchain_core.tools import InjectedToolCallId, tool
@@ -12,11 +13,18 @@ from langgraph.prebuilt import InjectedState
 from langgraph.types import Command
 
 from prompts.deep_agent_prompts import (
+    GREP_FILES_DESCRIPTION,
     LS_DESCRIPTION,
     READ_FILE_DESCRIPTION,
     WRITE_FILE_DESCRIPTION,
 )
 from agents.deep_agents.deep_agent_states import DeepAgentState
+from utils.virtual_fs import (
+    grep_files as grep_virtual_files,
+    line_index,
+    offload_content,
+    resolve_content,
+)
 
 
 @tool(description=LS_DESCRIPTION)
@@ -47,20 +55,22 @@ def read_file(
     if file_path not in files:
         return f"Error: File '{file_path}' not found"
 
-    content = files[file_path]
+    try:
+        # Large files are kept in the blob store, state only holds a reference + preview
+        content = resolve_content(files[file_path])
+    except KeyError as e:
+        return f"Error: Content of '{file_path}' is missing from the blob store ({e})"
     if not content:
         return "System reminder: File exists but has empty contents"
 
-    lines = content.splitlines()
-    start_idx = offset
-    end_idx = min(start_idx + limit, len(lines))
-
-    if start_idx >= len(lines):
-        return f"Error: Line offset {offset} exceeds file length ({len(lines)} lines)"
+    # Cached per content: only the requested window is sliced, no full split per call
+    index = line_index(content)
+    if offset >= index.line_count:
+        return f"Error: Line offset {offset} exceeds file length ({index.line_count} lines)"
 
     result_lines = []
-    for i in range(start_idx, end_idx):
-        line_content = lines[i][:2000]  # Truncate long lines
+    for i, line in index.lines(offset, limit):
+        line_content = line[:2000]  # Truncate long lines
         result_lines.append(f"{i + 1:6d}\t{line_content}")
 
     return "\n".join(result_lines)
@@ -84,13 +94,46 @@ def write_file(
     Returns:
         Command to update agent state with new file content
     """
-    files = state.get("files", {})
-    files[file_path] = content
+    # Build the line index now so the first read_file of a long page is already a window slice
+    line_index(content)
+    # Only the written path goes through the reducer; never mutate the injected state.
+    # Large content goes to the blob store, the state keeps a reference + preview.
     return Command(
         update={
-            "files": files,
+            "files": {file_path: offload_content(content)},
             "messages": [
                 ToolMessage(f"Updated file {file_path}", tool_call_id=tool_call_id)
             ],
         }
     )
+
+
+@tool(description=GREP_FILES_DESCRIPTION, parse_docstring=True)
+def grep_files(
+    pattern: str,
+    state: Annotated[DeepAgentState, InjectedState],
+    glob: Optional[str] = None,
+    ignore_case: bool = False,
+    max_matches: int = 100,
+) -> str:
+    """Search all files in the virtual filesystem for a regular expression.
+
+    Args:
+        pattern: Regular expression to search for
+        state: Agent state containing virtual filesystem (injected in tool node)
+        glob: Only search files whose path matches this glob pattern (default: all files)
+        ignore_case: Case-insensitive matching (default: False)
+        max_matches: Maximum number of matching lines to return (default: 100)
+
+    Returns:
+        Matching lines as `path:line_number: line`, or a message if nothing matched
+    """
+    try:
+        matches = grep_virtual_files(
+            state.get("files", {}), pattern, glob=glob, ignore_case=ignore_case, max_matches=max_matches
+        )
+    except re.error as e:
+        return f"Error: Invalid pattern '{pattern}': {e}"
+    if not matches:
+        return f"No matches for '{pattern}'"
+    return "\n".join(f"{path}:{number}: {line[:2000]}" for path, number, line in matches)
@@ -20,6 +20,8 @@ from typing_extensions import Annotated, Literal
 
 from deep_agents_from_scratch.prompts import SUMMARIZE_WEB_SEARCH
 from deep_agents_from_scratch.state import DeepAgentState
+from utils.search_cache import cached_search
+from utils.virtual_fs import line_index, offload_content
 
 # Summarization model 
 summarization_model = init_chat_model(model="openai:gpt-4o-mini")
@@ -51,11 +53,17 @@ def run_tavily_search(
     Returns:
         Search results dictionary
     """
-    result = tavily_client.search(
+    params = {
+        "max_results": max_results,
+        "include_raw_content": include_raw_content,
+        "topic": topic,
+    }
+    # Raw client response, cached apart from the result lists of the Tavily tools
+    result = cached_search(
+        "tavily_client",
         search_query,
-        max_results=max_results,
-        include_raw_content=include_raw_content,
-        topic=topic
+        lambda: tavily_client.search(search_query, **params),
+        params=params,
     )
 
     return result
@@ -183,8 +191,8 @@ def tavily_search(
     # Process and summarize results
     processed_results = process_search_results(search_results)
 
-    # Save each result to a file and prepare summary
-    files = state.get("files", {})
+    # Save each result to a file and prepare summary (only new files go into the update)
+    files = {}
     saved_files = []
     summaries = []
 
@@ -206,7 +214,9 @@ def tavily_search(
 {result['raw_content'] if result['raw_content'] else 'No raw content available'}
 """
 
-        files[filename] = file_content
+        # Raw pages are large: state keeps a blob reference + preview, not the page
+        files[filename] = offload_content(file_content)
+        line_index(file_content)  # later read_file calls only slice their window
         saved_files.append(filename)
         summaries.append(f"- {filename}: {result['summary']}...")
 
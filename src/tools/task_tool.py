@@ -5,11 +5,14 @@ with isolated contexts. Sub-agents prevent context clash by operating with clean
 context windows containing only their specific task description.
 """
 
-from typing import Annotated, NotRequired
+import asyncio
+import threading
+import weakref
+from typing import Annotated, NotRequired, Optional
 from typing_extensions import TypedDict
 
 from langchain_core.messages import ToolMessage
-from langchain_core.tools import BaseTool, InjectedToolCallId, tool
+from langchain_core.tools import BaseTool, InjectedToolCallId, StructuredTool, tool
 from langgraph.prebuilt import InjectedState  # updated 1.0
 from langchain.agents import create_agent  # updated 1.0
 
@@ -17,6 +20,8 @@ from langgraph.types import Command
 
 from prompts.deep_agent_prompts import TASK_DESCRIPTION_PREFIX
 from agents.deep_agents.deep_agent_states import DeepAgentState
+from utils.env_utils import EnvLoader
+from utils.virtual_fs import diff_files
 
 
 class SubAgent(TypedDict):
@@ -28,7 +33,9 @@ class SubAgent(TypedDict):
     tools: NotRequired[list[str]]
 
 
-def _create_task_tool(tools, subagents: list[SubAgent], model, state_schema):
+def _create_task_tool(
+    tools, subagents: list[SubAgent], model, state_schema, max_concurrency: Optional[int] = None
+):
     """Create a task delegation tool that enables context isolation through sub-agents.
 
     This function implements the core pattern for spawning specialized sub-agents with
@@ -39,9 +46,14 @@ def _create_task_tool(tools, subagents: list[SubAgent], model, state_schema):
         subagents: List of specialized sub-agent configurations
         model: The language model to use for all agents
         state_schema: The state schema (typically DeepAgentState)
+        max_concurrency: Maximum sub-agents running at once (default: env
+            DEEP_AGENT_MAX_PARALLEL_TASKS, else 4)
 
     Returns:
-        A 'task' tool that can delegate work to specialized sub-agents
+        A 'task' tool that can delegate work to specialized sub-agents. Several task
+        calls in one AI message run concurrently (threads on `invoke`, `ainvoke` on the
+        async path); their updates are applied in tool-call order, so when two
+        sub-agents write the same file the later call wins, deterministically.
     """
     # Create agent registry
     agents = {}
@@ -70,36 +82,45 @@ def _create_task_tool(tools, subagents: list[SubAgent], model, state_schema):
         f"- {_agent['name']}: {_agent['description']}" for _agent in subagents
     ]
 
-    @tool(description=TASK_DESCRIPTION_PREFIX.format(other_agents=other_agents_string))
-    def task(
-        description: str,
-        subagent_type: str,
-        state: Annotated[DeepAgentState, InjectedState],
-        tool_call_id: Annotated[str, InjectedToolCallId],
-    ):
-        """Delegate a task to a specialized sub-agent with isolated context.
-
-        This creates a fresh context for the sub-agent containing only the task description,
-        preventing context pollution from the parent agent's conversation history.
-        """
+    # Cap on sub-agents running at once, shared by the sync and async paths of `task`
+    if max_concurrency is None:
+        max_concurrency = EnvLoader().get_int("DEEP_AGENT_MAX_PARALLEL_TASKS", 4)
+    thread_slots = threading.BoundedSemaphore(max_concurrency)
+    loop_slots = weakref.WeakKeyDictionary()  # asyncio.Semaphore per event loop
+
+    def _async_slots() -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        slots = loop_slots.get(loop)
+        if slots is None:
+            slots = loop_slots[loop] = asyncio.Semaphore(max_concurrency)
+        return slots
+
+    def _prepare(description: str, subagent_type: str, state: dict, files: Optional[list[str]]):
+        """(sub-agent, sub-agent input) or (None, error message)"""
         # Validate requested agent type exists
         if subagent_type not in agents:
-            return f"Error: invoked agent of type {subagent_type}, the only allowed types are {[f'`{k}`' for k in agents]}"
-
-        # Get the requested sub-agent
-        sub_agent = agents[subagent_type]
-
-        # Create isolated context with only the task description
-        # This is the key to context isolation - no parent history
-        state["messages"] = [{"role": "user", "content": description}]
-
-        # Execute the sub-agent in isolation
-        result = sub_agent.invoke(state)
-
+            return None, f"Error: invoked agent of type {subagent_type}, the only allowed types are {[f'`{k}`' for k in agents]}"
+
+        parent_files = state.get("files", {})
+        missing = [path for path in files or [] if path not in parent_files]
+        if missing:
+            return None, f"Error: files {missing} not found, available files are {list(parent_files)}"
+
+        # Scoped handoff: a new input holding only the task description and the selected
+        # files - no parent history, todos or other files. The parent state is never
+        # mutated, parallel task calls share the same injected state object.
+        return agents[subagent_type], {
+            "messages": [{"role": "user", "content": description}],
+            "files": {path: parent_files[path] for path in files or []},
+        }
+
+    def _to_command(sub_state: dict, result: dict, tool_call_id: str) -> Command:
         # Return results to parent agent via Command state update
         return Command(
             update={
-                "files": result.get("files", {}),  # Merge any file changes
+                # Only files the sub-agent created, changed or deleted, as a delta
+                # against what it was given; the parent reducer merges it
+                "files": diff_files(sub_state["files"], result.get("files")),
                 "messages": [
                     # Sub-agent result becomes a ToolMessage in parent context
                     ToolMessage(
@@ -109,4 +130,47 @@ def _create_task_tool(tools, subagents: list[SubAgent], model, state_schema):
             }
         )
 
-    return task
+    def task(
+        description: str,
+        subagent_type: str,
+        state: Annotated[DeepAgentState, InjectedState],
+        tool_call_id: Annotated[str, InjectedToolCallId],
+        files: Optional[list[str]] = None,
+    ):
+        """Delegate a task to a specialized sub-agent with isolated context.
+
+        This creates a fresh context for the sub-agent containing only the task description
+        and the `files` selected by the caller, preventing context pollution from the parent
+        agent's conversation history and keeping every delegation small.
+        """
+        sub_agent, sub_state = _prepare(description, subagent_type, state, files)
+        if sub_agent is None:
+            return sub_state
+
+        # Execute the sub-agent in isolation
+        with thread_slots:
+            result = sub_agent.invoke(sub_state)
+        return _to_command(sub_state, result, tool_call_id)
+
+    async def atask(
+        description: str,
+        subagent_type: str,
+        state: Annotated[DeepAgentState, InjectedState],
+        tool_call_id: Annotated[str, InjectedToolCallId],
+        files: Optional[list[str]] = None,
+    ):
+        """Async `task`: the tool node gathers all task calls of one AI message concurrently."""
+        sub_agent, sub_state = _prepare(description, subagent_type, state, files)
+        if sub_agent is None:
+            return sub_state
+
+        async with _async_slots():
+            result = await sub_agent.ainvoke(sub_state)
+        return _to_command(sub_state, result, tool_call_id)
+
+    return StructuredTool.from_function(
+        func=task,
+        coroutine=atask,
+        name="task",
+        description=TASK_DESCRIPTION_PREFIX.format(other_agents=other_agents_string),
+    )
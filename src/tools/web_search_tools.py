@@ -11,6 +11,7 @@ It’s easy to sign up and offers a generous free tier. We'll use Tavily for bui
 from langchain_core.tools import tool
 from langchain_community.tools.tavily_search import TavilySearchResults
 from utils.env_utils import load_env
+from utils.search_cache import cached_search
 
 
 def run_tavily_search():
@@ -59,12 +60,17 @@ def web_search(
     Example:
         web_search("machine learning applications in healthcare")
     """
-    # Initialize the Tavily Search Tool
-    tavily_search = TavilySearchResults(max_results=3)
+    def fetch():
+        # Initialize the Tavily Search Tool
+        tavily_search = TavilySearchResults(max_results=3)
 
-    # Call the search tool with the query
-    data = tavily_search.invoke({"query": query})
-    search_docs = data.get("results", data)
+        # Call the search tool with the query
+        data = tavily_search.invoke({"query": query})
+        return data.get("results", data) if isinstance(data, dict) else data
+
+    # Repeated queries are served from the shared search cache. The source is specific to
+    # this tool: other Tavily callers cache a different payload shape for the same query.
+    search_docs = cached_search("tavily_search_results", query, fetch, params={"max_results": 3})
 
     # Format
     formatted_search_docs = "\n\n---\n\n".join(
@@ -0,0 +1,183 @@
+"""
+Content-addressed blob store for large virtual files of deep agents.
+
+Scraped pages saved by `tavily_search` can be hundreds of KB each; kept inline in
+`state["files"]` they are serialized into every checkpoint. Files above a size threshold
+are stored here instead and the state keeps a small reference with a preview, see
+`utils.virtual_fs.offload_content` / `resolve_content`.
+
+- key: sha256 of the UTF-8 content, so identical pages are stored once
+- storage: SQLite, shared across threads, runs and processes
+- compression: zstd (`zstandard` package), zlib when it is not installed; the codec is
+  stored per blob, zlib blobs read anywhere, zstd blobs need `zstandard`
+- recently read blobs are kept decompressed in a small LRU, returning the same string
+  object so per-content caches (line indexes) hit
+
+Env vars:
+    BLOB_STORE_ENABLED=true
+    BLOB_STORE_DB_PATH=data/blob_db/virtual_fs_blobs.db
+    BLOB_STORE_THRESHOLD_CHARS=8192
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from configs.db_config import BLOB_STORE_DB_PATH
+from utils.env_utils import EnvLoader
+
+try:
+    import zstandard
+except ImportError:  # zlib fallback, see module docstring
+    zstandard = None
+
+
+def content_digest(content: str) -> str:
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+class BlobStore:
+    """SQLite store of compressed text blobs keyed by their sha256"""
+
+    def __init__(
+        self,
+        db_path: str = BLOB_STORE_DB_PATH,
+        compression_level: int = 3,
+        cache_max_chars: int = 16 * 1024 * 1024,
+        threshold_chars: int = 8192,
+    ):
+        self.db_path = db_path
+        # Files at least this long are offloaded by `utils.virtual_fs.offload_content`
+        self.threshold_chars = threshold_chars
+        self.compression_level = compression_level
+        self.cache_max_chars = cache_max_chars
+
+        self._lock = threading.Lock()
+        self._cache: "OrderedDict[str, str]" = OrderedDict()
+        self._cache_chars = 0
+        self.metrics = {"puts": 0, "dedup_hits": 0, "gets": 0, "cache_hits": 0}
+
+        db_dir = os.path.dirname(db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL;")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS blobs (
+                digest TEXT PRIMARY KEY,
+                codec TEXT NOT NULL,
+                chars INTEGER NOT NULL,
+                data BLOB NOT NULL,
+                created_at REAL NOT NULL
+            );"""
+        )
+        self._conn.commit()
+
+    def _compress(self, raw: bytes):
+        if zstandard is not None:
+            return "zstd", zstandard.ZstdCompressor(level=self.compression_level).compress(raw)
+        return "zlib", zlib.compress(raw, min(self.compression_level, 9))
+
+    @staticmethod
+    def _decompress(codec: str, data: bytes) -> bytes:
+        if codec == "zstd":
+            if zstandard is None:
+                raise RuntimeError("Blob was compressed with zstd; install the zstandard package")
+            return zstandard.ZstdDecompressor().decompress(data)
+        return zlib.decompress(data)
+
+    def _remember(self, digest: str, content: str) -> None:
+        """Keep a decompressed blob in the LRU (caller holds the lock)"""
+        if digest in self._cache:
+            self._cache.move_to_end(digest)
+            return
+        self._cache[digest] = content
+        self._cache_chars += len(content)
+        while self._cache_chars > self.cache_max_chars and len(self._cache) > 1:
+            _, evicted = self._cache.popitem(last=False)
+            self._cache_chars -= len(evicted)
+
+    def put(self, content: str) -> str:
+        """Store the content once and return its digest"""
+        digest = content_digest(content)
+        with self._lock:
+            self.metrics["puts"] += 1
+            exists = self._conn.execute(
+                "SELECT 1 FROM blobs WHERE digest = ?", (digest,)
+            ).fetchone()
+            if exists:
+                self.metrics["dedup_hits"] += 1
+            else:
+                codec, data = self._compress(content.encode("utf-8"))
+                self._conn.execute(
+                    "INSERT OR IGNORE INTO blobs (digest, codec, chars, data, created_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (digest, codec, len(content), data, time.time()),
+                )
+                self._conn.commit()
+            self._remember(digest, content)
+        return digest
+
+    def get(self, digest: str) -> str:
+        """Content of a blob; raises KeyError when it is not in the store"""
+        with self._lock:
+            self.metrics["gets"] += 1
+            content = self._cache.get(digest)
+            if content is not None:
+                self._cache.move_to_end(digest)
+                self.metrics["cache_hits"] += 1
+                return content
+            row = self._conn.execute(
+                "SELECT codec, data FROM blobs WHERE digest = ?", (digest,)
+            ).fetchone()
+        if row is None:
+            raise KeyError(digest)
+        content = self._decompress(row[0], row[1]).decode("utf-8")
+        with self._lock:
+            self._remember(digest, content)
+        return content
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM blobs")
+            self._conn.commit()
+            self._cache.clear()
+            self._cache_chars = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            blobs, chars, stored = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(chars), 0), COALESCE(SUM(LENGTH(data)), 0) FROM blobs"
+            ).fetchone()
+            return {
+                **self.metrics,
+                "blobs": blobs,
+                "chars": chars,
+                "stored_bytes": stored,
+                "cached_blobs": len(self._cache),
+            }
+
+
+# Created once: constructing an EnvLoader searches the filesystem for the .env file
+_env = EnvLoader()
+_blob_store: Optional[BlobStore] = None
+_blob_store_lock = threading.Lock()
+
+
+def get_blob_store() -> Optional[BlobStore]:
+    """Process-wide blob store built from env vars, or None when BLOB_STORE_ENABLED is false"""
+    global _blob_store
+    if not _env.get_bool("BLOB_STORE_ENABLED", True):
+        return None
+    with _blob_store_lock:
+        if _blob_store is None:
+            _blob_store = BlobStore(
+                db_path=_env.get("BLOB_STORE_DB_PATH", BLOB_STORE_DB_PATH),
+                threshold_chars=_env.get_int("BLOB_STORE_THRESHOLD_CHARS", 8192),
+            )
+        return _blob_store
@@ -0,0 +1,249 @@
+"""
+Pluggable LangGraph checkpointers.
+
+MemorySaver keeps every thread in the heap of one process: it grows without bound,
+is lost on restart and cannot be shared by several uvicorn workers.
+`PooledSqliteSaver` persists checkpoints into SQLite instead:
+
+- WAL journal mode, so readers never block the single writer and several processes can share the file
+- a small pool of connections (one `SqliteSaver` per connection), checked out per call
+- async methods run the sync ones in a worker thread, so the same saver serves `stream` and `astream`
+- TTL-based eviction of idle threads, tracked in a `thread_activity` table
+
+Select the backend with env vars:
+    CHECKPOINTER_BACKEND=sqlite|memory   (default sqlite)
+    CHECKPOINT_DB_PATH=data/state_db/chat_history.db
+    CHECKPOINT_POOL_SIZE=4
+    CHECKPOINT_TTL_SECONDS=0             (0 disables eviction)
+"""
+
+import asyncio
+import os
+import queue
+import sqlite3
+import time
+from contextlib import contextmanager
+from typing import Any, AsyncIterator, Iterator, List, Optional, Sequence, Tuple
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+)
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.checkpoint.sqlite import SqliteSaver
+
+from configs.db_config import DB_PATH
+from utils.env_utils import EnvLoader
+
+
+def create_sqlite_connection(db_path: str) -> sqlite3.Connection:
+    """Open a connection tuned for a checkpoint store shared across threads and processes"""
+    conn = sqlite3.connect(db_path, check_same_thread=False, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL;")
+    # NORMAL is durable in WAL mode except for the last transactions on power loss
+    conn.execute("PRAGMA synchronous=NORMAL;")
+    conn.execute("PRAGMA busy_timeout=30000;")
+    return conn
+
+
+class PooledSqliteSaver(BaseCheckpointSaver):
+    """SQLite checkpointer backed by a pool of WAL connections, with idle-thread eviction"""
+
+    def __init__(
+        self,
+        db_path: str = DB_PATH,
+        pool_size: int = 4,
+        ttl_seconds: float = 0,
+        eviction_interval: float = 60,
+    ):
+        super().__init__()
+        self.db_path = db_path
+        self.pool_size = pool_size
+        self.ttl_seconds = ttl_seconds
+        self.eviction_interval = eviction_interval
+        self._last_eviction = time.time()
+
+        db_dir = os.path.dirname(db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+
+        self._pool: "queue.Queue[SqliteSaver]" = queue.Queue()
+        for _ in range(pool_size):
+            saver = SqliteSaver(create_sqlite_connection(db_path))
+            saver.setup()
+            self._pool.put(saver)
+
+        with self._saver() as saver:
+            with saver.lock:
+                saver.conn.execute(
+                    """CREATE TABLE IF NOT EXISTS thread_activity (
+                        thread_id TEXT PRIMARY KEY,
+                        last_seen REAL NOT NULL
+                    );"""
+                )
+                saver.conn.commit()
+
+    @contextmanager
+    def _saver(self) -> Iterator[SqliteSaver]:
+        saver = self._pool.get()
+        try:
+            yield saver
+        finally:
+            self._pool.put(saver)
+
+    # --- sync API, delegated to a pooled SqliteSaver ---
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        with self._saver() as saver:
+            return saver.get_tuple(config)
+
+    def list(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[CheckpointTuple]:
+        # Materialize inside the checkout so the connection is not held by a lazy generator
+        with self._saver() as saver:
+            checkpoints = list(
+                saver.list(config, filter=filter, before=before, limit=limit)
+            )
+        yield from checkpoints
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        with self._saver() as saver:
+            next_config = saver.put(config, checkpoint, metadata, new_versions)
+            self._touch(saver, config["configurable"]["thread_id"])
+        self._maybe_evict()
+        return next_config
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        with self._saver() as saver:
+            saver.put_writes(config, writes, task_id, task_path)
+
+    def delete_thread(self, thread_id: str) -> None:
+        with self._saver() as saver:
+            saver.delete_thread(thread_id)
+            with saver.lock:
+                saver.conn.execute(
+                    "DELETE FROM thread_activity WHERE thread_id = ?", (thread_id,)
+                )
+                saver.conn.commit()
+
+    def get_next_version(self, current: Optional[str], channel: None) -> str:
+        with self._saver() as saver:
+            return saver.get_next_version(current, channel)
+
+    # --- async API, the sync calls run in a worker thread ---
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def alist(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        checkpoints = await asyncio.to_thread(
+            lambda: list(self.list(config, filter=filter, before=before, limit=limit))
+        )
+        for checkpoint in checkpoints:
+            yield checkpoint
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        return await asyncio.to_thread(
+            self.put, config, checkpoint, metadata, new_versions
+        )
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        await asyncio.to_thread(self.put_writes, config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        await asyncio.to_thread(self.delete_thread, thread_id)
+
+    # --- TTL eviction ---
+
+    def _touch(self, saver: SqliteSaver, thread_id: str) -> None:
+        with saver.lock:
+            saver.conn.execute(
+                """INSERT INTO thread_activity (thread_id, last_seen) VALUES (?, ?)
+                ON CONFLICT(thread_id) DO UPDATE SET last_seen = excluded.last_seen""",
+                (thread_id, time.time()),
+            )
+            saver.conn.commit()
+
+    def _maybe_evict(self) -> None:
+        if not self.ttl_seconds:
+            return
+        if time.time() - self._last_eviction < self.eviction_interval:
+            return
+        self._last_eviction = time.time()
+        self.evict_idle_threads()
+
+    def evict_idle_threads(self, ttl_seconds: Optional[float] = None) -> List[str]:
+        """Delete every thread whose last checkpoint is older than `ttl_seconds`"""
+        ttl_seconds = ttl_seconds if ttl_seconds is not None else self.ttl_seconds
+        cutoff = time.time() - ttl_seconds
+        with self._saver() as saver:
+            with saver.lock:
+                rows = saver.conn.execute(
+                    "SELECT thread_id FROM thread_activity WHERE last_seen < ?",
+                    (cutoff,),
+                ).fetchall()
+        thread_ids = [row[0] for row in rows]
+        for thread_id in thread_ids:
+            self.delete_thread(thread_id)
+        return thread_ids
+
+    def close(self) -> None:
+        while not self._pool.empty():
+            self._pool.get().conn.close()
+
+
+def init_checkpointer(backend: Optional[str] = None) -> BaseCheckpointSaver:
+    """Build the checkpointer selected by `backend` or the CHECKPOINTER_BACKEND env var"""
+    env = EnvLoader()
+    backend = backend or env.get("CHECKPOINTER_BACKEND", "sqlite")
+    if backend == "memory":
+        return MemorySaver()
+    elif backend == "sqlite":
+        return PooledSqliteSaver(
+            db_path=env.get("CHECKPOINT_DB_PATH", DB_PATH),
+            pool_size=env.get_int("CHECKPOINT_POOL_SIZE", 4),
+            ttl_seconds=env.get_int("CHECKPOINT_TTL_SECONDS", 0),
+        )
+    else:
+        raise ValueError(f"Unknown checkpointer backend '{backend}'")
@@ -0,0 +1,101 @@
+"""
+Compaction of retrieved `<Document>` context before it is put into a prompt.
+
+Interview context grows by one web + one wikipedia block per turn, with the same pages
+coming back again and again. `compact_documents`:
+
+1. splits the context blocks into single documents
+2. drops duplicates by URL / source, then by content hash
+3. ranks the rest by term overlap with a query (e.g. the analyst persona)
+4. keeps the most relevant documents within a token budget, truncating the last one
+
+Kept documents are re-emitted in retrieval order with their original `href` / `source`
+tags, so citations in answers and sections still resolve.
+"""
+
+import hashlib
+import math
+import re
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Tuple
+
+DOCUMENT_PATTERN = re.compile(r"<Document ([^>]*)>\n?(.*?)\n?</Document>", re.DOTALL)
+SOURCE_PATTERN = re.compile(r'(?:href|source)="([^"]*)"')
+TERM_PATTERN = re.compile(r"\w{3,}")
+DOCUMENT_SEPARATOR = "\n\n---\n\n"
+
+STOP_WORDS = {
+    "the", "and", "for", "with", "that", "this", "are", "was", "from", "their", "they",
+    "about", "how", "what", "who", "which", "into", "has", "have", "its", "not", "you",
+}
+
+
+def estimate_tokens(text: str) -> int:
+    # ~3 characters per token, the same estimate the rate limiter uses
+    return len(text) // 3
+
+
+def parse_documents(context: Iterable[str]) -> List[Tuple[str, str, str]]:
+    """(attributes, source, content) of every <Document> in the context blocks"""
+    documents = []
+    for block in context:
+        for attributes, content in DOCUMENT_PATTERN.findall(block):
+            match = SOURCE_PATTERN.search(attributes)
+            documents.append((attributes, match.group(1) if match else "", content.strip()))
+    return documents
+
+
+def terms(text: str) -> Counter:
+    return Counter(t for t in TERM_PATTERN.findall(text.lower()) if t not in STOP_WORDS)
+
+
+def relevance(query_terms: Counter, content: str) -> float:
+    content_terms = terms(content)
+    return sum(math.log1p(content_terms[t]) for t in query_terms)
+
+
+def compact_documents(
+    context: Iterable[str], query: str, token_budget: int = 3000
+) -> Tuple[str, Dict[str, Any]]:
+    """Deduplicate, rank and trim context documents; returns (compacted text, stats)"""
+    context = list(context)
+    documents = parse_documents(context)
+
+    unique, seen_sources, seen_hashes = [], set(), set()
+    for attributes, source, content in documents:
+        content_hash = hashlib.sha256(content.encode("utf-8")).hexdigest()
+        if (source and source != "N/A" and source in seen_sources) or content_hash in seen_hashes:
+            continue
+        seen_sources.add(source)
+        seen_hashes.add(content_hash)
+        unique.append((attributes, content))
+
+    query_terms = terms(query)
+    ranked = sorted(
+        range(len(unique)), key=lambda i: (-relevance(query_terms, unique[i][1]), i)
+    )
+
+    kept, remaining = {}, token_budget
+    for i in ranked:
+        attributes, content = unique[i]
+        tokens = estimate_tokens(content)
+        if tokens <= remaining:
+            kept[i] = content
+            remaining -= tokens
+        elif remaining > 0:
+            kept[i] = content[: remaining * 3].rstrip() + " ..."
+            remaining = 0
+        else:
+            break
+
+    compacted = DOCUMENT_SEPARATOR.join(
+        f"<Document {unique[i][0]}>\n{kept[i]}\n</Document>" for i in sorted(kept)
+    )
+    stats = {
+        "documents": len(documents),
+        "unique_documents": len(unique),
+        "kept_documents": len(kept),
+        "tokens_before": sum(estimate_tokens(block) for block in context),
+        "tokens_after": estimate_tokens(compacted),
+    }
+    return compacted, stats
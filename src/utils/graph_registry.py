@@ -0,0 +1,138 @@
+"""
+Process-wide registry of compiled LangGraph graphs.
+
+Compiling a graph (and, before, rendering its PNG through the mermaid service) on every
+request is pure cold-start cost. Agents ask the registry for a graph by a key; the build
+function only runs the first time a key is seen, later calls return the same compiled
+graph. The registry is a bounded LRU.
+
+Registered graphs are shared by every agent of a class, so they must not capture any
+agent: nodes are `agent_node`s, which call a method of the agent found in
+`config["configurable"]["graph_agent"]`, and the graph is compiled without a checkpointer.
+Each agent uses its own cheap copy from `bind_agent`, carrying its checkpointer and
+itself in the default config; the key is then just (agent class, graph name).
+
+Diagram rendering is an explicit offline step, never part of a request:
+
+    PYTHONPATH=src python -m utils.graph_registry --graph-dir ./images/langgraph_images
+"""
+
+import argparse
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from langchain_core.runnables import RunnableConfig, RunnableLambda
+from langgraph.graph.state import CompiledStateGraph
+
+AGENT_CONFIG_KEY = "graph_agent"
+
+
+def agent_from_config(config: RunnableConfig) -> Any:
+    """Agent bound to the running graph by `bind_agent`"""
+    return config["configurable"][AGENT_CONFIG_KEY]
+
+
+def agent_node(name: str, aname: Optional[str] = None, pass_config: bool = False) -> RunnableLambda:
+    """Node (or conditional edge) calling method `name` of the bound agent, `aname` under
+    `ainvoke`; the method also gets the run config when `pass_config` is set"""
+
+    def node(state, config: RunnableConfig):
+        method = getattr(agent_from_config(config), name)
+        return method(state, config) if pass_config else method(state)
+
+    async def anode(state, config: RunnableConfig):
+        method = getattr(agent_from_config(config), aname)
+        return await (method(state, config) if pass_config else method(state))
+
+    return RunnableLambda(node, afunc=anode if aname else None, name=name)
+
+
+def bind_agent(graph: CompiledStateGraph, agent: Any, checkpointer: Any = None) -> CompiledStateGraph:
+    """Copy of a registered graph running `agent`'s methods, with its own checkpointer"""
+    if checkpointer is not None:
+        graph = graph.copy({"checkpointer": checkpointer})
+    return graph.with_config(configurable={AGENT_CONFIG_KEY: agent})
+
+
+class GraphRegistry:
+    def __init__(self, max_graphs: int = 64):
+        self.max_graphs = max_graphs
+        self._graphs: "OrderedDict[Hashable, Tuple[str, CompiledStateGraph]]" = OrderedDict()
+        # Re-entrant: building a parent graph may fetch its sub-graphs from the registry
+        self._lock = threading.RLock()
+        self.metrics = {"hits": 0, "compiles": 0, "compile_seconds": 0.0, "evictions": 0}
+
+    def get_or_compile(
+        self, key: Hashable, build: Callable[[], CompiledStateGraph], filename: str
+    ) -> CompiledStateGraph:
+        """Compiled graph for `key`, built once per process; `filename` names its diagram"""
+        with self._lock:
+            entry = self._graphs.get(key)
+            if entry is not None:
+                self._graphs.move_to_end(key)
+                self.metrics["hits"] += 1
+                return entry[1]
+            # Compile under the lock so concurrent first requests do not compile twice
+            start = time.perf_counter()
+            graph = build()
+            self.metrics["compile_seconds"] += time.perf_counter() - start
+            self.metrics["compiles"] += 1
+            self._graphs[key] = (filename, graph)
+            while len(self._graphs) > self.max_graphs:
+                self._graphs.popitem(last=False)
+                self.metrics["evictions"] += 1
+            return graph
+
+    def render_images(self, graph_dir: str = "./images/langgraph_images") -> int:
+        """Render a PNG of every registered graph (needs the mermaid rendering service)"""
+        from utils.langchain_utils import save_graph_image
+
+        with self._lock:
+            entries = list(self._graphs.values())
+        rendered = set()
+        for filename, graph in entries:
+            if filename in rendered:
+                continue
+            save_graph_image(graph, filename=filename, graph_dir=graph_dir)
+            rendered.add(filename)
+        return len(rendered)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._graphs.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self.metrics, "graphs": len(self._graphs)}
+
+
+graph_registry = GraphRegistry()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render diagrams of the agent graphs")
+    parser.add_argument("--graph-dir", default="./images/langgraph_images")
+    args = parser.parse_args()
+
+    from langgraph.checkpoint.memory import MemorySaver
+
+    from utils.env_utils import load_env
+    from agents.chat_agents import SimpleChatAgent
+    from agents.research_agents import ReaserchAgent, SimpleResearchAgent
+
+    load_env()
+    SimpleChatAgent(checkpointer=MemorySaver())
+    SimpleResearchAgent().build_graph()
+    research_agent = ReaserchAgent()
+    research_agent.build_analysts_graph()
+    research_agent.build_interview_graph()
+    research_agent.build_overall_graph()
+
+    count = graph_registry.render_images(args.graph_dir)
+    print(f"Rendered {count} graph images to {args.graph_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+"""
+Content-addressed cache for LLM responses.
+
+The key is a sha256 over model + messages + call params + response_format JSON schema
+(+ base_url), so the same request to the same endpoint always maps to the same entry.
+
+Two tiers:
+- in-memory LRU (per process, fastest)
+- on-disk SQLite (shared across runs and processes), entries expire after a TTL
+
+Only deterministic calls (temperature 0) are cached by default.
+
+Used by:
+- `utils.openai_apis.call_openai_client` (and therefore `call_qwen_with_openai_client`)
+- LangChain chat models from `init_langchain_chat_openai`, via `LangChainLLMCache`
+
+Env vars:
+    LLM_CACHE_ENABLED=true
+    LLM_CACHE_DB_PATH=data/cache_db/llm_cache.db
+    LLM_CACHE_TTL_SECONDS=604800
+    LLM_CACHE_MAX_ENTRIES=1024
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from langchain_core.caches import BaseCache, RETURN_VAL_TYPE
+from langchain_core.load import dumps, loads
+from pydantic import BaseModel
+
+from configs.db_config import LLM_CACHE_DB_PATH
+from utils.env_utils import EnvLoader
+
+
+def make_cache_key(
+    model: str,
+    messages: Any,
+    params: Optional[Dict[str, Any]] = None,
+    response_format: Optional[type] = None,
+    base_url: str = "",
+) -> str:
+    """sha256 over a canonical JSON encoding of everything that determines the response"""
+    schema = None
+    if response_format is not None and isinstance(response_format, type) and issubclass(response_format, BaseModel):
+        schema = response_format.model_json_schema()
+    payload = {
+        "model": model,
+        "messages": messages,
+        "params": params or {},
+        "response_format": schema,
+        "base_url": base_url,
+    }
+    raw = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+    """Two-tier (memory LRU + SQLite) cache of JSON-serializable LLM responses"""
+
+    def __init__(
+        self,
+        db_path: Optional[str] = LLM_CACHE_DB_PATH,
+        max_entries: int = 1024,
+        ttl_seconds: float = 7 * 24 * 3600,
+    ):
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._memory: "OrderedDict[str, tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.metrics = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "writes": 0}
+
+        self._conn = None
+        if db_path:
+            db_dir = os.path.dirname(db_path)
+            if db_dir:
+                os.makedirs(db_dir, exist_ok=True)
+            self._conn = sqlite3.connect(db_path, check_same_thread=False, timeout=30)
+            self._conn.execute("PRAGMA journal_mode=WAL;")
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS llm_cache (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    expires_at REAL NOT NULL
+                );"""
+            )
+            self._conn.commit()
+
+    def get(self, key: str) -> Optional[Any]:
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None and entry[0] > now:
+                self._memory.move_to_end(key)
+                self.metrics["memory_hits"] += 1
+                return entry[1]
+            if entry is not None:
+                del self._memory[key]
+
+            if self._conn is not None:
+                row = self._conn.execute(
+                    "SELECT value, expires_at FROM llm_cache WHERE key = ? AND expires_at > ?",
+                    (key, now),
+                ).fetchone()
+                if row is not None:
+                    value = json.loads(row[0])
+                    self._remember(key, value, row[1])
+                    self.metrics["disk_hits"] += 1
+                    return value
+
+            self.metrics["misses"] += 1
+            return None
+
+    def set(self, key: str, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        ttl_seconds = ttl_seconds if ttl_seconds is not None else self.ttl_seconds
+        expires_at = time.time() + ttl_seconds
+        with self._lock:
+            self._remember(key, value, expires_at)
+            if self._conn is not None:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO llm_cache (key, value, expires_at) VALUES (?, ?, ?)",
+                    (key, json.dumps(value, ensure_ascii=False), expires_at),
+                )
+                self._conn.commit()
+            self.metrics["writes"] += 1
+
+    def _remember(self, key: str, value: Any, expires_at: float) -> None:
+        self._memory[key] = (expires_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM llm_cache")
+                self._conn.commit()
+
+    def purge_expired(self) -> int:
+        with self._lock:
+            if self._conn is None:
+                return 0
+            cursor = self._conn.execute(
+                "DELETE FROM llm_cache WHERE expires_at <= ?", (time.time(),)
+            )
+            self._conn.commit()
+            return cursor.rowcount
+
+    def stats(self) -> Dict[str, Any]:
+        hits = self.metrics["memory_hits"] + self.metrics["disk_hits"]
+        total = hits + self.metrics["misses"]
+        return {**self.metrics, "hit_ratio": hits / total if total else 0.0}
+
+
+class LangChainLLMCache(BaseCache):
+    """Adapter so LangChain chat models (`cache=` argument) read and write LLMResponseCache"""
+
+    def __init__(self, cache: LLMResponseCache):
+        self.cache = cache
+
+    def _key(self, prompt: str, llm_string: str) -> str:
+        # llm_string already encodes the model name, params and any bound tools / schemas
+        return make_cache_key(model=llm_string, messages=prompt)
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        value = self.cache.get(self._key(prompt, llm_string))
+        if value is None:
+            return None
+        return [loads(generation) for generation in value]
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        self.cache.set(
+            self._key(prompt, llm_string),
+            [dumps(generation) for generation in return_val],
+        )
+
+    def clear(self, **kwargs: Any) -> None:
+        self.cache.clear()
+
+
+# Created once: constructing an EnvLoader searches the filesystem for the .env file
+_env = EnvLoader()
+_llm_cache: Optional[LLMResponseCache] = None
+_llm_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> Optional[LLMResponseCache]:
+    """Process-wide cache built from env vars, or None when LLM_CACHE_ENABLED is false"""
+    global _llm_cache
+    if not _env.get_bool("LLM_CACHE_ENABLED", True):
+        return None
+    with _llm_cache_lock:
+        if _llm_cache is None:
+            _llm_cache = LLMResponseCache(
+                db_path=_env.get("LLM_CACHE_DB_PATH", LLM_CACHE_DB_PATH),
+                max_entries=_env.get_int("LLM_CACHE_MAX_ENTRIES", 1024),
+                ttl_seconds=_env.get_int("LLM_CACHE_TTL_SECONDS", 7 * 24 * 3600),
+            )
+        return _llm_cache
+
+
+def get_langchain_llm_cache() -> Optional[LangChainLLMCache]:
+    cache = get_llm_cache()
+    return LangChainLLMCache(cache) if cache is not None else None
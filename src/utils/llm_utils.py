@@ -1,7 +1,8 @@
 import os
+from typing import Optional
 from openai import OpenAI
-from env_utils import load_env
-from qwen_api import qwen_client, QWEN_PLUS
+from utils.env_utils import load_env
+from utils.qwen_api import QWEN_PLUS, init_openai_client_with_qwen, hedged_chat_completion
 
 # === Env & Clients ===
 load_env()
@@ -9,7 +10,13 @@ load_env()
 # Both clients read keys from env by default; explicit is also fine:
 
 
-def get_response(prompt: str,model: str=QWEN_PLUS) -> str:
+def get_response(prompt: str,model: str=QWEN_PLUS,
+                 hedge_delay: Optional[float] = None, hedge_model: Optional[str] = None) -> str:
+    """Get a single response.
+
+    For Qwen models, pass `hedge_delay` (seconds) to fire a second request to `hedge_model`
+    (default: the same model) when the first one is slow; the first valid answer wins.
+    """
     if "claude" in model.lower() or "anthropic" in model.lower():
         # anthropic_api_key = os.getenv("ANTHROPIC_API_KEY")
         # anthropic_client = Anthropic(api_key=anthropic_api_key) if anthropic_api_key else Anthropic()
@@ -31,14 +38,20 @@ def get_response(prompt: str,model: str=QWEN_PLUS) -> str:
         )
         return response.output_text
     else:
+        messages = [
+            {"role": "system", "content": "You are a helpful assistant."},
+            {"role": "user", "content": prompt},
+        ]
+        if hedge_delay is not None:
+            return hedged_chat_completion(
+                messages, model_name=model, hedge_model_name=hedge_model, hedge_delay=hedge_delay
+            )
+        qwen_client = init_openai_client_with_qwen()
         completion = qwen_client.chat.completions.create(
             model= model, #"qwen3-max",  # 模型列表：https://help.aliyun.com/zh/model-studio/getting-started/models
-            messages=[
-                {"role": "system", "content": "You are a helpful assistant."},
-                {"role": "user", "content": prompt},
-            ],
+            messages=messages,
         )
         return completion.choices[0].message.content
 
 if __name__ == "__main__":
-    print(get_response("Whao are you?"))
\ No newline at end of file
+    print(get_response("Whao are you?"))
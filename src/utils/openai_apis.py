@@ -1,5 +1,6 @@
 from  openai import OpenAI
 from pydantic import BaseModel
+from utils.llm_cache import get_llm_cache, make_cache_key
 # from utils.retry import CustomerQuery
 
 def call_openai_client_create(client:OpenAI, prompt:str, model="gpt-4o",temperature=0):
@@ -49,7 +50,7 @@ def print_class_inheritence(llm_response):
 
 #print_class_inheritence(response)
 
-def call_openai_client(client:OpenAI, prompt:str,response_format:BaseModel,  
+def _call_openai_client(client:OpenAI, prompt:str,response_format:BaseModel,  
                        model_name="gpt-4o", temperature=0,  use_response_api=False):
     if response_format is None:
         response_content = call_openai_client_create(client, prompt,model=model_name,temperature=temperature)
@@ -60,7 +61,31 @@ def call_openai_client(client:OpenAI, prompt:str,response_format:BaseModel,
     else:
         response_output_parsed = call_openai_client_response_api(client, prompt, text_format=response_format,model=model_name,)
         return response_output_parsed
-    
-    
 
 
+def call_openai_client(client:OpenAI, prompt:str,response_format:BaseModel,  
+                       model_name="gpt-4o", temperature=0,  use_response_api=False, use_cache=True):
+    """Call the model, served from the LLM response cache for deterministic (temperature 0) calls"""
+    cache = get_llm_cache() if use_cache and temperature == 0 else None
+    if cache is None:
+        return _call_openai_client(client, prompt, response_format, model_name=model_name,
+                                   temperature=temperature, use_response_api=use_response_api)
+
+    key = make_cache_key(
+        model=model_name,
+        messages=[{"role": "user", "content": prompt}],
+        params={"temperature": temperature, "use_response_api": use_response_api},
+        response_format=response_format,
+        base_url=str(client.base_url),
+    )
+    cached = cache.get(key)
+    if cached is not None:
+        # The response API returns a parsed pydantic object, which is stored as a dict
+        if use_response_api and response_format is not None:
+            return response_format.model_validate(cached)
+        return cached
+
+    response = _call_openai_client(client, prompt, response_format, model_name=model_name,
+                                   temperature=temperature, use_response_api=use_response_api)
+    cache.set(key, response.model_dump() if isinstance(response, BaseModel) else response)
+    return response
@@ -6,8 +6,12 @@ pip install langchain-community dashscope
 """
 import os
 import time
+import asyncio
+import threading
 from pathlib import Path
-from openai import OpenAI
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import httpx
+from openai import OpenAI, AsyncOpenAI
 from pydantic import BaseModel
 from langchain_core.messages import HumanMessage, SystemMessage
 from langchain_community.chat_models import ChatTongyi
@@ -17,7 +21,9 @@ from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
 from langchain.chat_models import init_chat_model
 from utils.openai_apis import call_openai_client_parse,call_openai_client_create,call_openai_client
-from utils.env_utils import load_env, get_env
+from utils.env_utils import load_env, get_env, EnvLoader
+from utils.llm_cache import get_langchain_llm_cache
+from utils.rate_limiter import RateLimitedChatModelMixin
 
 
 DASHSCOPE_BASE_URL= "https://dashscope.aliyuncs.com/compatible-mode/v1" 
@@ -29,40 +35,182 @@ QWEN_PLUS = "qwen-plus"
 QWEN_FLASH = "qwen-flash"
 
 
+class LoopBoundAsyncClient(httpx.AsyncClient):
+    """httpx.AsyncClient that sends every request through the registry client of the running loop.
+
+    Chat models are built once, usually outside any event loop, and then used from many
+    loops (each `asyncio.run`, the shared background loop). An httpx.AsyncClient must not
+    cross loops, so this instance only builds requests; `send` resolves the pooled client
+    of the current loop per call.
+    """
+
+    def __init__(self, registry: "LLMClientRegistry"):
+        super().__init__()
+        self._registry = registry
+
+    async def send(self, request: httpx.Request, **kwargs) -> httpx.Response:
+        return await self._registry.http_async_client().send(request, **kwargs)
 
 
-def upload_file(file_path):
+class LLMClientRegistry:
+    """Process-wide registry of OpenAI-compatible clients.
+
+    Creating an `OpenAI` client per prompt also creates a new connection pool, so every
+    call pays a fresh TCP + TLS handshake. The registry builds one sync and one async
+    client per (base_url, api_key) and reuses their keep-alive pools.
+    Async clients are bound to the event loop they are first used on, so they are
+    kept per running loop; models get a `LoopBoundAsyncClient` that picks the right
+    one on every request.
+
+    Pool sizes and timeouts can be tuned with env vars:
+        LLM_HTTP_MAX_CONNECTIONS=100
+        LLM_HTTP_MAX_KEEPALIVE=20
+        LLM_HTTP_KEEPALIVE_EXPIRY=30
+        LLM_HTTP_TIMEOUT=60
+        LLM_HTTP_CONNECT_TIMEOUT=10
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._clients: Dict[Tuple[str, str], OpenAI] = {}
+        self._async_clients: Dict[Tuple[str, str, Any], AsyncOpenAI] = {}
+        self._http_client: Optional[httpx.Client] = None
+        self._http_async_clients: Dict[Any, httpx.AsyncClient] = {}
+        self._loop_bound_client: Optional[LoopBoundAsyncClient] = None
+
+    def _limits_and_timeout(self) -> Tuple[httpx.Limits, httpx.Timeout]:
+        env = EnvLoader()
+        limits = httpx.Limits(
+            max_connections=env.get_int("LLM_HTTP_MAX_CONNECTIONS", 100),
+            max_keepalive_connections=env.get_int("LLM_HTTP_MAX_KEEPALIVE", 20),
+            keepalive_expiry=env.get_int("LLM_HTTP_KEEPALIVE_EXPIRY", 30),
+        )
+        timeout = httpx.Timeout(
+            env.get_int("LLM_HTTP_TIMEOUT", 60),
+            connect=env.get_int("LLM_HTTP_CONNECT_TIMEOUT", 10),
+        )
+        return limits, timeout
+
+    def http_client(self) -> httpx.Client:
+        with self._lock:
+            if self._http_client is None:
+                limits, timeout = self._limits_and_timeout()
+                self._http_client = httpx.Client(limits=limits, timeout=timeout)
+            return self._http_client
+
+    @staticmethod
+    def _running_loop() -> Optional[asyncio.AbstractEventLoop]:
+        try:
+            return asyncio.get_running_loop()
+        except RuntimeError:
+            return None
+
+    def http_async_client(self) -> httpx.AsyncClient:
+        loop = self._running_loop()
+        with self._lock:
+            client = self._http_async_clients.get(loop)
+            if client is None:
+                # Drop pools of loops that are gone (e.g. previous asyncio.run calls)
+                for closed_loop in [l for l in self._http_async_clients if l is not None and l.is_closed()]:
+                    del self._http_async_clients[closed_loop]
+                    for key in [k for k in self._async_clients if k[2] is closed_loop]:
+                        del self._async_clients[key]
+                limits, timeout = self._limits_and_timeout()
+                client = self._http_async_clients[loop] = httpx.AsyncClient(limits=limits, timeout=timeout)
+            return client
+
+    def loop_bound_async_client(self) -> LoopBoundAsyncClient:
+        """Async client safe to hand to long-lived models, see `LoopBoundAsyncClient`"""
+        with self._lock:
+            if self._loop_bound_client is None:
+                self._loop_bound_client = LoopBoundAsyncClient(self)
+            return self._loop_bound_client
+
+    def get_client(self, base_url: str = DASHSCOPE_BASE_URL, api_key: Optional[str] = None) -> OpenAI:
+        api_key = api_key or get_env("DASHSCOPE_API_KEY")
+        key = (base_url, api_key)
+        client = self._clients.get(key)
+        if client is None:
+            http_client = self.http_client()
+            with self._lock:
+                client = self._clients.setdefault(
+                    key, OpenAI(api_key=api_key, base_url=base_url, http_client=http_client)
+                )
+        return client
+
+    def get_async_client(self, base_url: str = DASHSCOPE_BASE_URL, api_key: Optional[str] = None) -> AsyncOpenAI:
+        api_key = api_key or get_env("DASHSCOPE_API_KEY")
+        key = (base_url, api_key, self._running_loop())
+        client = self._async_clients.get(key)
+        if client is None:
+            http_client = self.http_async_client()
+            with self._lock:
+                client = self._async_clients.setdefault(
+                    key, AsyncOpenAI(api_key=api_key, base_url=base_url, http_client=http_client)
+                )
+        return client
+
+    def close(self):
+        with self._lock:
+            if self._http_client is not None:
+                self._http_client.close()
+            self._http_client = None
+            self._http_async_clients.clear()
+            self._clients.clear()
+            self._async_clients.clear()
+
+
+llm_client_registry = LLMClientRegistry()
+
+
+class RateLimitedChatOpenAI(RateLimitedChatModelMixin, ChatOpenAI):
+    """ChatOpenAI whose calls go through the shared adaptive rate limiter of its model"""
+
+
+class RateLimitedChatTongyi(RateLimitedChatModelMixin, ChatTongyi):
+    """ChatTongyi whose calls go through the shared adaptive rate limiter of its model"""
+
+
+
+
+def upload_file(file_path, qwen_client: OpenAI = None):
+    qwen_client = qwen_client or init_openai_client_with_qwen()
     print(f"正在上传包含请求信息的JSONL文件...")
     file_object = qwen_client.files.create(file=Path(file_path), purpose="batch")
     print(f"文件上传成功。得到文件ID: {file_object.id}\n")
     return file_object.id
 
-def create_batch_job(input_file_id):
+def create_batch_job(input_file_id, qwen_client: OpenAI = None):
+    qwen_client = qwen_client or init_openai_client_with_qwen()
     print(f"正在基于文件ID，创建Batch任务...")
     # 请注意:此处endpoint参数值需和输入文件中的url字段保持一致.测试模型(batch-test-model)填写/v1/chat/ds-test,Embedding文本向量模型填写/v1/embeddings,其他模型填写/v1/chat/completions
     batch = qwen_client.batches.create(input_file_id=input_file_id, endpoint=ENDPOINT, completion_window="24h")
     print(f"Batch任务创建完成。 得到Batch任务ID: {batch.id}\n")
     return batch.id
 
-def check_job_status(batch_id):
+def check_job_status(batch_id, qwen_client: OpenAI = None):
+    qwen_client = qwen_client or init_openai_client_with_qwen()
     print(f"正在检查Batch任务状态...")
     batch = qwen_client.batches.retrieve(batch_id=batch_id)
     print(f"Batch任务状态: {batch.status}\n")
     return batch.status
 
-def get_output_id(batch_id):
+def get_output_id(batch_id, qwen_client: OpenAI = None):
+    qwen_client = qwen_client or init_openai_client_with_qwen()
     print(f"正在获取Batch任务中执行成功请求的输出文件ID...")
     batch = qwen_client.batches.retrieve(batch_id=batch_id)
     print(f"输出文件ID: {batch.output_file_id}\n")
     return batch.output_file_id
 
-def get_error_id(batch_id):
+def get_error_id(batch_id, qwen_client: OpenAI = None):
+    qwen_client = qwen_client or init_openai_client_with_qwen()
     print(f"正在获取Batch任务中执行错误请求的输出文件ID...")
     batch = qwen_client.batches.retrieve(batch_id=batch_id)
     print(f"错误文件ID: {batch.error_file_id}\n")
     return batch.error_file_id
 
-def download_results(output_file_id, output_file_path):
+def download_results(output_file_id, output_file_path, qwen_client: OpenAI = None):
+    qwen_client = qwen_client or init_openai_client_with_qwen()
     print(f"正在打印并下载Batch任务的请求成功结果...")
     content = qwen_client.files.content(output_file_id)
     # 打印部分内容以供测试
@@ -71,7 +219,8 @@ def download_results(output_file_id, output_file_path):
     content.write_to_file(output_file_path)
     print(f"完整的输出结果已保存至本地输出文件result.jsonl\n")
 
-def download_errors(error_file_id, error_file_path):
+def download_errors(error_file_id, error_file_path, qwen_client: OpenAI = None):
+    qwen_client = qwen_client or init_openai_client_with_qwen()
     print(f"正在打印并下载Batch任务的请求失败信息...")
     content = qwen_client.files.content(error_file_id)
     # 打印部分内容以供测试
@@ -83,23 +232,20 @@ def download_errors(error_file_id, error_file_path):
 def run_batch_job(input_file_path, output_file_path , error_file_path):
     # 文件路径
 
-    batch_client = OpenAI(
     # 若没有配置环境变量,可用阿里云百炼API Key将下行替换为：api_key="sk-xxx",但不建议在生产环境中直接将API Key硬编码到代码中,以减少API Key泄露风险.
     # 新加坡和北京地域的API Key不同。获取API Key：https://help.aliyun.com/zh/model-studio/get-api-key
-    api_key=os.getenv("DASHSCOPE_API_KEY"),
-    # 以下是北京地域base-url，如果使用新加坡地域的模型，需要将base_url替换为：https://dashscope-intl.aliyuncs.com/compatible-mode/v1
-    base_url="https://dashscope.aliyuncs.com/compatible-mode/v1"  # 阿里云百炼服务的base_url
-)
+    # For large jobs prefer utils.qwen_batch_engine.QwenBatchEngine (sharding, concurrent submission, retries)
+    qwen_client = init_openai_client_with_qwen()
     
     try:
         # Step 1: 上传包含请求信息的JSONL文件,得到输入文件ID,如果您需要输入OSS文件,可将下行替换为：input_file_id = "实际的OSS文件URL或资源标识符"
-        input_file_id = upload_file(input_file_path)
+        input_file_id = upload_file(input_file_path, qwen_client)
         # Step 2: 基于输入文件ID,创建Batch任务
-        batch_id = create_batch_job(input_file_id)
+        batch_id = create_batch_job(input_file_id, qwen_client)
         # Step 3: 检查Batch任务状态直到结束
         status = ""
         while status not in ["completed", "failed", "expired", "cancelled"]:
-            status = check_job_status(batch_id)
+            status = check_job_status(batch_id, qwen_client)
             print(f"等待任务完成...")
             time.sleep(10)  # 等待10秒后再次查询状态
         # 如果任务失败,则打印错误信息并退出
@@ -110,12 +256,12 @@ def run_batch_job(input_file_path, output_file_path , error_file_path):
             return
         # Step 4: 下载结果：如果输出文件ID不为空,则打印请求成功结果的前1000个字符内容，并下载完整的请求成功结果到本地输出文件;
         # 如果错误文件ID不为空,则打印请求失败信息的前1000个字符内容,并下载完整的请求失败信息到本地错误文件.
-        output_file_id = get_output_id(batch_id)
+        output_file_id = get_output_id(batch_id, qwen_client)
         if output_file_id:
-            download_results(output_file_id, output_file_path)
-        error_file_id = get_error_id(batch_id)
+            download_results(output_file_id, output_file_path, qwen_client)
+        error_file_id = get_error_id(batch_id, qwen_client)
         if error_file_id:
-            download_errors(error_file_id, error_file_path)
+            download_errors(error_file_id, error_file_path, qwen_client)
             print(f"参见错误码文档: https://help.aliyun.com/zh/model-studio/developer-reference/error-code")
     except Exception as e:
         print(f"An error occurred: {e}")
@@ -124,17 +270,14 @@ def run_batch_job(input_file_path, output_file_path , error_file_path):
 
 def init_openai_client_with_qwen(dashscope_base_url= "https://dashscope.aliyuncs.com/compatible-mode/v1" 
                           ) -> OpenAI:
-    dashscope_api_key = get_env("DASHSCOPE_API_KEY")
-    
-    # 初始化客户端
-    qwen_client = OpenAI(
-        # 若没有配置环境变量,可用阿里云百炼API Key将下行替换为：api_key="sk-xxx",但不建议在生产环境中直接将API Key硬编码到代码中,以减少API Key泄露风险.
-        # 新加坡和北京地域的API Key不同。获取API Key：https://help.aliyun.com/zh/model-studio/get-api-key
-        api_key= dashscope_api_key,
-        # 以下是北京地域base-url，如果使用新加坡地域的模型，需要将base_url替换为：https://dashscope-intl.aliyuncs.com/compatible-mode/v1
-        base_url= dashscope_base_url # 阿里云百炼服务的base_url
-    )
-    return qwen_client
+    # 新加坡和北京地域的API Key不同。获取API Key：https://help.aliyun.com/zh/model-studio/get-api-key
+    # 如果使用新加坡地域的模型，需要将base_url替换为：https://dashscope-intl.aliyuncs.com/compatible-mode/v1
+    # The client comes from the process-wide registry, so its connection pool is reused across calls
+    return llm_client_registry.get_client(base_url=dashscope_base_url)
+
+
+def init_async_openai_client_with_qwen(dashscope_base_url=DASHSCOPE_BASE_URL) -> AsyncOpenAI:
+    return llm_client_registry.get_async_client(base_url=dashscope_base_url)
 
 
 def call_qwen_with_openai_client(prompt:str="who are you?",
@@ -155,11 +298,88 @@ def call_qwen_with_openai_client(prompt:str="who are you?",
       raise e
 
 
+hedging_stats = {"calls": 0, "hedges_fired": 0, "hedge_wins": 0}
+
+_background_loop: Optional[asyncio.AbstractEventLoop] = None
+_background_loop_lock = threading.Lock()
+
+
+def get_background_loop() -> asyncio.AbstractEventLoop:
+    """One long-lived event loop thread, so sync callers can run cancellable async work
+    (hedged requests, the research interview map step)"""
+    global _background_loop
+    with _background_loop_lock:
+        if _background_loop is None:
+            _background_loop = asyncio.new_event_loop()
+            threading.Thread(target=_background_loop.run_forever, daemon=True).start()
+        return _background_loop
+
+
+async def ahedged_chat_completion(messages: List[Dict[str, str]],
+                                  model_name: str = QWEN_PLUS,
+                                  hedge_model_name: Optional[str] = None,
+                                  hedge_delay: float = 2.0,
+                                  client: Optional[AsyncOpenAI] = None,
+                                  is_valid: Optional[Callable[[str], bool]] = None,
+                                  **params) -> str:
+    """Hedged request: if the primary call has not returned after `hedge_delay` seconds,
+    fire a second one (to `hedge_model_name`, e.g. QWEN_FLASH, or the same model),
+    return the first valid answer and cancel the other request.
+    """
+    client = client or init_async_openai_client_with_qwen()
+    is_valid = is_valid or (lambda content: bool(content and content.strip()))
+    hedging_stats["calls"] += 1
+
+    async def request(model: str) -> str:
+        completion = await client.chat.completions.create(model=model, messages=messages, **params)
+        return completion.choices[0].message.content
+
+    primary = asyncio.ensure_future(request(model_name))
+    pending = {primary}
+    hedge = None
+    last_error = None
+    try:
+        while pending:
+            # Until the hedge is fired, only wait `hedge_delay` for the primary
+            timeout = hedge_delay if hedge is None else None
+            done, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                try:
+                    content = task.result()
+                except Exception as e:
+                    last_error = e
+                    continue
+                if is_valid(content):
+                    if task is hedge:
+                        hedging_stats["hedge_wins"] += 1
+                    return content
+            # Fire the hedge when the primary is slow, or as soon as it failed / was invalid
+            if hedge is None:
+                hedge = asyncio.ensure_future(request(hedge_model_name or model_name))
+                hedging_stats["hedges_fired"] += 1
+                pending.add(hedge)
+    finally:
+        for task in pending:
+            task.cancel()
+
+    if last_error is not None:
+        raise last_error
+    raise ValueError("No valid response from primary or hedged request")
+
+
+def hedged_chat_completion(messages: List[Dict[str, str]], **kwargs) -> str:
+    """Sync wrapper of `ahedged_chat_completion`, run on the shared background loop"""
+    future = asyncio.run_coroutine_threadsafe(
+        ahedged_chat_completion(messages, **kwargs), get_background_loop()
+    )
+    return future.result()
+
+
 def init_langchain_chat_tongyi( model_name="qwen-plus", temperature=0,top_p=0.8, max_tokens=2000):
     """https://docs.langchain.com/docs/integrations/llms/qwen
     """
     # Initialize the Qwen-Plus model
-    chat_model = ChatTongyi(
+    chat_model = RateLimitedChatTongyi(
         model_name= model_name,  # Specify Qwen-Plus model
         temperature=temperature,
         top_p=top_p,
@@ -167,18 +387,30 @@ def init_langchain_chat_tongyi( model_name="qwen-plus", temperature=0,top_p=0.8,
     )
     return chat_model
 
-def init_langchain_chat_openai(model_name="qwen-plus", temperature=0,top_p=0.8, max_tokens=2000)-> ChatOpenAI:
-    """Initialize the OpenAI Chat model using LangChain's integration."""
+def init_langchain_chat_openai(model_name="qwen-plus", temperature=0,top_p=0.8, max_tokens=2000,
+                               use_cache=True)-> ChatOpenAI:
+    """Initialize the OpenAI Chat model using LangChain's integration.
+
+    Deterministic (temperature 0) models read and write the shared LLM response cache,
+    and every call goes through the shared rate limiter (see utils.rate_limiter).
+    """
     
     api_key = get_env("DASHSCOPE_API_KEY")
     
-    chat_model = ChatOpenAI(
+    chat_model = RateLimitedChatOpenAI(
         model_name="qwen-plus",
         api_key=api_key,
         base_url=DASHSCOPE_BASE_URL,
         temperature=temperature,
         top_p=top_p,
-        max_tokens=max_tokens
+        max_tokens=max_tokens,
+        # Share keep-alive connection pools across every chat model in the process
+        http_client=llm_client_registry.http_client(),
+        # Resolved per call: the model outlives the loop it may have been built on
+        http_async_client=llm_client_registry.loop_bound_async_client(),
+        cache=get_langchain_llm_cache() if use_cache and temperature == 0 else None,
+        # Final stream chunk carries token usage, so streamed calls refund their reservation
+        stream_usage=True,
     )
     return chat_model
   
@@ -0,0 +1,250 @@
+"""
+Async batch engine on top of the DashScope (OpenAI-compatible) Batch API.
+https://help.aliyun.com/zh/model-studio/batch-interfaces-compatible-with-openai
+
+Batch requests are billed at half the real-time price, so large offline jobs
+(e.g. nightly 100k-prompt runs) should go through here instead of `run_batch_job`:
+
+1. build JSONL request lines from a Python iterable of prompts
+2. shard them into files bounded by request count and bytes
+3. upload + submit every shard concurrently
+4. poll each batch with exponential backoff (asyncio, no blocking sleep)
+5. stream-parse the output / error JSONL files line by line
+6. resubmit failed requests, up to `max_retries` rounds
+7. return results in the original request order
+
+Every run writes its shards, outputs and retries into its own subdirectory of
+`work_dir` (`<timestamp>-<id>`), so concurrent jobs never overwrite each other's files.
+
+Example:
+    engine = QwenBatchEngine(work_dir="data/batch_jobs")
+    results = asyncio.run(engine.run(["who are you?", "what is LangGraph?"]))
+"""
+
+import asyncio
+import json
+import os
+import time
+import uuid
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+
+from openai import AsyncOpenAI
+
+from utils.qwen_api import ENDPOINT, QWEN_PLUS, init_async_openai_client_with_qwen
+
+TERMINAL_STATUSES = ["completed", "failed", "expired", "cancelled"]
+
+# DashScope limits: at most 50,000 requests and 500MB per input file
+MAX_REQUESTS_PER_SHARD = 50_000
+MAX_BYTES_PER_SHARD = 100 * 1024 * 1024
+
+
+Prompt = Union[str, List[Dict[str, str]]]
+
+
+def build_request_lines(
+    prompts: Iterable[Prompt], model: str = QWEN_PLUS, **body_params: Any
+) -> Iterator[str]:
+    """Yield one JSONL request line per prompt; custom_id encodes the request order"""
+    for index, prompt in enumerate(prompts):
+        if isinstance(prompt, str):
+            messages = [{"role": "user", "content": prompt}]
+        else:
+            messages = prompt
+        request = {
+            "custom_id": f"request-{index}",
+            "method": "POST",
+            "url": ENDPOINT,
+            "body": {"model": model, "messages": messages, **body_params},
+        }
+        yield json.dumps(request, ensure_ascii=False)
+
+
+def shard_request_lines(
+    lines: Iterable[str],
+    shard_dir: str,
+    max_requests: int = MAX_REQUESTS_PER_SHARD,
+    max_bytes: int = MAX_BYTES_PER_SHARD,
+    prefix: str = "shard",
+) -> List[str]:
+    """Write request lines into JSONL shard files bounded by request count and size"""
+    os.makedirs(shard_dir, exist_ok=True)
+    shard_paths = []
+    shard_file = None
+    shard_requests = shard_bytes = 0
+
+    for line in lines:
+        data = (line + "\n").encode("utf-8")
+        if shard_file is None or shard_requests >= max_requests or shard_bytes + len(data) > max_bytes:
+            if shard_file is not None:
+                shard_file.close()
+            path = os.path.join(shard_dir, f"{prefix}-{len(shard_paths):04d}.jsonl")
+            shard_paths.append(path)
+            shard_file = open(path, "wb")
+            shard_requests = shard_bytes = 0
+        shard_file.write(data)
+        shard_requests += 1
+        shard_bytes += len(data)
+
+    if shard_file is not None:
+        shard_file.close()
+    return shard_paths
+
+
+def iter_jsonl(path: str) -> Iterator[Dict[str, Any]]:
+    """Stream-parse a JSONL file without loading it into memory"""
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+def parse_result_line(record: Dict[str, Any]) -> Dict[str, Any]:
+    """Normalize an output/error line to {custom_id, content, error}"""
+    response = record.get("response") or {}
+    error = record.get("error")
+    if not error and response.get("status_code", 200) != 200:
+        error = response.get("body", {}).get("error") or {"code": response.get("status_code")}
+    content = None
+    if not error:
+        choices = response.get("body", {}).get("choices", [])
+        content = choices[0]["message"]["content"] if choices else None
+    return {"custom_id": record.get("custom_id"), "content": content, "error": error}
+
+
+class QwenBatchEngine:
+    def __init__(
+        self,
+        client: Optional[AsyncOpenAI] = None,
+        work_dir: str = "data/batch_jobs",
+        max_concurrent_shards: int = 4,
+        max_retries: int = 2,
+        poll_initial_delay: float = 5,
+        poll_max_delay: float = 300,
+        completion_window: str = "24h",
+    ):
+        self.client = client or init_async_openai_client_with_qwen()
+        self.work_dir = work_dir
+        self.max_concurrent_shards = max_concurrent_shards
+        self.max_retries = max_retries
+        self.poll_initial_delay = poll_initial_delay
+        self.poll_max_delay = poll_max_delay
+        self.completion_window = completion_window
+
+    async def wait_for_batch(self, batch_id: str):
+        """Poll with exponential backoff until the batch reaches a terminal status"""
+        delay = self.poll_initial_delay
+        while True:
+            batch = await self.client.batches.retrieve(batch_id)
+            if batch.status in TERMINAL_STATUSES:
+                return batch
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.poll_max_delay)
+
+    async def _download(self, file_id: Optional[str], path: str) -> Optional[str]:
+        if not file_id:
+            return None
+        content = await self.client.files.content(file_id)
+        content.write_to_file(path)
+        return path
+
+    async def submit_shard(self, shard_path: str) -> Dict[str, Dict[str, Any]]:
+        """Upload, submit and wait for one shard; returns parsed results keyed by custom_id"""
+        with open(shard_path, "rb") as f:
+            file_object = await self.client.files.create(file=f, purpose="batch")
+        batch = await self.client.batches.create(
+            input_file_id=file_object.id,
+            endpoint=ENDPOINT,
+            completion_window=self.completion_window,
+        )
+        print(f"Submitted {shard_path} as batch {batch.id}")
+        batch = await self.wait_for_batch(batch.id)
+        print(f"Batch {batch.id} finished with status {batch.status}")
+
+        results = {}
+        base_path = shard_path[: -len(".jsonl")]
+        for path in [
+            await self._download(batch.output_file_id, base_path + ".output.jsonl"),
+            await self._download(batch.error_file_id, base_path + ".error.jsonl"),
+        ]:
+            if path is None:
+                continue
+            for record in iter_jsonl(path):
+                result = parse_result_line(record)
+                results[result["custom_id"]] = result
+        return results
+
+    async def _submit_all(self, shard_paths: List[str]) -> Dict[str, Dict[str, Any]]:
+        semaphore = asyncio.Semaphore(self.max_concurrent_shards)
+
+        async def submit(path):
+            async with semaphore:
+                try:
+                    return await self.submit_shard(path)
+                except Exception as e:
+                    print(f"Shard {path} failed: {e}")
+                    return {}
+
+        results = {}
+        for shard_results in await asyncio.gather(*[submit(p) for p in shard_paths]):
+            results.update(shard_results)
+        return results
+
+    def new_run_dir(self) -> str:
+        """Fresh directory for the files of one run"""
+        run_dir = os.path.join(
+            self.work_dir, f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        )
+        os.makedirs(run_dir)
+        return run_dir
+
+    def _retry_shards(
+        self, shard_paths: List[str], failed_ids: set, attempt: int, run_dir: str
+    ) -> List[str]:
+        def failed_lines():
+            for path in shard_paths:
+                with open(path, "r", encoding="utf-8") as f:
+                    for line in f:
+                        if json.loads(line)["custom_id"] in failed_ids:
+                            yield line.rstrip("\n")
+
+        return shard_request_lines(
+            failed_lines(), run_dir, prefix=f"retry{attempt}"
+        )
+
+    async def run(
+        self, prompts: Iterable[Prompt], model: str = QWEN_PLUS, **body_params: Any
+    ) -> List[Dict[str, Any]]:
+        """Run all prompts through the Batch API and return results in request order"""
+        run_dir = self.new_run_dir()
+        print(f"Batch run files in {run_dir}")
+        shard_paths = shard_request_lines(
+            build_request_lines(prompts, model=model, **body_params), run_dir
+        )
+        all_ids = [
+            record["custom_id"] for path in shard_paths for record in iter_jsonl(path)
+        ]
+
+        results = await self._submit_all(shard_paths)
+        for attempt in range(1, self.max_retries + 1):
+            failed_ids = {
+                custom_id
+                for custom_id in all_ids
+                if custom_id not in results or results[custom_id]["error"]
+            }
+            if not failed_ids:
+                break
+            print(f"Resubmitting {len(failed_ids)} failed requests (attempt {attempt})")
+            retry_paths = self._retry_shards(shard_paths, failed_ids, attempt, run_dir)
+            for custom_id, result in (await self._submit_all(retry_paths)).items():
+                if custom_id not in results or results[custom_id]["error"]:
+                    results[custom_id] = result
+
+        return [
+            results.get(
+                custom_id,
+                {"custom_id": custom_id, "content": None, "error": {"message": "no result"}},
+            )
+            for custom_id in all_ids
+        ]
@@ -0,0 +1,289 @@
+"""
+Adaptive rate limiter and concurrency governor for outbound model calls.
+
+Fan-out graphs (e.g. `ReaserchAgent` interviews via `Send`) fire many chat model calls
+at once and trip the provider's 429 limits. Every chat model built by
+`init_langchain_chat_openai` / `init_langchain_chat_tongyi` goes through a shared
+`AdaptiveRateLimiter` (one per model name) that combines:
+
+- a requests-per-minute token bucket
+- a tokens-per-minute token bucket (reserve an estimate up front, reconcile with real usage)
+- an AIMD concurrency limit: +1/limit per success, halved on every 429
+- a global pause honouring the Retry-After header of a 429 response
+
+Env vars:
+    LLM_RATE_LIMIT_RPM=600
+    LLM_RATE_LIMIT_TPM=1000000
+    LLM_MAX_CONCURRENCY=16
+"""
+
+import asyncio
+import contextvars
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from utils.env_utils import EnvLoader
+
+# Set while a rate-limited call is running, so a nested call (e.g. `_generate`
+# delegating to `_stream`) does not acquire a second slot
+_in_limited_call = contextvars.ContextVar("in_limited_call", default=False)
+
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    status_code = getattr(error, "status_code", None)
+    response = getattr(error, "response", None)
+    if status_code is None and response is not None:
+        status_code = getattr(response, "status_code", None)
+    if status_code == 429:
+        return True
+    message = str(error)
+    return "429" in message or "Throttling" in message or "rate limit" in message.lower()
+
+
+def get_retry_after(error: BaseException) -> Optional[float]:
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    value = headers.get("retry-after") if hasattr(headers, "get") else None
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+class AdaptiveRateLimiter:
+    def __init__(
+        self,
+        requests_per_minute: float = 600,
+        tokens_per_minute: float = 1_000_000,
+        max_concurrency: int = 16,
+        min_concurrency: int = 1,
+    ):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = min_concurrency
+
+        self._lock = threading.Lock()
+        self._request_budget = float(requests_per_minute)
+        self._token_budget = float(tokens_per_minute)
+        self._last_refill = time.monotonic()
+        self._paused_until = 0.0
+
+        self.concurrency_limit = float(max_concurrency)
+        self.in_flight = 0
+        self.metrics = {"requests": 0, "rate_limited": 0, "tokens": 0, "wait_seconds": 0.0}
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._last_refill
+        self._last_refill = now
+        self._request_budget = min(
+            self.requests_per_minute,
+            self._request_budget + elapsed * self.requests_per_minute / 60,
+        )
+        self._token_budget = min(
+            self.tokens_per_minute,
+            self._token_budget + elapsed * self.tokens_per_minute / 60,
+        )
+
+    def _try_acquire(self, tokens: int) -> float:
+        """Take a slot and return 0, or return how long to wait before trying again"""
+        tokens = min(tokens, self.tokens_per_minute)
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            if now < self._paused_until:
+                return self._paused_until - now
+            if self.in_flight >= int(self.concurrency_limit):
+                return 0.05
+            if self._request_budget < 1:
+                return (1 - self._request_budget) * 60 / self.requests_per_minute
+            if self._token_budget < tokens:
+                return (tokens - self._token_budget) * 60 / self.tokens_per_minute
+            self._request_budget -= 1
+            self._token_budget -= tokens
+            self.in_flight += 1
+            self.metrics["requests"] += 1
+            return 0.0
+
+    def acquire(self, tokens: int = 0) -> None:
+        start = time.monotonic()
+        while (wait := self._try_acquire(tokens)) > 0:
+            time.sleep(wait)
+        self.metrics["wait_seconds"] += time.monotonic() - start
+
+    async def aacquire(self, tokens: int = 0) -> None:
+        start = time.monotonic()
+        while (wait := self._try_acquire(tokens)) > 0:
+            await asyncio.sleep(wait)
+        self.metrics["wait_seconds"] += time.monotonic() - start
+
+    def release(
+        self,
+        reserved_tokens: int = 0,
+        used_tokens: Optional[int] = None,
+        error: Optional[BaseException] = None,
+    ) -> None:
+        with self._lock:
+            self.in_flight -= 1
+            if used_tokens is not None:
+                # Refund (or charge) the difference between the estimate and real usage
+                self._token_budget += min(reserved_tokens, self.tokens_per_minute) - used_tokens
+                self.metrics["tokens"] += used_tokens
+
+            if error is not None and is_rate_limit_error(error):
+                self.metrics["rate_limited"] += 1
+                self.concurrency_limit = max(self.min_concurrency, self.concurrency_limit / 2)
+                retry_after = get_retry_after(error) or 1.0
+                self._paused_until = max(self._paused_until, time.monotonic() + retry_after)
+            elif error is None:
+                self.concurrency_limit = min(
+                    self.max_concurrency, self.concurrency_limit + 1 / self.concurrency_limit
+                )
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                **self.metrics,
+                "in_flight": self.in_flight,
+                "concurrency_limit": round(self.concurrency_limit, 2),
+                "paused_for": max(0.0, self._paused_until - time.monotonic()),
+            }
+
+
+_rate_limiters: Dict[str, AdaptiveRateLimiter] = {}
+_rate_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(key: str) -> AdaptiveRateLimiter:
+    """Shared limiter per model name, configured from env vars"""
+    with _rate_limiters_lock:
+        limiter = _rate_limiters.get(key)
+        if limiter is None:
+            env = EnvLoader()
+            limiter = _rate_limiters[key] = AdaptiveRateLimiter(
+                requests_per_minute=env.get_int("LLM_RATE_LIMIT_RPM", 600),
+                tokens_per_minute=env.get_int("LLM_RATE_LIMIT_TPM", 1_000_000),
+                max_concurrency=env.get_int("LLM_MAX_CONCURRENCY", 16),
+            )
+        return limiter
+
+
+def rate_limiter_stats() -> Dict[str, Dict[str, Any]]:
+    """Current in-flight counts and limits of every limiter, keyed by model name"""
+    return {key: limiter.stats() for key, limiter in _rate_limiters.items()}
+
+
+def _estimate_tokens(messages, max_tokens: Optional[int]) -> int:
+    # ~3 characters per token is a conservative estimate for mixed Chinese / English text
+    chars = sum(len(str(m.content)) for m in messages)
+    return chars // 3 + (max_tokens or 512)
+
+
+def _used_tokens(result) -> Optional[int]:
+    llm_output = getattr(result, "llm_output", None) or {}
+    usage = llm_output.get("token_usage") or {}
+    if usage.get("total_tokens"):
+        return usage["total_tokens"]
+    for generation in getattr(result, "generations", []):
+        usage_metadata = getattr(generation.message, "usage_metadata", None)
+        if usage_metadata:
+            return usage_metadata.get("total_tokens")
+    return None
+
+
+def _chunk_used_tokens(chunk) -> Optional[int]:
+    # Streamed usage arrives as per-chunk increments (usually one final usage chunk)
+    usage_metadata = getattr(getattr(chunk, "message", None), "usage_metadata", None)
+    if usage_metadata:
+        return usage_metadata.get("total_tokens")
+    return None
+
+
+def _add_tokens(total: Optional[int], tokens: Optional[int]) -> Optional[int]:
+    if tokens is None:
+        return total
+    return (total or 0) + tokens
+
+
+class RateLimitedChatModelMixin:
+    """Mix into a LangChain chat model class to route its calls through the shared limiter.
+
+    Cache hits are served by `_generate_with_cache` before `_generate` runs, so they never
+    consume rate limit budget. `bind_tools` / `with_structured_output` keep working because
+    they wrap the same model instance. Streamed calls are reconciled with the usage of
+    their chunks, which OpenAI-compatible models only send with `stream_usage=True`.
+    """
+
+    def _rate_limiter(self) -> AdaptiveRateLimiter:
+        return get_rate_limiter(self.model_name)
+
+    def _reserve(self, messages) -> int:
+        return _estimate_tokens(messages, getattr(self, "max_tokens", None))
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        if _in_limited_call.get():
+            return super()._generate(messages, stop=stop, run_manager=run_manager, **kwargs)
+        limiter, reserved = self._rate_limiter(), self._reserve(messages)
+        limiter.acquire(reserved)
+        token = _in_limited_call.set(True)
+        try:
+            result = super()._generate(messages, stop=stop, run_manager=run_manager, **kwargs)
+        except Exception as e:
+            limiter.release(reserved, error=e)
+            raise
+        finally:
+            _in_limited_call.reset(token)
+        limiter.release(reserved, used_tokens=_used_tokens(result))
+        return result
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        if _in_limited_call.get():
+            return await super()._agenerate(messages, stop=stop, run_manager=run_manager, **kwargs)
+        limiter, reserved = self._rate_limiter(), self._reserve(messages)
+        await limiter.aacquire(reserved)
+        token = _in_limited_call.set(True)
+        try:
+            result = await super()._agenerate(messages, stop=stop, run_manager=run_manager, **kwargs)
+        except Exception as e:
+            limiter.release(reserved, error=e)
+            raise
+        finally:
+            _in_limited_call.reset(token)
+        limiter.release(reserved, used_tokens=_used_tokens(result))
+        return result
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs):
+        if _in_limited_call.get():
+            yield from super()._stream(messages, stop=stop, run_manager=run_manager, **kwargs)
+            return
+        limiter, reserved = self._rate_limiter(), self._reserve(messages)
+        limiter.acquire(reserved)
+        error, used_tokens = None, None
+        try:
+            for chunk in super()._stream(messages, stop=stop, run_manager=run_manager, **kwargs):
+                used_tokens = _add_tokens(used_tokens, _chunk_used_tokens(chunk))
+                yield chunk
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            limiter.release(reserved, used_tokens=used_tokens, error=error)
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs):
+        if _in_limited_call.get():
+            async for chunk in super()._astream(messages, stop=stop, run_manager=run_manager, **kwargs):
+                yield chunk
+            return
+        limiter, reserved = self._rate_limiter(), self._reserve(messages)
+        await limiter.aacquire(reserved)
+        error, used_tokens = None, None
+        try:
+            async for chunk in super()._astream(messages, stop=stop, run_manager=run_manager, **kwargs):
+                used_tokens = _add_tokens(used_tokens, _chunk_used_tokens(chunk))
+                yield chunk
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            limiter.release(reserved, used_tokens=used_tokens, error=error)
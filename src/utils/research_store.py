@@ -0,0 +1,156 @@
+"""
+Persisted research runs, so a topic researched before can be extended instead of redone.
+
+One run = topic + final report + one record per analyst:
+
+    {
+        "analyst": {...},           # Analyst.model_dump()
+        "interview": "...",         # transcript
+        "sections": ["..."],        # section(s) written from the interview
+        "sources": ["https://..."], # sources of the interview context
+        "researched_at": 1718000000.0,
+    }
+
+`ReaserchAgent` saves every finished run here; `ReaserchAgent.extend_research` loads the
+latest run of a topic and only re-interviews analysts whose records are stale or new.
+
+Env vars:
+    RESEARCH_STORE_ENABLED=true
+    RESEARCH_STORE_DB_PATH=data/research_db/research_runs.db
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from configs.db_config import RESEARCH_STORE_DB_PATH
+from utils.env_utils import EnvLoader
+from utils.search_cache import normalize_query
+
+
+def analyst_key(analyst: Dict[str, Any]) -> str:
+    """Identity of an analyst across runs"""
+    return normalize_query(
+        f"{analyst.get('name', '')}|{analyst.get('role', '')}|{analyst.get('affiliation', '')}"
+    )
+
+
+class ResearchRunStore:
+    def __init__(self, db_path: str = RESEARCH_STORE_DB_PATH):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        db_dir = os.path.dirname(db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL;")
+        self._conn.executescript(
+            """CREATE TABLE IF NOT EXISTS research_runs (
+                run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                topic_key TEXT NOT NULL,
+                topic TEXT NOT NULL,
+                final_report TEXT,
+                created_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_research_runs_topic ON research_runs (topic_key, created_at);
+            CREATE TABLE IF NOT EXISTS research_interviews (
+                run_id INTEGER NOT NULL,
+                position INTEGER NOT NULL,
+                analyst_key TEXT NOT NULL,
+                analyst TEXT NOT NULL,
+                interview TEXT,
+                sections TEXT NOT NULL,
+                sources TEXT NOT NULL,
+                researched_at REAL NOT NULL,
+                PRIMARY KEY (run_id, position)
+            );"""
+        )
+        self._conn.commit()
+
+    def save_run(self, topic: str, records: List[Dict[str, Any]], final_report: Optional[str]) -> int:
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT INTO research_runs (topic_key, topic, final_report, created_at) VALUES (?, ?, ?, ?)",
+                (normalize_query(topic), topic, final_report, time.time()),
+            )
+            run_id = cursor.lastrowid
+            self._conn.executemany(
+                "INSERT INTO research_interviews (run_id, position, analyst_key, analyst, interview, "
+                "sections, sources, researched_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        run_id,
+                        position,
+                        analyst_key(record["analyst"]),
+                        json.dumps(record["analyst"], ensure_ascii=False),
+                        record.get("interview", ""),
+                        json.dumps(record.get("sections", []), ensure_ascii=False),
+                        json.dumps(record.get("sources", []), ensure_ascii=False),
+                        record.get("researched_at") or time.time(),
+                    )
+                    for position, record in enumerate(records)
+                ],
+            )
+            self._conn.commit()
+            return run_id
+
+    def latest_run(self, topic: str) -> Optional[Dict[str, Any]]:
+        """Most recent run of the topic with its interview records, or None"""
+        with self._lock:
+            run = self._conn.execute(
+                "SELECT run_id, topic, final_report, created_at FROM research_runs "
+                "WHERE topic_key = ? ORDER BY created_at DESC, run_id DESC LIMIT 1",
+                (normalize_query(topic),),
+            ).fetchone()
+            if run is None:
+                return None
+            rows = self._conn.execute(
+                "SELECT analyst, interview, sections, sources, researched_at FROM research_interviews "
+                "WHERE run_id = ? ORDER BY position",
+                (run[0],),
+            ).fetchall()
+        return {
+            "run_id": run[0],
+            "topic": run[1],
+            "final_report": run[2],
+            "created_at": run[3],
+            "records": [
+                {
+                    "analyst": json.loads(analyst),
+                    "interview": interview,
+                    "sections": json.loads(sections),
+                    "sources": json.loads(sources),
+                    "researched_at": researched_at,
+                }
+                for analyst, interview, sections, sources, researched_at in rows
+            ],
+        }
+
+    def list_runs(self, limit: int = 20) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT run_id, topic, created_at FROM research_runs ORDER BY created_at DESC LIMIT ?",
+                (limit,),
+            ).fetchall()
+        return [{"run_id": r[0], "topic": r[1], "created_at": r[2]} for r in rows]
+
+
+_research_store: Optional[ResearchRunStore] = None
+_research_store_lock = threading.Lock()
+
+
+def get_research_store() -> Optional[ResearchRunStore]:
+    """Process-wide store built from env vars, or None when RESEARCH_STORE_ENABLED is false"""
+    global _research_store
+    env = EnvLoader()
+    if not env.get_bool("RESEARCH_STORE_ENABLED", True):
+        return None
+    with _research_store_lock:
+        if _research_store is None:
+            _research_store = ResearchRunStore(
+                db_path=env.get("RESEARCH_STORE_DB_PATH", RESEARCH_STORE_DB_PATH)
+            )
+        return _research_store
@@ -0,0 +1,279 @@
+"""
+Persistent cache for search results (Tavily web search, Wikipedia lookups).
+
+Research runs fan out into many analysts that ask near-identical questions, so every
+search helper routes through one shared `SearchCache`:
+
+- key: sha256 over source + normalized query (lowercased, whitespace collapsed) + params
+- storage: SQLite, shared across runs and processes
+- TTL per source (web results go stale faster than encyclopedia pages)
+- stale-while-revalidate: an expired entry within the stale window is served at once
+  and refreshed in a background thread
+- failed fetches (exceptions) are never cached
+- optional semantic near-duplicate lookup on a miss, see `utils.semantic_query_index`
+
+Used by:
+- `agents.research_agents` (`search_web` / `search_wikipedia` and `ReaserchAgent.retrieve`)
+- `tools.web_search_tools.web_search`
+- `tools.research_tools.run_tavily_search`
+
+Env vars:
+    SEARCH_CACHE_ENABLED=true
+    SEARCH_CACHE_DB_PATH=data/cache_db/search_cache.db
+    SEARCH_CACHE_TTL_TAVILY=86400
+    SEARCH_CACHE_TTL_TAVILY_SEARCH_RESULTS=86400
+    SEARCH_CACHE_TTL_TAVILY_CLIENT=86400
+    SEARCH_CACHE_TTL_WIKIPEDIA=604800
+    SEARCH_CACHE_STALE_SECONDS=86400
+"""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from configs.db_config import SEARCH_CACHE_DB_PATH
+from utils.env_utils import EnvLoader
+from utils.semantic_query_index import SemanticQueryIndex, get_semantic_query_index
+
+# One source per payload shape: the same query cached by two callers must not collide
+DEFAULT_TTL_SECONDS = {
+    "tavily": 24 * 3600,  # result dicts of langchain_tavily.TavilySearch
+    "tavily_search_results": 24 * 3600,  # result dicts of TavilySearchResults
+    "tavily_client": 24 * 3600,  # raw TavilyClient.search responses
+    "wikipedia": 7 * 24 * 3600,
+}
+
+
+def normalize_query(query: str) -> str:
+    return re.sub(r"\s+", " ", str(query)).strip().lower()
+
+
+def make_search_key(source: str, query: str, params: Optional[Dict[str, Any]] = None) -> str:
+    payload = {"source": source, "query": normalize_query(query), "params": params or {}}
+    raw = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class SearchCache:
+    """SQLite cache of JSON-serializable search results with stale-while-revalidate"""
+
+    def __init__(
+        self,
+        db_path: str = SEARCH_CACHE_DB_PATH,
+        ttl_seconds: Optional[Dict[str, float]] = None,
+        default_ttl_seconds: float = 24 * 3600,
+        stale_seconds: float = 24 * 3600,
+        max_refresh_workers: int = 4,
+    ):
+        self.db_path = db_path
+        self.ttl_seconds = {**DEFAULT_TTL_SECONDS, **(ttl_seconds or {})}
+        self.default_ttl_seconds = default_ttl_seconds
+        self.stale_seconds = stale_seconds
+
+        self._lock = threading.Lock()
+        self._refreshing = set()
+        self._refresh_executor = ThreadPoolExecutor(
+            max_workers=max_refresh_workers, thread_name_prefix="search-cache-refresh"
+        )
+        self.metrics: Dict[str, Dict[str, int]] = {}
+
+        db_dir = os.path.dirname(db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL;")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS search_cache (
+                key TEXT PRIMARY KEY,
+                source TEXT NOT NULL,
+                query TEXT NOT NULL,
+                value TEXT NOT NULL,
+                fetched_at REAL NOT NULL
+            );"""
+        )
+        self._conn.commit()
+
+    def ttl_for(self, source: str) -> float:
+        return self.ttl_seconds.get(source, self.default_ttl_seconds)
+
+    def _count(self, source: str, name: str) -> None:
+        with self._lock:
+            counters = self.metrics.setdefault(
+                source,
+                {
+                    "hits": 0,
+                    "stale_hits": 0,
+                    "semantic_hits": 0,
+                    "misses": 0,
+                    "refreshes": 0,
+                    "refresh_errors": 0,
+                },
+            )
+            counters[name] += 1
+
+    def _read(self, key: str):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, fetched_at FROM search_cache WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        return json.loads(row[0]), row[1]
+
+    def _write(self, key: str, source: str, query: str, value: Any) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO search_cache (key, source, query, value, fetched_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, source, normalize_query(query), json.dumps(value, ensure_ascii=False), time.time()),
+            )
+            self._conn.commit()
+
+    def _refresh(self, key: str, source: str, query: str, fetch: Callable[[], Any]) -> None:
+        try:
+            self._write(key, source, query, fetch())
+            self._count(source, "refreshes")
+        except Exception:
+            # Keep serving the stale entry; the next lookup retries the refresh
+            self._count(source, "refresh_errors")
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def _schedule_refresh(self, key: str, source: str, query: str, fetch: Callable[[], Any]) -> None:
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+        self._refresh_executor.submit(self._refresh, key, source, query, fetch)
+
+    def get_or_fetch(
+        self,
+        source: str,
+        query: str,
+        fetch: Callable[[], Any],
+        params: Optional[Dict[str, Any]] = None,
+        semantic_index: Optional[SemanticQueryIndex] = None,
+    ) -> Any:
+        """Return the cached result for (source, query, params), calling `fetch()` on a miss.
+
+        `fetch` must return a JSON-serializable value and raise on failure. With a
+        `semantic_index`, a miss may be answered by a near-duplicate query's results; those
+        are returned but never stored under this key, and refreshes always call `fetch()`.
+        """
+        key = make_search_key(source, query, params)
+        entry = self._read(key)
+        if entry is not None:
+            value, fetched_at = entry
+            age = time.time() - fetched_at
+            ttl = self.ttl_for(source)
+            if age < ttl:
+                self._count(source, "hits")
+                return value
+            if age < ttl + self.stale_seconds:
+                self._count(source, "stale_hits")
+                self._schedule_refresh(key, source, query, fetch)
+                return value
+
+        def fetch_miss():
+            self._count(source, "misses")
+            return fetch()
+
+        if semantic_index is None:
+            value = fetch_miss()
+        else:
+            value, fetched = semantic_index.fetch_similar(
+                source, normalize_query(query), fetch_miss, params=params
+            )
+            if not fetched:
+                self._count(source, "semantic_hits")
+                return value
+        self._write(key, source, query, value)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM search_cache")
+            self._conn.commit()
+
+    def purge_expired(self) -> int:
+        """Delete entries that are past their TTL and stale window"""
+        now = time.time()
+        with self._lock:
+            rows = self._conn.execute("SELECT key, source, fetched_at FROM search_cache").fetchall()
+            expired = [
+                (key,)
+                for key, source, fetched_at in rows
+                if now - fetched_at >= self.ttl_for(source) + self.stale_seconds
+            ]
+            self._conn.executemany("DELETE FROM search_cache WHERE key = ?", expired)
+            self._conn.commit()
+        return len(expired)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            per_source = {source: dict(counters) for source, counters in self.metrics.items()}
+        totals = {
+            "hits": 0,
+            "stale_hits": 0,
+            "semantic_hits": 0,
+            "misses": 0,
+            "refreshes": 0,
+            "refresh_errors": 0,
+        }
+        for counters in per_source.values():
+            for name, value in counters.items():
+                totals[name] += value
+        served = totals["hits"] + totals["stale_hits"] + totals["semantic_hits"]
+        total = served + totals["misses"]
+        return {**totals, "hit_ratio": served / total if total else 0.0, "sources": per_source}
+
+
+# Created once: constructing an EnvLoader searches the filesystem for the .env file
+_env = EnvLoader()
+_search_cache: Optional[SearchCache] = None
+_search_cache_lock = threading.Lock()
+
+
+def get_search_cache() -> Optional[SearchCache]:
+    """Process-wide cache built from env vars, or None when SEARCH_CACHE_ENABLED is false"""
+    global _search_cache
+    if not _env.get_bool("SEARCH_CACHE_ENABLED", True):
+        return None
+    with _search_cache_lock:
+        if _search_cache is None:
+            _search_cache = SearchCache(
+                db_path=_env.get("SEARCH_CACHE_DB_PATH", SEARCH_CACHE_DB_PATH),
+                ttl_seconds={
+                    source: _env.get_int(f"SEARCH_CACHE_TTL_{source.upper()}", ttl)
+                    for source, ttl in DEFAULT_TTL_SECONDS.items()
+                },
+                stale_seconds=_env.get_int("SEARCH_CACHE_STALE_SECONDS", 24 * 3600),
+            )
+        return _search_cache
+
+
+def cached_search(
+    source: str,
+    query: str,
+    fetch: Callable[[], Any],
+    params: Optional[Dict[str, Any]] = None,
+) -> Any:
+    """Route a search through the shared cache, or call `fetch()` directly when it is disabled.
+
+    On an exact-key miss, the semantic query index (when enabled) may answer with the results
+    of a near-duplicate query instead of hitting the search backend.
+    """
+    index = get_semantic_query_index()
+    cache = get_search_cache()
+    if cache is None:
+        if index is None:
+            return fetch()
+        return index.fetch_similar(source, normalize_query(query), fetch, params=params)[0]
+    return cache.get_or_fetch(source, query, fetch, params=params, semantic_index=index)
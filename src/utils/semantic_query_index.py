@@ -0,0 +1,162 @@
+"""
+Semantic near-duplicate detection for search queries.
+
+Analysts of one research run often issue paraphrases of the same search
+("LangGraph benefits for startups" vs "advantages of LangGraph for startups"). The exact
+`SearchCache` key misses those, so `cached_search` consults this in-memory vector index on
+a cache miss: when a prior query of the same source and params has cosine similarity
+>= `threshold` with the new one, its result set is returned instead of calling the search
+backend. Such results are not written to the exact cache under the new query, so they
+never outlive the index or get served to callers that bypass it.
+
+Embeddings come from the DashScope embedding model (OpenAI-compatible endpoint) by
+default; any `embed(texts) -> vectors` callable can be injected. Vectors are normalized
+once, so similarity is a plain dot product.
+
+Reusing a neighbour's results trades answer quality for latency; pick the threshold with
+`benchmarks/eval_semantic_query_index.py`, which reports hit rate vs result drift.
+
+Env vars:
+    SEMANTIC_QUERY_INDEX_ENABLED=false
+    SEMANTIC_QUERY_INDEX_THRESHOLD=0.92
+    SEMANTIC_QUERY_INDEX_MAX_ENTRIES=2048
+    SEMANTIC_QUERY_INDEX_EMBEDDING_MODEL=text-embedding-v3
+"""
+
+import json
+import math
+import threading
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from utils.env_utils import EnvLoader
+
+Embedder = Callable[[List[str]], List[Sequence[float]]]
+
+DEFAULT_EMBEDDING_MODEL = "text-embedding-v3"
+
+
+def qwen_embedder(model: str = DEFAULT_EMBEDDING_MODEL) -> Embedder:
+    """Embed texts with a DashScope embedding model through the shared OpenAI client"""
+
+    def embed(texts: List[str]) -> List[Sequence[float]]:
+        from utils.qwen_api import init_openai_client_with_qwen
+
+        response = init_openai_client_with_qwen().embeddings.create(model=model, input=texts)
+        return [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
+
+    return embed
+
+
+def normalize_vector(vector: Sequence[float]) -> List[float]:
+    norm = math.sqrt(sum(x * x for x in vector))
+    return [x / norm for x in vector] if norm else list(vector)
+
+
+def cosine_similarity(a: Sequence[float], b: Sequence[float]) -> float:
+    """Dot product of two normalized vectors"""
+    return sum(x * y for x, y in zip(a, b))
+
+
+class SemanticQueryIndex:
+    """In-memory index of (query embedding -> result set), one namespace per source + params"""
+
+    def __init__(self, embed: Embedder, threshold: float = 0.92, max_entries: int = 2048):
+        self.embed = embed
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self._entries: Dict[str, deque] = {}
+        self._lock = threading.Lock()
+        self.metrics = {"lookups": 0, "hits": 0, "adds": 0, "embed_errors": 0}
+
+    @staticmethod
+    def namespace(source: str, params: Optional[Dict[str, Any]] = None) -> str:
+        return source + ":" + json.dumps(params or {}, sort_keys=True, default=str)
+
+    def _embed_one(self, query: str) -> Optional[List[float]]:
+        try:
+            return normalize_vector(self.embed([query])[0])
+        except Exception:
+            # The index is an optimization only; fall through to a real search
+            self.metrics["embed_errors"] += 1
+            return None
+
+    def nearest(self, namespace: str, vector: Sequence[float], exclude_query: str = None):
+        """Best (similarity, query, value) in the namespace, or None when it is empty"""
+        with self._lock:
+            entries = list(self._entries.get(namespace, ()))
+        best = None
+        for query, entry_vector, value in entries:
+            if query == exclude_query:
+                continue
+            similarity = cosine_similarity(vector, entry_vector)
+            if best is None or similarity > best[0]:
+                best = (similarity, query, value)
+        return best
+
+    def add(self, namespace: str, query: str, vector: Sequence[float], value: Any) -> None:
+        with self._lock:
+            entries = self._entries.setdefault(namespace, deque(maxlen=self.max_entries))
+            entries.append((query, vector, value))
+            self.metrics["adds"] += 1
+
+    def fetch_similar(
+        self,
+        source: str,
+        query: str,
+        fetch: Callable[[], Any],
+        params: Optional[Dict[str, Any]] = None,
+    ) -> Tuple[Any, bool]:
+        """(results, fetched): a near-duplicate query's results, or `fetch()` when there is none.
+
+        `query` is expected to be normalized already (see `search_cache.normalize_query`).
+        Results with `fetched` False belong to another query and must not be stored under
+        this one (e.g. in the exact search cache).
+        """
+        namespace = self.namespace(source, params)
+        vector = self._embed_one(query)
+        if vector is None:
+            return fetch(), True
+        self.metrics["lookups"] += 1
+        # The query itself is skipped: reaching here means its own results expired or are unknown
+        best = self.nearest(namespace, vector, exclude_query=query)
+        if best is not None and best[0] >= self.threshold:
+            self.metrics["hits"] += 1
+            return best[2], False
+        value = fetch()
+        self.add(namespace, query, vector, value)
+        return value, True
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.metrics["lookups"]
+        with self._lock:
+            size = sum(len(entries) for entries in self._entries.values())
+        return {
+            **self.metrics,
+            "size": size,
+            "threshold": self.threshold,
+            "hit_ratio": self.metrics["hits"] / lookups if lookups else 0.0,
+        }
+
+
+# Created once: constructing an EnvLoader searches the filesystem for the .env file
+_env = EnvLoader()
+_semantic_query_index: Optional[SemanticQueryIndex] = None
+_semantic_query_index_lock = threading.Lock()
+
+
+def get_semantic_query_index() -> Optional[SemanticQueryIndex]:
+    """Process-wide index built from env vars, or None unless SEMANTIC_QUERY_INDEX_ENABLED is true"""
+    global _semantic_query_index
+    if not _env.get_bool("SEMANTIC_QUERY_INDEX_ENABLED", False):
+        return None
+    with _semantic_query_index_lock:
+        if _semantic_query_index is None:
+            _semantic_query_index = SemanticQueryIndex(
+                embed=qwen_embedder(
+                    _env.get("SEMANTIC_QUERY_INDEX_EMBEDDING_MODEL", DEFAULT_EMBEDDING_MODEL)
+                ),
+                threshold=float(_env.get("SEMANTIC_QUERY_INDEX_THRESHOLD", "0.92")),
+                max_entries=_env.get_int("SEMANTIC_QUERY_INDEX_MAX_ENTRIES", 2048),
+            )
+        return _semantic_query_index
@@ -0,0 +1,223 @@
+"""
+Delta updates for the virtual filesystem kept in deep agent state (`files`).
+
+Tools used to return the whole `files` dict in every `Command`, so each write pushed every
+file the agent ever stored through the reducer and into the checkpoint writes. Tools now
+return only the paths they changed:
+
+    Command(update={"files": {"notes.md": "..."}})   # create / overwrite
+    Command(update={"files": {"old.md": None}})      # delete
+
+`merge_files` (the `file_reducer` of `DeepAgentState`) applies such a delta copy-on-write:
+the new map is a shallow copy, so file contents are shared with the previous map and only
+the path -> content table is new; an empty delta returns the current map unchanged.
+Tools must never mutate the injected `state["files"]`, it is shared with other readers.
+
+`LineIndex` keeps the start offset of every line of a file, so `read_file(offset, limit)`
+slices only the requested window instead of splitting the whole file on every call.
+Indexes are cached per content string (built when the file is written, rebuilt once after
+a checkpoint restore); a new content is a new key, so an update invalidates by itself.
+
+Large files (scraped pages) are offloaded to the content-addressed `utils.blob_store`;
+the state then holds only a reference line plus a short preview:
+
+    blob://sha256/<digest>?chars=<length>
+    <first PREVIEW_CHARS characters>
+
+`offload_content` is applied on write, `resolve_content` on read, so tools keep working
+with plain text and checkpoints no longer grow with the volume of scraped content.
+"""
+
+import re
+import threading
+from array import array
+from bisect import bisect_right
+from collections import OrderedDict
+from fnmatch import fnmatchcase
+from functools import lru_cache
+from typing import Dict, Iterator, List, Mapping, Optional, Tuple
+
+from utils.blob_store import BlobStore, get_blob_store
+
+FileDelta = Mapping[str, Optional[str]]
+
+BLOB_REF_PREFIX = "blob://sha256/"
+PREVIEW_CHARS = 500
+
+
+def merge_files(left: Optional[Mapping[str, str]], right: Optional[FileDelta]) -> Dict[str, str]:
+    """Apply a file delta to a file map; `None` values delete the path"""
+    if left is None:
+        left = {}
+    if not right:
+        return left
+    merged = dict(left)
+    for path, content in right.items():
+        if content is None:
+            merged.pop(path, None)
+        else:
+            merged[path] = content
+    return merged
+
+
+def diff_files(
+    before: Optional[Mapping[str, str]], after: Optional[Mapping[str, str]]
+) -> Dict[str, Optional[str]]:
+    """Delta that turns `before` into `after`, with `None` for deleted paths"""
+    before = before or {}
+    after = after or {}
+    delta: Dict[str, Optional[str]] = {}
+    for path, content in after.items():
+        old = before.get(path)
+        # Identity first: unchanged files are usually the very same string object
+        if old is not content and old != content:
+            delta[path] = content
+    for path in before:
+        if path not in after:
+            delta[path] = None
+    return delta
+
+
+def is_blob_ref(value: Optional[str]) -> bool:
+    return bool(value) and value.startswith(BLOB_REF_PREFIX)
+
+
+def offload_content(content: str, store: Optional[BlobStore] = None) -> str:
+    """Value to keep in state: the content itself, or a blob reference with a preview"""
+    store = store or get_blob_store()
+    if store is None or len(content) < store.threshold_chars or is_blob_ref(content):
+        return content
+    digest = store.put(content)
+    return f"{BLOB_REF_PREFIX}{digest}?chars={len(content)}\n{content[:PREVIEW_CHARS]}"
+
+
+def resolve_content(value: str, store: Optional[BlobStore] = None) -> str:
+    """Full content of a state value; raises KeyError when a referenced blob is missing"""
+    if not is_blob_ref(value):
+        return value
+    store = store or get_blob_store()
+    if store is None:
+        raise KeyError("blob store is disabled (BLOB_STORE_ENABLED=false)")
+    header = value.split("\n", 1)[0]
+    digest = header[len(BLOB_REF_PREFIX):].split("?", 1)[0]
+    return store.get(digest)
+
+
+class LineIndex:
+    """Start offsets of the lines of a text (lines end with "\n", like `str.splitlines`)"""
+
+    def __init__(self, content: str):
+        self.content = content
+        offsets = array("q", [0])
+        find = content.find
+        position = find("\n")
+        while position != -1:
+            offsets.append(position + 1)
+            position = find("\n", position + 1)
+        # A trailing newline ends the last line, it does not start a new one
+        if len(offsets) > 1 and offsets[-1] == len(content):
+            offsets.pop()
+        self.offsets = offsets
+
+    @property
+    def line_count(self) -> int:
+        return len(self.offsets) if self.content else 0
+
+    def line(self, number: int) -> str:
+        """Line `number` (0-based) without its line ending"""
+        start = self.offsets[number]
+        end = self.offsets[number + 1] if number + 1 < len(self.offsets) else len(self.content)
+        if end > start and self.content[end - 1] == "\n":
+            end -= 1
+        if end > start and self.content[end - 1] == "\r":
+            end -= 1
+        return self.content[start:end]
+
+    def lines(self, offset: int, limit: int) -> Iterator[Tuple[int, str]]:
+        """(line number, line) of the window, touching only those lines"""
+        for number in range(max(offset, 0), min(offset + limit, self.line_count)):
+            yield number, self.line(number)
+
+    def line_number(self, position: int) -> int:
+        """0-based line containing the character at `position`"""
+        return bisect_right(self.offsets, position) - 1
+
+
+class LineIndexCache:
+    """Bounded LRU of line indexes keyed by file content"""
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._indexes: "OrderedDict[str, LineIndex]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.metrics = {"hits": 0, "builds": 0}
+
+    def get(self, content: str) -> LineIndex:
+        # str caches its hash and compares by identity first, so a hit is O(1)
+        with self._lock:
+            index = self._indexes.get(content)
+            if index is not None:
+                self._indexes.move_to_end(content)
+                self.metrics["hits"] += 1
+                return index
+        index = LineIndex(content)
+        with self._lock:
+            self._indexes[content] = index
+            self.metrics["builds"] += 1
+            while len(self._indexes) > self.max_entries:
+                self._indexes.popitem(last=False)
+        return index
+
+    def clear(self) -> None:
+        with self._lock:
+            self._indexes.clear()
+
+
+line_index_cache = LineIndexCache()
+
+
+def line_index(content: str) -> LineIndex:
+    return line_index_cache.get(content)
+
+
+@lru_cache(maxsize=128)
+def compile_pattern(pattern: str, ignore_case: bool = False) -> "re.Pattern[str]":
+    flags = re.MULTILINE | (re.IGNORECASE if ignore_case else 0)
+    return re.compile(pattern, flags)
+
+
+def grep_files(
+    files: Mapping[str, str],
+    pattern: str,
+    glob: Optional[str] = None,
+    ignore_case: bool = False,
+    max_matches: int = 100,
+) -> List[Tuple[str, int, str]]:
+    """(path, 1-based line number, line) of every line matching `pattern`, in path order.
+
+    Offloaded files are searched in full. Raises `re.error` for an invalid pattern.
+    """
+    regex = compile_pattern(pattern, ignore_case)
+    matches: List[Tuple[str, int, str]] = []
+    for path in sorted(files):
+        if glob and not fnmatchcase(path, glob):
+            continue
+        try:
+            content = resolve_content(files[path])
+        except KeyError:
+            content = files[path]  # blob gone, search the preview kept in state
+        if not content:
+            continue
+        index = None
+        last_line = -1
+        for match in regex.finditer(content):
+            if index is None:
+                index = line_index(content)
+            number = index.line_number(match.start())
+            if number == last_line:
+                continue
+            last_line = number
+            matches.append((path, number + 1, index.line(number)))
+            if len(matches) >= max_matches:
+                return matches
+    return matches
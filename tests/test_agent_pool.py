@@ -0,0 +1,78 @@
+import asyncio
+
+import pytest
+
+from apps.agent_pool import AgentPool, PoolSaturatedError
+from apps.thread_locks import ThreadTaskManager
+
+
+def make_pool(**kwargs):
+  agents = iter(range(100))
+  return AgentPool(lambda: f"agent-{next(agents)}", **kwargs)
+
+
+def test_checkout_round_trip():
+  async def main():
+    pool = make_pool(size=2)
+    async with pool.checkout() as first:
+      async with pool.checkout() as second:
+        assert {first, second} == {"agent-0", "agent-1"}
+        assert pool.stats()["available"] == 0
+    return pool.stats()
+
+  stats = asyncio.run(main())
+  assert stats["available"] == 2
+  assert stats["checkouts"] == 2
+
+
+def test_full_queue_is_rejected_up_front():
+  async def main():
+    pool = make_pool(size=1, max_queue=0)
+    agent = await pool.acquire()
+    with pytest.raises(PoolSaturatedError):
+      pool.ensure_capacity()
+    with pytest.raises(PoolSaturatedError):
+      await pool.acquire()
+    pool.release(agent)
+    pool.ensure_capacity()
+    return pool.stats()
+
+  assert asyncio.run(main())["rejections"] == 2
+
+
+def test_acquire_times_out():
+  async def main():
+    pool = make_pool(size=1, acquire_timeout=0.01)
+    await pool.acquire()
+    with pytest.raises(PoolSaturatedError) as error:
+      await pool.acquire()
+    assert error.value.retry_after >= 1
+
+  asyncio.run(main())
+
+
+def test_agent_released_when_stream_consumer_goes_away():
+  # Mirrors /chat/stream: lock first, check out inside the stream
+  async def main():
+    pool = make_pool(size=1)
+    manager = ThreadTaskManager()
+
+    async def event_stream():
+      async with manager.lock("t001"):
+        async with pool.checkout() as agent:
+          for i in range(10):
+            await asyncio.sleep(0)
+            yield f"{agent}:{i}"
+
+    stream = event_stream()
+    assert await stream.__anext__() == "agent-0:0"
+    assert pool.stats()["available"] == 0
+    await stream.aclose()
+
+    never_started = event_stream()
+    del never_started
+    return pool.stats(), manager.stats()
+
+  pool_stats, manager_stats = asyncio.run(main())
+  assert pool_stats["available"] == 1
+  assert manager_stats["active_threads"] == 0
@@ -0,0 +1,42 @@
+from utils.blob_store import BlobStore
+from utils.virtual_fs import is_blob_ref, offload_content, resolve_content
+from utils import blob_store
+
+
+def test_put_deduplicates_and_round_trips(tmp_path):
+  store = BlobStore(db_path=str(tmp_path / "blobs.db"))
+  page = "scraped page content\n" * 2000
+  digest = store.put(page)
+
+  assert store.put(page) == digest
+  assert store.get(digest) == page
+  stats = store.stats()
+  assert stats["blobs"] == 1
+  assert stats["dedup_hits"] == 1
+  assert stats["stored_bytes"] < len(page) // 10
+
+  reopened = BlobStore(db_path=str(tmp_path / "blobs.db"))
+  assert reopened.get(digest) == page
+
+
+def test_state_keeps_reference_and_preview(tmp_path):
+  store = BlobStore(db_path=str(tmp_path / "blobs.db"), threshold_chars=100)
+  page = "# Search Result\n" + "LangGraph insight\n" * 500
+
+  assert offload_content("short note", store) == "short note"
+  ref = offload_content(page, store)
+  assert is_blob_ref(ref)
+  assert len(ref) < 1000
+  assert ref.split("\n", 1)[1].startswith("# Search Result")
+  assert resolve_content(ref, store) == page
+  assert resolve_content("short note", store) == "short note"
+
+
+def test_getter_does_not_reload_env_per_call(monkeypatch):
+  def fail():
+    raise AssertionError("EnvLoader must be created once, not per call")
+
+  monkeypatch.setattr(blob_store, "EnvLoader", fail)
+  monkeypatch.setenv("BLOB_STORE_ENABLED", "false")
+  assert blob_store.get_blob_store() is None
+
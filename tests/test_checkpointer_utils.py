@@ -0,0 +1,83 @@
+import asyncio
+import operator
+import time
+from typing import Annotated, List, TypedDict
+
+from langgraph.graph import END, START, StateGraph
+
+from utils.checkpointer_utils import PooledSqliteSaver
+
+
+class CounterState(TypedDict):
+  steps: Annotated[List[str], operator.add]
+
+
+def build_graph(checkpointer):
+  builder = StateGraph(CounterState)
+  builder.add_node("step", lambda state: {"steps": ["step"]})
+  builder.add_edge(START, "step")
+  builder.add_edge("step", END)
+  return builder.compile(checkpointer=checkpointer)
+
+
+def thread(thread_id):
+  return {"configurable": {"thread_id": thread_id}}
+
+
+def make_saver(tmp_path, **kwargs):
+  return PooledSqliteSaver(db_path=str(tmp_path / "checkpoints.db"), **kwargs)
+
+
+def pooled_savers(saver):
+  return list(saver._pool.queue)
+
+
+def test_evicts_only_threads_idle_past_the_ttl(tmp_path):
+  saver = make_saver(tmp_path, pool_size=2, ttl_seconds=60)
+  graph = build_graph(saver)
+  graph.invoke({"steps": []}, thread("stale"))
+  graph.invoke({"steps": []}, thread("fresh"))
+  assert list(saver.list(thread("stale")))
+  assert list(saver.list(thread("fresh")))
+
+  with saver._saver() as pooled:
+    with pooled.lock:
+      pooled.conn.execute(
+        "UPDATE thread_activity SET last_seen = ? WHERE thread_id = ?",
+        (time.time() - 120, "stale"),
+      )
+      pooled.conn.commit()
+
+  assert saver.evict_idle_threads() == ["stale"]
+
+  assert list(saver.list(thread("stale"))) == []
+  assert saver.get_tuple(thread("stale")) is None
+  assert graph.get_state(thread("fresh")).values == {"steps": ["step"]}
+  with saver._saver() as pooled:
+    rows = pooled.conn.execute("SELECT thread_id FROM thread_activity").fetchall()
+  assert rows == [("fresh",)]
+  saver.close()
+
+
+def test_pool_connections_are_reused_across_sync_and_async_calls(tmp_path):
+  saver = make_saver(tmp_path, pool_size=2)
+  savers_before = {id(pooled) for pooled in pooled_savers(saver)}
+  connections_before = {id(pooled.conn) for pooled in pooled_savers(saver)}
+  graph = build_graph(saver)
+
+  for i in range(5):
+    graph.invoke({"steps": []}, thread(f"sync-{i}"))
+
+  async def run_concurrently():
+    await asyncio.gather(
+      *(graph.ainvoke({"steps": []}, thread(f"async-{i}")) for i in range(5))
+    )
+
+  asyncio.run(run_concurrently())
+
+  # Every checkout went back to the pool: no connection was opened or leaked
+  assert saver._pool.qsize() == 2
+  assert {id(pooled) for pooled in pooled_savers(saver)} == savers_before
+  assert {id(pooled.conn) for pooled in pooled_savers(saver)} == connections_before
+  assert graph.get_state(thread("async-4")).values == {"steps": ["step"]}
+  saver.close()
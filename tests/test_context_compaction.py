@@ -0,0 +1,39 @@
+from utils.context_compaction import compact_documents, parse_documents
+
+
+def web_block(*docs):
+  return "\n\n---\n\n".join(f'<Document href="{url}">\n{content}\n</Document>' for url, content in docs)
+
+
+def test_duplicates_are_dropped_and_citations_kept():
+  context = [
+    web_block(("https://a.com", "LangGraph helps startups ship agents"), ("https://b.com", "Unrelated cooking recipe")),
+    '<Document source="https://en.wikipedia.org/wiki/LangGraph" page="">\nLangGraph is a library\n</Document>',
+    web_block(("https://a.com", "LangGraph helps startups ship agents")),
+    web_block(("https://c.com", "LangGraph is a library")),
+    "Search timed out: web",
+  ]
+  compacted, stats = compact_documents(context, query="startup founder using LangGraph", token_budget=1000)
+
+  assert stats["documents"] == 5
+  assert stats["unique_documents"] == 3
+  assert compacted.count("https://a.com") == 1
+  assert 'source="https://en.wikipedia.org/wiki/LangGraph" page=""' in compacted
+  assert "https://c.com" not in compacted
+  assert "Search timed out" not in compacted
+  assert len(parse_documents([compacted])) == 3
+
+
+def test_budget_keeps_most_relevant_documents():
+  filler = "lorem ipsum " * 200
+  context = [
+    web_block(
+      ("https://irrelevant.com", filler),
+      ("https://relevant.com", "startup costs drop with LangGraph " * 10),
+    )
+  ]
+  compacted, stats = compact_documents(context, query="startup LangGraph costs", token_budget=200)
+
+  assert "https://relevant.com" in compacted
+  assert stats["tokens_after"] < stats["tokens_before"]
+  assert stats["tokens_after"] <= 200 + 40  # budget covers content, tags add a little
@@ -0,0 +1,64 @@
+from langchain_core.messages import HumanMessage
+from langgraph.checkpoint.memory import MemorySaver
+
+from agents.chat_agents import SimpleChatAgent
+from benchmarks.fake_llm import FakeLatencyChatModel
+from utils.graph_registry import GraphRegistry, graph_registry
+
+
+def test_compiles_once_per_key():
+  registry = GraphRegistry()
+  builds = []
+
+  def build():
+    builds.append(1)
+    return object()
+
+  first = registry.get_or_compile(("Agent", "chat", 1), build, filename="chat.png")
+  assert registry.get_or_compile(("Agent", "chat", 1), build, filename="chat.png") is first
+  assert registry.get_or_compile(("Agent", "chat", 2), build, filename="chat.png") is not first
+  assert len(builds) == 2
+
+  stats = registry.stats()
+  assert stats["hits"] == 1
+  assert stats["compiles"] == 2
+  assert stats["graphs"] == 2
+
+
+def test_nested_compile_does_not_deadlock():
+  registry = GraphRegistry()
+
+  def build_parent():
+    child = registry.get_or_compile("child", object, filename="child.png")
+    return ("parent", child)
+
+  parent = registry.get_or_compile("parent", build_parent, filename="parent.png")
+  assert parent[1] is registry.get_or_compile("child", object, filename="child.png")
+
+
+def test_evicts_least_recently_used():
+  registry = GraphRegistry(max_graphs=2)
+  first = registry.get_or_compile("a", object, filename="a.png")
+  registry.get_or_compile("b", object, filename="b.png")
+  assert registry.get_or_compile("a", object, filename="a.png") is first
+  registry.get_or_compile("c", object, filename="c.png")
+
+  assert registry.get_or_compile("a", object, filename="a.png") is first
+  assert registry.stats()["graphs"] == 2
+  assert registry.stats()["evictions"] == 1
+
+
+def test_agents_share_one_graph_with_their_own_model_and_checkpointer():
+  graph_registry.clear()
+  agents = [
+    SimpleChatAgent(llm=FakeLatencyChatModel(latency=0, response=f"answer {i}"), checkpointer=MemorySaver())
+    for i in range(3)
+  ]
+  assert graph_registry.stats()["graphs"] == 1
+
+  config = {"configurable": {"thread_id": "t001"}}
+  for agent in agents:
+    agent.graph.invoke({"messages": [HumanMessage(content="hi")]}, config)
+  for i, agent in enumerate(agents):
+    messages = agent.graph.get_state(config).values["messages"]
+    assert [m.content for m in messages] == ["hi", f"answer {i}"]
@@ -0,0 +1,88 @@
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from utils import qwen_api
+from utils.qwen_api import ahedged_chat_completion, get_background_loop, hedged_chat_completion
+
+MESSAGES = [{"role": "user", "content": "hello"}]
+
+
+class SlowThenFastClient:
+  """Stub AsyncOpenAI client: the first request hangs for `slow_delay`, later ones answer
+  after `fast_delay`. Records when each request started, its model and whether it was cancelled"""
+
+  def __init__(self, slow_delay=5.0, fast_delay=0.01):
+    self.slow_delay = slow_delay
+    self.fast_delay = fast_delay
+    self.calls = []
+    self.cancelled = threading.Event()
+    self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+  async def create(self, model, messages, **params):
+    index = len(self.calls)
+    self.calls.append(
+      {"model": model, "started": time.perf_counter(), "loop": asyncio.get_running_loop()}
+    )
+    try:
+      await asyncio.sleep(self.slow_delay if index == 0 else self.fast_delay)
+    except asyncio.CancelledError:
+      self.cancelled.set()
+      raise
+    message = SimpleNamespace(content=f"answer from {model} #{index}")
+    return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+@pytest.fixture(autouse=True)
+def reset_stats(monkeypatch):
+  monkeypatch.setattr(qwen_api, "hedging_stats", {"calls": 0, "hedges_fired": 0, "hedge_wins": 0})
+
+
+def test_hedge_fires_after_the_delay_and_the_first_answer_wins():
+  client = SlowThenFastClient()
+
+  async def call():
+    start = time.perf_counter()
+    content = await ahedged_chat_completion(
+      MESSAGES, model_name="primary", hedge_model_name="hedge", hedge_delay=0.1, client=client
+    )
+    # Let the cancelled primary run its CancelledError handler
+    await asyncio.sleep(0)
+    return start, content
+
+  start, content = asyncio.run(call())
+
+  assert content == "answer from hedge #1"
+  assert [c["model"] for c in client.calls] == ["primary", "hedge"]
+  assert client.calls[1]["started"] - start >= 0.1
+  assert client.cancelled.is_set()
+  assert qwen_api.hedging_stats == {"calls": 1, "hedges_fired": 1, "hedge_wins": 1}
+
+
+def test_fast_primary_does_not_fire_the_hedge():
+  client = SlowThenFastClient(slow_delay=0.01)
+
+  content = asyncio.run(
+    ahedged_chat_completion(MESSAGES, model_name="primary", hedge_delay=0.5, client=client)
+  )
+
+  assert content == "answer from primary #0"
+  assert len(client.calls) == 1
+  assert qwen_api.hedging_stats["hedges_fired"] == 0
+
+
+def test_sync_wrapper_runs_on_the_background_loop():
+  client = SlowThenFastClient()
+
+  start = time.perf_counter()
+  content = hedged_chat_completion(MESSAGES, model_name="primary", hedge_delay=0.1, client=client)
+  elapsed = time.perf_counter() - start
+
+  assert content == "answer from primary #1"
+  assert elapsed < client.slow_delay
+  assert {c["loop"] for c in client.calls} == {get_background_loop()}
+  # The losing request is cancelled on the background loop, not left running
+  assert client.cancelled.wait(timeout=1)
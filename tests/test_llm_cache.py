@@ -0,0 +1,47 @@
+from pydantic import BaseModel
+
+from utils.llm_cache import LLMResponseCache, make_cache_key
+from utils import llm_cache
+
+
+class Answer(BaseModel):
+  text: str
+
+
+def test_cache_key_depends_on_schema_and_params():
+  messages = [{"role": "user", "content": "hi"}]
+  key = make_cache_key("qwen-plus", messages, {"temperature": 0})
+  assert key == make_cache_key("qwen-plus", messages, {"temperature": 0})
+  assert key != make_cache_key("qwen-plus", messages, {"temperature": 0}, response_format=Answer)
+  assert key != make_cache_key("qwen-flash", messages, {"temperature": 0})
+
+
+def test_memory_and_disk_tiers(tmp_path):
+  db_path = str(tmp_path / "llm_cache.db")
+  cache = LLMResponseCache(db_path=db_path, max_entries=1)
+  cache.set("a", "answer a")
+  cache.set("b", "answer b")  # evicts "a" from the memory tier
+
+  assert cache.get("b") == "answer b"
+  assert cache.get("a") == "answer a"
+  assert cache.get("missing") is None
+  assert cache.metrics == {"memory_hits": 1, "disk_hits": 1, "misses": 1, "writes": 2}
+
+  # A new process-level cache still sees the disk tier
+  assert LLMResponseCache(db_path=db_path).get("a") == "answer a"
+
+
+def test_expired_entries_are_not_served(tmp_path):
+  cache = LLMResponseCache(db_path=str(tmp_path / "llm_cache.db"))
+  cache.set("a", "answer a", ttl_seconds=-1)
+  assert cache.get("a") is None
+
+
+def test_getter_does_not_reload_env_per_call(monkeypatch):
+  def fail():
+    raise AssertionError("EnvLoader must be created once, not per call")
+
+  monkeypatch.setattr(llm_cache, "EnvLoader", fail)
+  monkeypatch.setenv("LLM_CACHE_ENABLED", "false")
+  assert llm_cache.get_llm_cache() is None
+
@@ -0,0 +1,32 @@
+import asyncio
+
+import httpx
+
+from utils.qwen_api import LLMClientRegistry
+
+
+def test_loop_bound_client_uses_one_pool_per_loop(monkeypatch):
+  registry = LLMClientRegistry()
+  senders = []
+
+  async def fake_send(self, request, **kwargs):
+    senders.append(self)
+    return httpx.Response(200, request=request)
+
+  # Patches the pooled clients; the loop-bound client overrides `send` itself
+  monkeypatch.setattr(httpx.AsyncClient, "send", fake_send)
+  client = registry.loop_bound_async_client()
+
+  async def call():
+    request = client.build_request("POST", "https://example.com/v1/chat/completions")
+    await client.send(request)
+    await client.send(request)
+
+  asyncio.run(call())
+  asyncio.run(call())
+
+  assert client is registry.loop_bound_async_client()
+  assert senders[0] is senders[1]
+  assert senders[2] is senders[3]
+  assert senders[0] is not senders[2]
+  assert client not in senders
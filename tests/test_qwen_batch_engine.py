@@ -0,0 +1,69 @@
+import json
+
+from utils.qwen_batch_engine import (
+  QwenBatchEngine,
+  build_request_lines,
+  iter_jsonl,
+  parse_result_line,
+  shard_request_lines,
+)
+
+
+def test_build_request_lines():
+  lines = [json.loads(line) for line in build_request_lines(
+    ["who are you?", [{"role": "system", "content": "be brief"}, {"role": "user", "content": "hi"}]],
+    model="qwen-flash",
+    temperature=0,
+  )]
+
+  assert [line["custom_id"] for line in lines] == ["request-0", "request-1"]
+  assert lines[0]["body"] == {
+    "model": "qwen-flash",
+    "messages": [{"role": "user", "content": "who are you?"}],
+    "temperature": 0,
+  }
+  assert lines[1]["body"]["messages"][0]["role"] == "system"
+  assert lines[0]["method"] == "POST"
+
+
+def test_shards_respect_request_and_byte_limits(tmp_path):
+  lines = [json.dumps({"custom_id": f"request-{i}", "pad": "x" * 50}) for i in range(10)]
+
+  by_count = shard_request_lines(lines, str(tmp_path / "count"), max_requests=4)
+  assert [len(list(iter_jsonl(path))) for path in by_count] == [4, 4, 2]
+
+  line_bytes = len(lines[0]) + 1
+  by_size = shard_request_lines(lines, str(tmp_path / "size"), max_bytes=line_bytes * 3)
+  assert [len(list(iter_jsonl(path))) for path in by_size] == [3, 3, 3, 1]
+  assert all(path.endswith(".jsonl") for path in by_size)
+
+  records = [record["custom_id"] for path in by_size for record in iter_jsonl(path)]
+  assert records == [f"request-{i}" for i in range(10)]
+
+
+def test_parse_result_line():
+  ok = parse_result_line({
+    "custom_id": "request-0",
+    "response": {"status_code": 200, "body": {"choices": [{"message": {"content": "hello"}}]}},
+  })
+  assert ok == {"custom_id": "request-0", "content": "hello", "error": None}
+
+  http_error = parse_result_line({
+    "custom_id": "request-1",
+    "response": {"status_code": 429, "body": {"error": {"code": "rate_limit"}}},
+  })
+  assert http_error["content"] is None
+  assert http_error["error"] == {"code": "rate_limit"}
+
+  batch_error = parse_result_line({"custom_id": "request-2", "error": {"message": "bad"}})
+  assert batch_error == {"custom_id": "request-2", "content": None, "error": {"message": "bad"}}
+
+
+def test_each_run_gets_its_own_directory(tmp_path):
+  engine = QwenBatchEngine(client=object(), work_dir=str(tmp_path))
+  first, second = engine.new_run_dir(), engine.new_run_dir()
+
+  assert first != second
+  shard_request_lines(['{"custom_id": "request-0"}'], first)
+  shard_request_lines(['{"custom_id": "request-0"}'], second)
+  assert sorted(p.name for p in tmp_path.iterdir()) == sorted([first.split("/")[-1], second.split("/")[-1]])
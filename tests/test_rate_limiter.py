@@ -0,0 +1,89 @@
+import asyncio
+
+from utils.rate_limiter import AdaptiveRateLimiter
+
+
+class FakeRateLimitError(Exception):
+  status_code = 429
+
+  class response:
+    status_code = 429
+    headers = {"retry-after": "2"}
+
+
+def test_concurrency_limit_and_in_flight():
+  limiter = AdaptiveRateLimiter(max_concurrency=2)
+  assert limiter._try_acquire(10) == 0
+  assert limiter._try_acquire(10) == 0
+  assert limiter._try_acquire(10) > 0
+  assert limiter.stats()["in_flight"] == 2
+
+  limiter.release(10, used_tokens=5)
+  assert limiter.stats()["in_flight"] == 1
+  assert limiter.metrics["tokens"] == 5
+
+
+def test_rate_limit_error_halves_concurrency_and_pauses():
+  limiter = AdaptiveRateLimiter(max_concurrency=8)
+  limiter.acquire(10)
+  limiter.release(10, error=FakeRateLimitError("429 Too Many Requests"))
+
+  stats = limiter.stats()
+  assert stats["concurrency_limit"] == 4
+  assert stats["rate_limited"] == 1
+  assert 1 < stats["paused_for"] <= 2
+  assert limiter._try_acquire(10) > 1
+
+
+def test_request_budget():
+  limiter = AdaptiveRateLimiter(requests_per_minute=1)
+  assert limiter._try_acquire(0) == 0
+  limiter.release()
+  assert limiter._try_acquire(0) > 0
+
+
+class Chunk:
+  def __init__(self, usage=None):
+    self.message = type("Message", (), {"usage_metadata": usage})()
+
+
+class Message:
+  content = "x" * 300
+
+
+class FakeStreamingModel:
+  model_name = "fake"
+  max_tokens = 100
+
+  def _stream(self, messages, stop=None, run_manager=None, **kwargs):
+    yield Chunk()
+    yield Chunk()
+    yield Chunk({"input_tokens": 30, "output_tokens": 12, "total_tokens": 42})
+
+  async def _astream(self, messages, stop=None, run_manager=None, **kwargs):
+    for chunk in FakeStreamingModel._stream(self, messages):
+      yield chunk
+
+
+def test_streamed_calls_reconcile_with_chunk_usage():
+  from utils.rate_limiter import RateLimitedChatModelMixin
+
+  limiter = AdaptiveRateLimiter(tokens_per_minute=10_000)
+
+  class LimitedModel(RateLimitedChatModelMixin, FakeStreamingModel):
+    def _rate_limiter(self):
+      return limiter
+
+  model = LimitedModel()
+  budget = limiter._token_budget
+  assert len(list(model._stream([Message()]))) == 3
+  # Reserved 300 // 3 + 100 = 200 tokens, 42 used: the rest is refunded
+  assert limiter._token_budget == budget - 42
+  assert limiter.metrics["tokens"] == 42
+
+  async def consume():
+    return [chunk async for chunk in model._astream([Message()])]
+
+  asyncio.run(consume())
+  assert limiter.metrics["tokens"] == 84
+  assert limiter.stats()["in_flight"] == 0
@@ -0,0 +1,222 @@
+import asyncio
+import re
+import threading
+import time
+
+import pytest
+from langchain_core.messages import AIMessage
+from langchain_core.runnables import RunnableLambda
+
+from agents import research_agents
+from agents.research_agents import Analyst, ReaserchAgent, SearchQuery
+from utils.research_store import ResearchRunStore
+
+
+class SlowLLM:
+  """Chat model stand-in: every call waits `latency` seconds and is recorded"""
+
+  def __init__(self, latency: float):
+    self.latency = latency
+    self.calls = []
+    self.running = 0
+    self.max_running = 0
+
+  async def _call(self, result):
+    self.calls.append(time.monotonic())
+    self.running += 1
+    self.max_running = max(self.max_running, self.running)
+    try:
+      await asyncio.sleep(self.latency)
+    finally:
+      self.running -= 1
+    return result
+
+  async def ainvoke(self, messages, *args, **kwargs):
+    return await self._call(AIMessage(content="Tell me more."))
+
+  def with_structured_output(self, schema):
+    llm = self
+
+    class Structured:
+      async def ainvoke(self, messages, *args, **kwargs):
+        return await llm._call(SearchQuery(search_query="langgraph"))
+
+    return Structured()
+
+
+@pytest.fixture
+def make_agent(monkeypatch):
+  monkeypatch.setattr(research_agents, "TavilySearch", lambda **kwargs: None)
+
+  def make(llm, **kwargs):
+    agent = ReaserchAgent(llm=llm, **kwargs)
+    agent._search_web = lambda query: "web docs"
+    agent._search_wikipedia = lambda query: "wikipedia docs"
+    return agent
+
+  return make
+
+
+def make_analysts(count: int):
+  return [
+    Analyst(affiliation="Lab", name=f"Analyst {i}", role="Researcher", description=f"Focus {i}")
+    for i in range(count)
+  ]
+
+
+def test_cancelled_interviews_make_no_further_llm_calls(make_agent):
+  llm = SlowLLM(latency=0.2)
+  # The timeout hits during the second LLM call (the search query) of every interview
+  agent = make_agent(llm, max_parallel_interviews=2, interview_timeout=0.3, interviews_deadline=5)
+  analysts = make_analysts(4)
+
+  result = asyncio.run(agent.aconduct_interviews({"topic": "LangGraph", "analysts": analysts}, config={}))
+  calls_at_return = len(llm.calls)
+  time.sleep(0.5)
+
+  assert result["incomplete_interviews"] == [analyst.name for analyst in analysts]
+  assert llm.max_running <= 2
+  assert calls_at_return == 2 * len(analysts)
+  assert len(llm.calls) == calls_at_return
+
+
+def test_extend_research_reinterviews_only_stale_and_new_analysts(make_agent, monkeypatch, tmp_path):
+  store = ResearchRunStore(db_path=str(tmp_path / "runs.db"))
+  monkeypatch.setattr(research_agents, "get_research_store", lambda: store)
+  fresh, stale, added = make_analysts(3)
+
+  def record(analyst, section, researched_at):
+    return {
+      "analyst": analyst.model_dump(),
+      "interview": "",
+      "sections": [section],
+      "sources": [],
+      "researched_at": researched_at,
+    }
+
+  now = time.time()
+  store.save_run(
+    "LangGraph",
+    [record(fresh, "## Fresh", now - 60), record(stale, "## Stale", now - 3600)],
+    "# Report v1",
+  )
+
+  agent = make_agent(SlowLLM(latency=0))
+  interviewed = []
+
+  def conduct_interviews(state, config):
+    interviewed.extend(analyst.name for analyst in state["analysts"])
+    return {"interview_records": [record(analyst, f"## New {analyst.name}", time.time()) for analyst in state["analysts"]]}
+
+  agent.conduct_interviews = conduct_interviews
+  agent.create_analysts = lambda state: {"analysts": [added]}
+  agent._write_report_parts = lambda state, report_mode=None: {
+    "introduction": "# Intro",
+    "content": "\n\n".join(state["sections"]),
+    "conclusion": "## Conclusion",
+  }
+
+  report = agent.extend_research("LangGraph", human_analyst_feedback="Add a CTO", freshness_seconds=600)
+
+  assert interviewed == [stale.name, added.name]
+  run = store.latest_run("LangGraph")
+  assert run["final_report"] == report
+  assert [r["sections"] for r in run["records"]] == [["## Fresh"], [f"## New {stale.name}"], [f"## New {added.name}"]]
+  assert len(store.list_runs()) == 2
+
+
+class ScriptedAnalystLLM:
+  """Structured-output stand-in answering analyst slot `index` with `script[index][attempt]`"""
+
+  def __init__(self, script):
+    self.script = script
+    self.prompts = {index: [] for index in script}
+    self.lock = threading.Lock()
+
+  def with_structured_output(self, schema):
+    return RunnableLambda(self.respond)
+
+  def respond(self, messages):
+    prompt = messages[0].content
+    index = int(re.search(r"theme number (\d+)", prompt).group(1))
+    with self.lock:
+      self.prompts[index].append(prompt)
+      attempt = len(self.prompts[index]) - 1
+    return self.script[index][attempt]
+
+
+def persona(role, affiliation):
+  return {"name": f"{role} persona", "role": role, "affiliation": affiliation, "description": "..."}
+
+
+VECTORS = {
+  "CTO | Acme": [1.0, 0.0, 0.0],
+  "Chief Technology Officer | Acme Corp": [0.99, 0.1, 0.0],
+  "Investor | Seed VC": [0.0, 1.0, 0.0],
+  "Regulator | EU": [0.0, 0.0, 1.0],
+}
+
+
+def generate(make_agent, script, embedder=None):
+  llm = ScriptedAnalystLLM(script)
+  agent = make_agent(llm)
+  agent.analyst_embedder = embedder or (lambda texts: [VECTORS[text] for text in texts])
+  state = {"topic": "LangGraph", "max_analysts": len(script), "human_analyst_feedback": ""}
+  return agent.generate_analysts_parallel(state), llm
+
+
+def test_invalid_analyst_is_retried_with_a_different_prompt(make_agent):
+  analysts, llm = generate(
+    make_agent,
+    {1: [persona("CTO", "Acme")], 2: [{"name": "missing fields"}, persona("Investor", "Seed VC")]},
+  )
+
+  assert [a.role for a in analysts] == ["CTO", "Investor"]
+  assert len(llm.prompts[1]) == 1
+  first, retry = llm.prompts[2]
+  assert retry != first
+  assert "attempt 2" in retry and "invalid output" in retry
+
+
+def test_near_duplicate_is_regenerated_by_embedding(make_agent):
+  analysts, llm = generate(
+    make_agent,
+    {
+      1: [persona("CTO", "Acme")],
+      2: [persona("Chief Technology Officer", "Acme Corp"), persona("Regulator", "EU")],
+      3: [persona("Investor", "Seed VC")],
+    },
+  )
+
+  assert [a.role for a in analysts] == ["CTO", "Investor", "Regulator"]
+  assert [len(llm.prompts[index]) for index in (1, 2, 3)] == [1, 2, 1]
+  assert "too similar to the existing analyst CTO, Acme" in llm.prompts[2][1]
+  # The retry lists the analysts accepted so far
+  assert "- Investor, Seed VC" in llm.prompts[2][1]
+
+
+def test_dedup_falls_back_to_exact_key_without_embeddings(make_agent):
+  def broken(texts):
+    raise RuntimeError("embedding service down")
+
+  analysts, llm = generate(
+    make_agent,
+    {
+      1: [persona("CTO", "Acme")],
+      2: [persona(" cto ", "ACME"), persona("Chief Technology Officer", "Acme Corp")],
+    },
+    embedder=broken,
+  )
+
+  # Only the exact (normalized) duplicate is caught without embeddings
+  assert [a.role for a in analysts] == ["CTO", "Chief Technology Officer"]
+  assert len(llm.prompts[2]) == 2
+
+
+def test_slot_left_empty_after_max_retries(make_agent):
+  invalid = {"name": "missing fields"}
+  analysts, llm = generate(make_agent, {1: [persona("CTO", "Acme")], 2: [invalid, invalid, invalid]})
+
+  assert [a.role for a in analysts] == ["CTO"]
+  assert len(llm.prompts[2]) == 3
+  assert len(set(llm.prompts[2])) == 3
@@ -0,0 +1,30 @@
+from utils.research_store import ResearchRunStore, analyst_key
+
+ANALYST = {"name": "Alex Johnson", "role": "Startup Entrepreneur", "affiliation": "Tech Innovators Inc.", "description": "..."}
+
+
+def test_latest_run_round_trip(tmp_path):
+  store = ResearchRunStore(db_path=str(tmp_path / "runs.db"))
+  assert store.latest_run("LangGraph") is None
+
+  record = {
+    "analyst": ANALYST,
+    "interview": "Q: ... A: ...",
+    "sections": ["## Section"],
+    "sources": ["https://example.com"],
+    "researched_at": 123.0,
+  }
+  store.save_run("LangGraph  benefits", [record], "# Report v1")
+  run_id = store.save_run("langgraph benefits", [record], "# Report v2")
+
+  run = store.latest_run("LangGraph Benefits")
+  assert run["run_id"] == run_id
+  assert run["final_report"] == "# Report v2"
+  assert run["records"] == [record]
+  assert len(store.list_runs()) == 2
+
+
+def test_analyst_key_ignores_case_and_description():
+  other = {**ANALYST, "name": "alex  johnson", "description": "different"}
+  assert analyst_key(other) == analyst_key(ANALYST)
+  assert analyst_key({**ANALYST, "role": "CEO"}) != analyst_key(ANALYST)
@@ -0,0 +1,103 @@
+import time
+
+import pytest
+
+from utils.search_cache import SearchCache, make_search_key
+from utils.semantic_query_index import SemanticQueryIndex
+from utils import search_cache
+
+
+def make_cache(tmp_path, **kwargs):
+  return SearchCache(db_path=str(tmp_path / "search_cache.db"), **kwargs)
+
+
+def test_key_normalizes_query():
+  assert make_search_key("tavily", "  What is  MCP? ") == make_search_key("tavily", "what is mcp?")
+  assert make_search_key("tavily", "mcp") != make_search_key("wikipedia", "mcp")
+  assert make_search_key("tavily", "mcp", {"max_results": 3}) != make_search_key("tavily", "mcp")
+
+
+def test_hit_after_miss(tmp_path):
+  cache = make_cache(tmp_path)
+  calls = []
+
+  def fetch():
+    calls.append(1)
+    return [{"url": "https://example.com", "content": "x"}]
+
+  first = cache.get_or_fetch("tavily", "MCP", fetch)
+  assert cache.get_or_fetch("tavily", " mcp ", fetch) == first
+  assert len(calls) == 1
+
+  stats = cache.stats()
+  assert stats["hits"] == 1
+  assert stats["misses"] == 1
+  assert stats["hit_ratio"] == 0.5
+
+
+def test_errors_are_not_cached(tmp_path):
+  cache = make_cache(tmp_path)
+
+  def failing():
+    raise RuntimeError("search down")
+
+  with pytest.raises(RuntimeError):
+    cache.get_or_fetch("tavily", "mcp", failing)
+  assert cache.get_or_fetch("tavily", "mcp", lambda: ["ok"]) == ["ok"]
+  assert cache.stats()["misses"] == 2
+
+
+def test_stale_entry_is_served_and_refreshed(tmp_path):
+  cache = make_cache(tmp_path, ttl_seconds={"tavily": 0}, stale_seconds=60)
+  cache.get_or_fetch("tavily", "mcp", lambda: ["old"])
+
+  assert cache.get_or_fetch("tavily", "mcp", lambda: ["new"]) == ["old"]
+  for _ in range(100):
+    if cache.stats()["refreshes"]:
+      break
+    time.sleep(0.01)
+
+  stats = cache.stats()
+  assert stats["stale_hits"] == 1
+  assert stats["refreshes"] == 1
+  assert cache._read(make_search_key("tavily", "mcp"))[0] == ["new"]
+
+
+def test_expired_entry_is_a_miss(tmp_path):
+  cache = make_cache(tmp_path, ttl_seconds={"wikipedia": 0}, stale_seconds=0)
+  cache.get_or_fetch("wikipedia", "mcp", lambda: ["old"])
+  assert cache.get_or_fetch("wikipedia", "mcp", lambda: ["new"]) == ["new"]
+  assert cache.purge_expired() == 1
+
+
+def test_tavily_callers_use_distinct_sources(tmp_path):
+  cache = make_cache(tmp_path)
+  results = cache.get_or_fetch("tavily", "mcp", lambda: [{"url": "u", "content": "c"}], {"max_results": 3})
+  raw = cache.get_or_fetch("tavily_search_results", "mcp", lambda: {"results": []}, {"max_results": 3})
+  assert results == [{"url": "u", "content": "c"}]
+  assert raw == {"results": []}
+
+
+def test_semantic_hits_are_not_stored_in_exact_cache(tmp_path):
+  vectors = {"langgraph benefits": [1.0, 0.0], "advantages of langgraph": [0.99, 0.1]}
+  index = SemanticQueryIndex(embed=lambda texts: [vectors[t] for t in texts], threshold=0.95)
+  cache = make_cache(tmp_path)
+
+  assert cache.get_or_fetch("tavily", "langgraph benefits", lambda: ["a"], semantic_index=index) == ["a"]
+  assert cache.get_or_fetch("tavily", "advantages of langgraph", lambda: ["b"], semantic_index=index) == ["a"]
+  # Without the index the paraphrase is still a miss and gets its own results
+  assert cache.get_or_fetch("tavily", "advantages of langgraph", lambda: ["b"]) == ["b"]
+
+  stats = cache.stats()
+  assert stats["semantic_hits"] == 1
+  assert stats["misses"] == 2
+
+
+def test_getter_does_not_reload_env_per_call(monkeypatch):
+  def fail():
+    raise AssertionError("EnvLoader must be created once, not per call")
+
+  monkeypatch.setattr(search_cache, "EnvLoader", fail)
+  monkeypatch.setenv("SEARCH_CACHE_ENABLED", "false")
+  assert search_cache.get_search_cache() is None
+
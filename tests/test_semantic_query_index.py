@@ -0,0 +1,62 @@
+from utils.semantic_query_index import SemanticQueryIndex
+from utils import semantic_query_index
+
+VECTORS = {
+  "langgraph benefits for startups": [1.0, 0.1, 0.0],
+  "advantages of langgraph for startups": [0.98, 0.15, 0.0],
+  "mcp security risks": [0.0, 0.2, 1.0],
+}
+
+
+def embed(texts):
+  return [VECTORS[text] for text in texts]
+
+
+def test_near_duplicate_reuses_results():
+  index = SemanticQueryIndex(embed=embed, threshold=0.95)
+  calls = []
+
+  def fetch(result):
+    def inner():
+      calls.append(result)
+      return result
+    return inner
+
+  assert index.fetch_similar("tavily", "langgraph benefits for startups", fetch(["a"]))[0] == ["a"]
+  assert index.fetch_similar("tavily", "advantages of langgraph for startups", fetch(["b"])) == (["a"], False)
+  assert index.fetch_similar("tavily", "mcp security risks", fetch(["c"]))[0] == ["c"]
+  assert calls == [["a"], ["c"]]
+
+  stats = index.stats()
+  assert stats["hits"] == 1
+  assert stats["size"] == 2
+
+
+def test_namespaces_and_same_query_are_isolated():
+  index = SemanticQueryIndex(embed=embed, threshold=0.95)
+  index.fetch_similar("tavily", "langgraph benefits for startups", lambda: ["a"])[0]
+
+  # Different params never share results
+  params = {"max_results": 5}
+  assert index.fetch_similar("tavily", "advantages of langgraph for startups", lambda: ["b"], params)[0] == ["b"]
+  # Refetching the same query (stale refresh) goes to the backend
+  assert index.fetch_similar("tavily", "langgraph benefits for startups", lambda: ["new"])[0] == ["new"]
+
+
+def test_embedding_failure_falls_back_to_fetch():
+  def broken(texts):
+    raise RuntimeError("embedding service down")
+
+  index = SemanticQueryIndex(embed=broken)
+  assert index.fetch_similar("tavily", "mcp", lambda: ["x"])[0] == ["x"]
+  assert index.stats()["embed_errors"] == 1
+
+
+def test_getter_does_not_reload_env_per_call(monkeypatch):
+  def fail():
+    raise AssertionError("EnvLoader must be created once, not per call")
+
+  monkeypatch.setattr(semantic_query_index, "EnvLoader", fail)
+  monkeypatch.setenv("SEMANTIC_QUERY_INDEX_ENABLED", "false")
+  assert semantic_query_index.get_semantic_query_index() is None
+
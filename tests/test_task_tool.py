@@ -0,0 +1,162 @@
+import asyncio
+import json
+import threading
+import time
+from typing import Any, List
+
+import pytest
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langgraph.graph import END, START, StateGraph
+from langgraph.prebuilt import ToolNode
+from pydantic import Field
+
+from agents.deep_agents.deep_agent_states import DeepAgentState
+from tools.file_tools import ls, write_file
+from tools.task_tool import _create_task_tool
+
+SUBAGENTS = [
+  {
+    "name": "research-agent",
+    "description": "Delegate research to the sub-agent researcher.",
+    "prompt": "You are a researcher.",
+  }
+]
+
+
+class ScriptedSubAgentModel(BaseChatModel):
+  """Sub-agent model: the task description is a JSON list of [tool, args] calls made on the
+  first turn; the second turn answers with the last tool result"""
+
+  latency: float = 0.0
+  stats: dict = Field(
+    default_factory=lambda: {"running": 0, "max_running": 0, "inputs": [], "tool_results": {}}
+  )
+  lock: Any = Field(default_factory=threading.Lock)
+
+  @property
+  def _llm_type(self) -> str:
+    return "scripted-sub-agent"
+
+  def bind_tools(self, tools, **kwargs):
+    return self
+
+  def _enter(self, messages):
+    with self.lock:
+      self.stats["running"] += 1
+      self.stats["max_running"] = max(self.stats["max_running"], self.stats["running"])
+      if isinstance(messages[-1], ToolMessage):
+        for message in messages:
+          if isinstance(message, ToolMessage):
+            self.stats["tool_results"][message.name] = message.content
+      else:
+        self.stats["inputs"].append(messages)
+
+  def _exit(self):
+    with self.lock:
+      self.stats["running"] -= 1
+
+  def _respond(self, messages) -> ChatResult:
+    task = next(m for m in messages if isinstance(m, HumanMessage)).content
+    if isinstance(messages[-1], ToolMessage):
+      message = AIMessage(content=messages[-1].content)
+    else:
+      calls = [
+        {"name": name, "args": args, "id": f"{name}-{i}", "type": "tool_call"}
+        for i, (name, args) in enumerate(json.loads(task))
+      ]
+      message = AIMessage(content="", tool_calls=calls)
+    return ChatResult(generations=[ChatGeneration(message=message)])
+
+  def _generate(self, messages: List, stop=None, run_manager=None, **kwargs) -> ChatResult:
+    self._enter(messages)
+    try:
+      time.sleep(self.latency)
+      return self._respond(messages)
+    finally:
+      self._exit()
+
+  async def _agenerate(self, messages: List, stop=None, run_manager=None, **kwargs) -> ChatResult:
+    self._enter(messages)
+    try:
+      await asyncio.sleep(self.latency)
+      return self._respond(messages)
+    finally:
+      self._exit()
+
+
+@pytest.fixture(autouse=True)
+def no_blob_store(monkeypatch):
+  monkeypatch.setenv("BLOB_STORE_ENABLED", "false")
+
+
+def build(model, max_concurrency=4):
+  task_tool = _create_task_tool(
+    [ls, write_file], SUBAGENTS, model, DeepAgentState, max_concurrency=max_concurrency
+  )
+  builder = StateGraph(DeepAgentState)
+  builder.add_node("tools", ToolNode([task_tool]))
+  builder.add_edge(START, "tools")
+  builder.add_edge("tools", END)
+  return builder.compile()
+
+
+def task_call(i, calls, files=None):
+  args = {"description": json.dumps(calls), "subagent_type": "research-agent"}
+  if files is not None:
+    args["files"] = files
+  return {"name": "task", "args": args, "id": f"call_{i}", "type": "tool_call"}
+
+
+def parent_state(calls, files=None):
+  return {
+    "messages": [HumanMessage(content="Research"), AIMessage(content="", tool_calls=calls)],
+    "files": files or {},
+  }
+
+
+@pytest.mark.parametrize("use_async", [False, True])
+def test_task_calls_run_concurrently_up_to_the_cap(use_async):
+  model = ScriptedSubAgentModel(latency=0.05, cache=False)
+  graph = build(model, max_concurrency=2)
+  calls = [
+    task_call(i, [["write_file", {"file_path": "report.md", "content": f"task {i}"}]])
+    for i in range(6)
+  ]
+
+  state = parent_state(calls)
+  result = asyncio.run(graph.ainvoke(state)) if use_async else graph.invoke(state)
+
+  assert model.stats["max_running"] == 2
+  # Updates are applied in tool-call order: the last call's write wins
+  assert result["files"] == {"report.md": "task 5"}
+  tool_messages = [m for m in result["messages"] if isinstance(m, ToolMessage)]
+  assert [m.tool_call_id for m in tool_messages] == [f"call_{i}" for i in range(6)]
+
+
+def test_sub_agent_gets_only_the_description_and_selected_files():
+  model = ScriptedSubAgentModel(cache=False)
+  graph = build(model)
+  parent_files = {"notes.md": "notes", "draft.md": "draft", "todo.md": "todo"}
+  calls = [
+    task_call(
+      0,
+      [["ls", {}], ["write_file", {"file_path": "summary.md", "content": "summary"}]],
+      files=["notes.md"],
+    ),
+    task_call(1, [["ls", {}]], files=["missing.md"]),
+  ]
+
+  result = graph.invoke(parent_state(calls, parent_files))
+
+  # No parent history: the sub-agent prompt plus the task description only
+  (sub_input,) = model.stats["inputs"]
+  assert [type(m) for m in sub_input] == [SystemMessage, HumanMessage]
+  assert sub_input[1].content == calls[0]["args"]["description"]
+  tool_messages = {m.tool_call_id: m.content for m in result["messages"] if isinstance(m, ToolMessage)}
+  assert tool_messages["call_1"].startswith("Error: files ['missing.md'] not found")
+
+  assert json.loads(model.stats["tool_results"]["ls"]) == ["notes.md"]
+  # Unselected parent files survive: the delta is computed against the handed-off files
+  assert result["files"] == {**parent_files, "summary.md": "summary"}
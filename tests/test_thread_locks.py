@@ -0,0 +1,111 @@
+import asyncio
+
+from apps.thread_locks import ThreadTaskManager, make_request_key
+
+
+def test_same_thread_is_serialized():
+  manager = ThreadTaskManager()
+  running = []
+  max_running = []
+
+  async def work():
+    running.append(1)
+    max_running.append(len(running))
+    await asyncio.sleep(0.01)
+    running.pop()
+
+  async def main():
+    await asyncio.gather(
+      *[manager.submit("t001", f"key-{i}", work) for i in range(5)]
+    )
+
+  asyncio.run(main())
+  assert max(max_running) == 1
+  assert manager.stats()["active_threads"] == 0
+
+
+def test_different_threads_run_in_parallel():
+  manager = ThreadTaskManager()
+  running = []
+  max_running = []
+
+  async def work():
+    running.append(1)
+    max_running.append(len(running))
+    await asyncio.sleep(0.01)
+    running.pop()
+
+  async def main():
+    await asyncio.gather(
+      *[manager.submit(f"t{i}", "key", work) for i in range(5)]
+    )
+
+  asyncio.run(main())
+  assert max(max_running) == 5
+
+
+def test_duplicate_submissions_are_coalesced():
+  manager = ThreadTaskManager()
+  calls = []
+
+  async def work():
+    calls.append(1)
+    await asyncio.sleep(0.01)
+    return "answer"
+
+  async def main():
+    key = make_request_key("chat", {"messages": [{"role": "user", "content": "hi"}]})
+    return await asyncio.gather(*[manager.submit("t001", key, work) for _ in range(3)])
+
+  results = asyncio.run(main())
+  assert results == ["answer"] * 3
+  assert len(calls) == 1
+  assert manager.coalesced_count == 2
+
+
+def test_duplicate_streams_share_one_run():
+  manager = ThreadTaskManager()
+  runs = []
+
+  async def produce():
+    runs.append(1)
+    for i in range(3):
+      await asyncio.sleep(0.01)
+      yield i
+
+  async def collect(key):
+    return [event async for event in manager.stream("t001", key, produce)]
+
+  async def main():
+    key = make_request_key("chat", {"messages": [{"role": "user", "content": "hi"}]})
+    first = asyncio.ensure_future(collect(key))
+    await asyncio.sleep(0.015)  # the duplicate joins after the first event
+    return await asyncio.gather(first, collect(key), collect("other-key"))
+
+  results = asyncio.run(main())
+  assert results == [[0, 1, 2]] * 3
+  assert len(runs) == 2
+  assert manager.coalesced_count == 1
+  assert manager.stats()["inflight_streams"] == 0
+
+
+def test_stream_error_reaches_every_subscriber():
+  manager = ThreadTaskManager()
+
+  async def produce():
+    yield "token"
+    raise RuntimeError("boom")
+
+  async def collect():
+    events = []
+    try:
+      async for event in manager.stream("t001", "key", produce):
+        events.append(event)
+    except RuntimeError as e:
+      events.append(str(e))
+    return events
+
+  async def main():
+    return await asyncio.gather(collect(), collect())
+
+  assert asyncio.run(main()) == [["token", "boom"]] * 2
@@ -0,0 +1,59 @@
+from utils.virtual_fs import LineIndex, LineIndexCache, diff_files, grep_files, merge_files
+
+
+def test_merge_applies_delta_copy_on_write():
+  page = "scraped " * 1000
+  left = {"a.md": page, "b.md": "old"}
+  merged = merge_files(left, {"b.md": "new", "c.md": "added", "missing.md": None})
+
+  assert merged == {"a.md": page, "b.md": "new", "c.md": "added"}
+  assert left == {"a.md": page, "b.md": "old"}
+  assert merged["a.md"] is page
+  assert merge_files(merged, {}) is merged
+  assert merge_files(None, {"x.md": "x", "y.md": None}) == {"x.md": "x"}
+  assert merge_files(merged, {"a.md": None}) == {"b.md": "new", "c.md": "added"}
+
+
+def test_diff_only_reports_changed_paths():
+  before = {"a.md": "same", "b.md": "old", "gone.md": "bye"}
+  after = {"a.md": "same", "b.md": "new", "c.md": "added"}
+  delta = diff_files(before, after)
+
+  assert delta == {"b.md": "new", "c.md": "added", "gone.md": None}
+  assert merge_files(before, delta) == after
+  assert diff_files(None, None) == {}
+
+
+def test_line_index_matches_splitlines():
+  for content in ["abc", "abc\n", "a\n\nb", "\n", "x\r\ny\r\n", "one\ntwo\nthree"]:
+    index = LineIndex(content)
+    assert [line for _, line in index.lines(0, 100)] == content.splitlines()
+    assert index.line_count == len(content.splitlines())
+
+  index = LineIndex("\n".join(f"line {i}" for i in range(10)))
+  assert list(index.lines(8, 5)) == [(8, "line 8"), (9, "line 9")]
+  assert index.line_number(index.offsets[3] + 2) == 3
+
+
+def test_line_index_cached_per_content():
+  cache = LineIndexCache(max_entries=1)
+  content = "a\nb"
+  assert cache.get(content) is cache.get(content)
+  cache.get("other")
+  assert cache.metrics == {"hits": 1, "builds": 2}
+  assert cache.get(content).content == content
+
+
+def test_grep_files():
+  files = {
+    "b.md": "LangGraph agents\nnothing here\nlanggraph again LangGraph",
+    "a.md": "Intro\nLangGraph",
+    "notes.txt": "LangGraph",
+  }
+  assert grep_files(files, "LangGraph", glob="*.md") == [
+    ("a.md", 2, "LangGraph"),
+    ("b.md", 1, "LangGraph agents"),
+    ("b.md", 3, "langgraph again LangGraph"),
+  ]
+  assert len(grep_files(files, "^langgraph", ignore_case=True)) == 4
+  assert len(grep_files(files, "LangGraph", max_matches=2)) == 2